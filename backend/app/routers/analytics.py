@@ -27,6 +27,52 @@ async def get_platform_stats(db: Session = Depends(get_db)):
     }
 
 
+@router.get("/llm")
+async def get_llm_stats():
+    """Shared LLM connection pool usage, coalesced requests, per-model
+    resilience (hedges, retries, breaker state), model routing, tokens and
+    structured-output parses/repairs"""
+    # Imported here so loading the app doesn't pull in the LLM stack
+    from ..services.evaluator import get_structured_output_stats
+    from ..services.llm_client import get_pool_stats
+    from ..services.model_router import get_model_router
+    from ..services.prompts import prompt_registry
+    from ..services.resilience import get_resilience_stats
+    from ..services.singleflight import llm_flights
+    from ..services.token_budget import get_context_compactor, token_usage
+
+    return {
+        "routing": get_model_router().get_stats(),
+        "pool": get_pool_stats(),
+        "single_flight": llm_flights.get_stats(),
+        "resilience": get_resilience_stats(),
+        "prompt_versions": prompt_registry.versions(),
+        "tokens": {**token_usage.get_stats(), "expert_context": get_context_compactor().get_stats()},
+        "structured_output": get_structured_output_stats(),
+    }
+
+
+@router.get("/caches")
+async def get_cache_stats():
+    """Hit rates of the LLM response cache, the semantic evaluation cache and
+    the knowledge base's query/result caches (None when disabled or not
+    built yet)"""
+    from ..services.llm_cache import get_llm_cache
+    from . import interview
+
+    llm_cache = get_llm_cache()
+    # Reading stats shouldn't build the graph
+    graph = interview._graph
+    semantic_cache = graph.semantic_cache if graph is not None else None
+    kb = graph.kb if graph is not None else None
+
+    return {
+        "llm_responses": llm_cache.get_stats() if llm_cache else None,
+        "semantic_evaluations": semantic_cache.get_stats() if semantic_cache else None,
+        "knowledge_base": kb.cache_stats() if hasattr(kb, "cache_stats") else None,
+    }
+
+
 @router.get("/weak-areas")
 async def get_weak_areas(
     threshold: int = Query(default=60, ge=0, le=100),
@@ -1,20 +1,58 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Optional
 from datetime import datetime
+import json
+import threading
+import uuid
 
 # Existing imports
-from ..models.database import get_db
+from ..models.database import get_db, SessionLocal
 from ..services.db_service import DatabaseService
-from ..services.interview_graph import InterviewGraph
 from ..services.interview_state import InterviewState, Message
+from ..services.resilience import request_deadline
+from ..services.speculation import FollowupScheduler, SpeculativeFollowup
+from ..services.session_store import create_session_store
 
 router = APIRouter(prefix="/api/interview", tags=["interview"])
 
-# In-memory storage for active sessions (still needed during interview)
-active_sessions: Dict[str, dict] = {}
-graph = InterviewGraph()
+# Active interview state between requests (in-memory LRU or shared SQLite)
+active_sessions = create_session_store()
+
+# The graph (LLM client, compiled LangGraph, embedding model) is built on
+# first use or by the app lifespan, so importing the app stays cheap
+_graph = None
+_followups = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """The shared InterviewGraph, built on first call (thread-safe)"""
+    global _graph, _followups
+    with _graph_lock:
+        if _graph is None:
+            from ..services.interview_graph import InterviewGraph
+
+            graph = InterviewGraph()
+            _followups = FollowupScheduler(graph)
+            _graph = graph
+    return _graph
+
+
+async def aget_graph():
+    """get_graph() for handlers: a cold build runs off the event loop"""
+    if _graph is None:
+        await run_in_threadpool(get_graph)
+    return _graph
+
+
+def get_followups() -> FollowupScheduler:
+    get_graph()
+    return _followups
+
 
 class StartRequest(BaseModel):
     category: str = "coding"
@@ -28,8 +66,8 @@ class AnswerRequest(BaseModel):
 async def start_interview(request: StartRequest, db: Session = Depends(get_db)):
     """Start interview - now with database persistence"""
 
-    # Generate unique session ID
-    session_id = f"session_{datetime.now().timestamp()}"
+    # Generate unique session ID (suffix keeps it unique across workers)
+    session_id = f"session_{datetime.now().timestamp()}_{uuid.uuid4().hex[:6]}"
 
     # Initialize LangGraph state
     state = InterviewState(
@@ -44,23 +82,25 @@ async def start_interview(request: StartRequest, db: Session = Depends(get_db)):
     )
 
     # Get first question from graph
+    graph = await aget_graph()
     result = graph.start_node(state)
     state.update(result)
 
-    # Save to database
+    # Save to database (sync SQLAlchemy runs on the bounded threadpool)
     db_service = DatabaseService(db)
-    db_session = db_service.create_session(
+    db_session = await run_in_threadpool(
+        db_service.create_session,
         session_id=session_id,
         category=request.category,
         difficulty=request.difficulty
     )
 
-    # Store in memory for active session
-    active_sessions[session_id] = {
+    # Store for the rest of the interview (the DB service is per-request).
+    # Store calls may do SQLite I/O, so they stay off the event loop too
+    await run_in_threadpool(active_sessions.put, session_id, {
         "state": state,
         "db_id": db_session.id,  # Store DB ID
-        "db_service": db_service
-    }
+    })
 
     return {
         "session_id": session_id,
@@ -69,38 +109,37 @@ async def start_interview(request: StartRequest, db: Session = Depends(get_db)):
         "category": request.category
     }
 
-@router.post("/answer")
-async def submit_answer(request: AnswerRequest, db: Session = Depends(get_db)):
-    """Submit answer - with database persistence"""
-
-    if request.session_id not in active_sessions:
-        raise HTTPException(status_code=404, detail="Session not found or expired")
-
-    session = active_sessions[request.session_id]
+def _record_answer(session: dict, answer: str) -> InterviewState:
+    """Put the candidate's answer on the session state"""
     state = session['state']
-    db_service = DatabaseService(db)
-
-    # Update state with user's answer
-    state['user_answer'] = request.answer
-    state['messages'].append(Message(role="candidate", content=request.answer))
-
-    # Evaluate using LangGraph
-    eval_result = graph.evaluate_node(state)
-    state.update(eval_result)
+    state['user_answer'] = answer
+    state['messages'].append(Message(role="candidate", content=answer))
+    return state
+
+async def _finish_answer(
+    session_id: str,
+    session: dict,
+    state: InterviewState,
+    db_service: DatabaseService,
+    speculation: Optional[SpeculativeFollowup] = None,
+):
+    """Persist an evaluated answer, then move to the next question or finish"""
 
     # Save response to database
-    db_service.save_response(
+    await run_in_threadpool(
+        db_service.save_response,
         session_db_id=session['db_id'],
         question_id=state['current_question_id'],
         question_text=state['current_question'],
         question_number=state['question_count'],
-        user_answer=request.answer,
+        user_answer=state['user_answer'],
         evaluation=state['evaluation'],
         score=state['score'],
         category=state['category']
     )
 
     # Check if should continue
+    graph = await aget_graph()
     should_continue = graph.should_continue(state)
 
     response = {
@@ -112,23 +151,123 @@ async def submit_answer(request: AnswerRequest, db: Session = Depends(get_db)):
 
     # Generate follow-up or complete session
     if should_continue == "continue":
-        followup_result = graph.followup_node(state)
+        if speculation:
+            followup_result = await speculation.resolve(state)
+        else:
+            followup_result = await graph.afollowup_node(state)
         state.update(followup_result)
+        await run_in_threadpool(active_sessions.put, session_id, session)
         response.update({
             "next_question": state['current_question'],
             "next_question_id": state['current_question_id']
         })
     else:
         # Complete session in database
-        db_service.complete_session(request.session_id, state['messages'])
+        await run_in_threadpool(
+            db_service.complete_session, session_id, state['messages']
+        )
 
         # Clean up active session
-        del active_sessions[request.session_id]
+        await run_in_threadpool(active_sessions.delete, session_id)
 
         response["message"] = "Interview complete!"
 
     return response
 
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/answer")
+async def submit_answer(request: AnswerRequest, db: Session = Depends(get_db)):
+    """Submit answer - with database persistence"""
+
+    session = await run_in_threadpool(active_sessions.get, request.session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    state = _record_answer(session, request.answer)
+    db_service = DatabaseService(db)
+    graph = await aget_graph()
+
+    # One LLM budget for evaluation, any repair and the follow-up
+    with request_deadline():
+        # Prepare the next question while the evaluation runs
+        speculation = get_followups().speculate(state)
+
+        try:
+            # Evaluate using LangGraph (awaits the LLM, so other interviews keep running)
+            eval_result = await graph.aevaluate_node(state)
+            state.update(eval_result)
+
+            return await _finish_answer(
+                request.session_id, session, state, db_service, speculation
+            )
+        finally:
+            # No-op once resolved; otherwise the answer failed or needs no next question
+            if speculation:
+                speculation.cancel()
+
+@router.post("/answer/stream")
+async def submit_answer_stream(request: AnswerRequest):
+    """Submit answer and stream the evaluation as server-sent events.
+
+    Events: ``field`` ({"name", "value"}) for each evaluation field as soon
+    as the model has finished it, ``score`` ({"score"}) once correctness,
+    clarity and completeness are all in, then ``done`` with the same body
+    /answer returns (or ``error``).
+    """
+
+    session = await run_in_threadpool(active_sessions.get, request.session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    state = _record_answer(session, request.answer)
+    graph = await aget_graph()
+    from ..services.evaluator import SCORE_FIELDS
+
+    async def events():
+        # The stream outlives the request scope, so it owns its DB session
+        db = SessionLocal()
+        with request_deadline():
+            speculation = get_followups().speculate(state)
+            try:
+                parts = {}
+                score_sent = False
+                async for name, value in graph.astream_evaluation(state):
+                    if name == "update":
+                        state.update(value)
+                        continue
+                    yield _sse("field", {"name": name, "value": value})
+
+                    # The total is the sum of the parts, known before the feedback
+                    if name in SCORE_FIELDS and isinstance(value, int):
+                        parts[name] = value
+                        if not score_sent and len(parts) == len(SCORE_FIELDS):
+                            score_sent = True
+                            yield _sse("score", {"score": sum(parts.values())})
+
+                if not score_sent:
+                    yield _sse("score", {"score": state["score"]})
+
+                response = await _finish_answer(
+                    request.session_id, session, state, DatabaseService(db), speculation
+                )
+                yield _sse("done", response)
+            except Exception as e:
+                yield _sse("error", {"detail": str(e)})
+            finally:
+                # Also runs when the client disconnects mid-stream
+                if speculation:
+                    speculation.cancel()
+                db.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/{session_id}/summary")
 async def get_summary(session_id: str, db: Session = Depends(get_db)):
     """Get interview summary from database"""
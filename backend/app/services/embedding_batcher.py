@@ -0,0 +1,140 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from ..utils.forking import reset_after_fork
+
+
+class EmbeddingBatcher(Embeddings):
+    """Micro-batches embedding calls from concurrent callers.
+
+    Each text is queued with a Future. A single background thread takes the
+    first waiting text, keeps collecting for up to ``max_wait_ms`` or until
+    ``max_batch_size`` texts are queued, and runs them through one
+    ``embed_documents`` call on the wrapped model. Duplicate texts in a
+    batch are encoded once. Sync callers block on their future; async
+    callers await it without holding a thread.
+
+    Queries go through ``embed_documents`` too, which assumes the wrapped
+    model encodes queries and documents the same way (true for MiniLM).
+    """
+
+    def __init__(self, embeddings: Embeddings, max_wait_ms: float = 5, max_batch_size: int = 32):
+        self.embeddings = embeddings
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self.stats = {"batches": 0, "texts": 0, "encoded": 0, "largest_batch": 0}
+        self._reset()
+        reset_after_fork(self._reset)
+
+    def _reset(self):
+        # Threads don't survive fork(): a forked worker starts its own
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+    # ---------- Scheduling ----------
+    def submit(self, texts: List[str]) -> List[Future]:
+        """Queue texts for the next batch; one Future per text."""
+        self._ensure_worker()
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._encode(batch)
+            except Exception as e:
+                # One bad batch mustn't stop the worker every caller waits on
+                print(f"⚠️ Embedding batch failed: {e}")
+                self._deliver(batch, [], e, None)
+
+    def _encode(self, batch):
+        # Claim each future; cancelled callers (timeouts, disconnects) drop out
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        self.stats["batches"] += 1
+        self.stats["texts"] += len(batch)
+        self.stats["encoded"] += len(unique)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+
+        if hasattr(self.embeddings, "submit_documents"):
+            # Asynchronous backend (process pool): keep collecting the next
+            # batch while this one is encoded
+            pending = self.embeddings.submit_documents(unique)
+            pending.add_done_callback(
+                lambda done: self._deliver(
+                    batch, unique, done.exception(),
+                    None if done.exception() else done.result(),
+                )
+            )
+            return
+
+        try:
+            self._deliver(batch, unique, None, self.embeddings.embed_documents(unique))
+        except Exception as e:
+            self._deliver(batch, unique, e, None)
+
+    @staticmethod
+    def _deliver(batch, unique, error, vectors):
+        by_text = dict(zip(unique, vectors)) if error is None else {}
+        for text, future in batch:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(by_text[text])
+
+    # ---------- Embeddings Interface ----------
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) >= self.max_batch_size:
+            # Already a full batch (e.g. ingestion): no point queueing it
+            return self.embeddings.embed_documents(texts)
+        return [future.result() for future in self.submit(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.submit([text])[0].result()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) >= self.max_batch_size:
+            return await self.embeddings.aembed_documents(texts)
+        return list(await asyncio.gather(*(asyncio.wrap_future(f) for f in self.submit(texts))))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.wrap_future(self.submit([text])[0])
+
+    def get_stats(self) -> dict:
+        stats = dict(self.stats)
+        stats["avg_batch"] = stats["texts"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
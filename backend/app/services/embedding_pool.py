@@ -0,0 +1,104 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..utils.forking import reset_after_fork
+
+_worker_embeddings = None
+
+
+def _init_worker(embeddings_factory):
+    """Load the model once per worker process."""
+    global _worker_embeddings
+    _worker_embeddings = embeddings_factory()
+
+
+def _encode(texts):
+    """Encode in the worker; vectors travel back as one float32 buffer."""
+    vectors = np.asarray(_worker_embeddings.embed_documents(texts), dtype=np.float32)
+    return vectors.shape, vectors.tobytes()
+
+
+def _decode(result) -> List[List[float]]:
+    shape, buffer = result
+    return np.frombuffer(buffer, dtype=np.float32).reshape(shape).tolist()
+
+
+class ProcessPoolEmbeddings(Embeddings):
+    """Runs embedding inference in dedicated worker processes.
+
+    Keeps CPU-bound encoding (and the GIL it holds) out of the process that
+    serves the API. Each worker loads the model once through
+    ``embeddings_factory``; results come back as a compact float32 buffer
+    rather than pickled lists of floats. Workers are started with "spawn",
+    so nothing of the server's threads or event loop is inherited.
+
+    ``submit_documents`` returns a Future, which lets an EmbeddingBatcher in
+    front keep several batches in flight, one per worker.
+    """
+
+    def __init__(self, embeddings_factory, workers: int = 2):
+        self.embeddings_factory = embeddings_factory
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._pool = None
+        reset_after_fork(self._forget_pool)
+
+    def _forget_pool(self):
+        # A pool created before fork() belongs to the parent; each forked
+        # server worker starts its own on first use
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.embeddings_factory,),
+                )
+            return self._pool
+
+    def submit_documents(self, texts: List[str]) -> Future:
+        result = Future()
+
+        def unpack(done):
+            if done.exception() is not None:
+                result.set_exception(done.exception())
+            else:
+                result.set_result(_decode(done.result()))
+
+        self._executor().submit(_encode, list(texts)).add_done_callback(unpack)
+        return result
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.submit_documents(texts).result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self.submit_documents(texts))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def warmup(self):
+        """Start every worker and load its model before traffic arrives."""
+        futures = [self.submit_documents(["warmup"]) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def close(self, wait: bool = False):
+        """Stop the worker processes; the next call starts a new pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
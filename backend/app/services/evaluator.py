@@ -1,9 +1,12 @@
-from langchain_groq import ChatGroq
-from langchain_core.output_parsers import PydanticOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional
 import os
+import threading
+
+from .json_stream import StructuredOutputError, parse_json_object
+from .model_router import get_model_router
+from .prompts import get_prompt, prompt_registry
+from .token_budget import get_context_compactor, token_usage
 
 
 class EvaluationScore(BaseModel):
@@ -22,99 +25,124 @@ class EvaluationScore(BaseModel):
     improvement: str = Field(description="One specific, actionable suggestion")
 
 
-class StructuredEvaluator:
-    """Evaluates interview answers with structured Pydantic output"""
+def compact_format_instructions(model) -> str:
+    """Short JSON instructions for a Pydantic model.
 
-    def __init__(self):
-        self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0.3,  # Lower for consistency
-            api_key=os.getenv("GROQ_API_KEY"),
-        )
-        self.parser = PydanticOutputParser(pydantic_object=EvaluationScore)
+    A full JSON schema on every call costs far more tokens; field names,
+    types and descriptions carry the same constraints and the model still
+    validates. Keys are asked for in field order, so the scores come first
+    when the output is streamed.
+    """
+    types = {int: "integer", str: "string", List[str]: "list of strings"}
+    lines = [
+        f'- "{name}" ({types.get(field.annotation, "string")}): {field.description}'
+        for name, field in model.model_fields.items()
+    ]
+    return "Respond with only a JSON object with these keys, in this order:\n" + "\n".join(lines)
 
-    def evaluate(
-        self, question: str, user_answer: str, expert_context: str
-    ) -> EvaluationScore:
-        """
-        Evaluate answer using structured rubric
 
-        Args:
-            question: The interview question
-            user_answer: Candidate's response
-            expert_context: Retrieved expert examples from RAG
+# Provider JSON mode: the model can only emit a syntactically valid object
+JSON_MODE = {"response_format": {"type": "json_object"}}
 
-        Returns:
-            EvaluationScore with all fields populated
-        """
+SCORE_FIELDS = ("correctness", "clarity", "completeness")
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are an expert technical interviewer evaluating a candidate's answer.
+_stats = {"parsed": 0, "repaired": 0, "failed": 0}
+_stats_lock = threading.Lock()
 
-Use this rubric:
-- Correctness (0-40): Technical accuracy, sound reasoning, correct algorithms/concepts
-- Clarity (0-30): How well explained, logical flow, appropriate terminology
-- Completeness (0-30): Covers edge cases, discusses tradeoffs, considers alternatives
 
-Be strict but fair. Most answers score 60-80. Only exceptional answers score 90+.
+def _count(outcome: str):
+    with _stats_lock:
+        _stats[outcome] += 1
 
-{format_instructions}""",
-                ),
-                (
-                    "human",
-                    """Question:
-{question}
 
-Expert Examples (for reference):
-{expert_context}
+def get_structured_output_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
 
-Candidate's Answer:
-{user_answer}
 
-Provide detailed evaluation:""",
-                ),
-            ]
-        )
+def parse_evaluation(text: str) -> EvaluationScore:
+    """EvaluationScore from JSON output; the total is the sum of the parts.
 
-        formatted_prompt = prompt.format_messages(
-            format_instructions=self.parser.get_format_instructions(),
-            question=question,
-            expert_context=expert_context,
-            user_answer=user_answer,
+    Raises StructuredOutputError when the output isn't a JSON object or
+    doesn't fit the rubric.
+    """
+    data = parse_json_object(text)
+    parts = [data.get(name) for name in SCORE_FIELDS]
+    if all(isinstance(part, int) for part in parts):
+        data["total"] = sum(parts)
+    try:
+        return EvaluationScore.model_validate(data)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(map(str, err['loc'])) or 'output'}: {err['msg']}" for err in e.errors()
         )
+        raise StructuredOutputError(f"evaluation doesn't fit the rubric: {problems}") from None
 
-        response = self.llm.invoke(formatted_prompt)
 
-        try:
-            evaluation = self.parser.parse(response.content)
-
-            # Recalculate total to ensure consistency
-            calculated_total = (
-                evaluation.correctness + evaluation.clarity + evaluation.completeness
-            )
-            evaluation.total = calculated_total
-
-            return evaluation
-
-        except Exception as e:
-            # Fallback if parsing fails
-            print(f"⚠️ Parsing failed: {e}")
-            return EvaluationScore(
-                correctness=25,
-                clarity=20,
-                completeness=20,
-                total=65,
-                strengths=["Attempted to answer the question"],
-                weaknesses=["Evaluation could not be fully parsed"],
-                improvement="Please provide more detailed explanations",
-            )
+@prompt_registry.prompt("evaluation_repair")
+def _evaluation_repair_prompt(category):
+    system = """You fix malformed interview evaluations. Keep the scores and feedback of the original; only correct its structure.
+
+{format_instructions}"""
+    human = """Original output:
+{output}
+
+Problem: {error}
+
+Corrected JSON:"""
+    static = {"format_instructions": compact_format_instructions(EvaluationScore)}
+    return [("system", system), ("human", human)], static
 
-    def format_evaluation(self, evaluation: EvaluationScore) -> str:
-        """Format evaluation for display"""
-        return f"""Score: {evaluation.total}/100
+
+def _repair_chain():
+    # Reformatting doesn't need the quality model (LLM_ROUTE_REPAIR)
+    llm = get_model_router().routed("repair", temperature=0)
+    return get_prompt("evaluation_repair").template | llm.bind(**JSON_MODE)
+
+
+def _repair_retries() -> int:
+    return int(os.getenv("EVALUATION_REPAIR_RETRIES", 1))
+
+
+def parse_or_repair(output: str, retries: Optional[int] = None) -> EvaluationScore:
+    """parse_evaluation(), asking the LLM to fix invalid output at most
+    ``retries`` times (EVALUATION_REPAIR_RETRIES) before raising"""
+    retries = _repair_retries() if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            evaluation = parse_evaluation(output)
+        except StructuredOutputError as e:
+            if attempt == retries:
+                _count("failed")
+                raise
+            print(f"⚠️ Evaluation output invalid ({e}), repairing")
+            output = _repair_chain().invoke({"output": output, "error": str(e)}).content
+            continue
+        _count("repaired" if attempt else "parsed")
+        return evaluation
+
+
+async def aparse_or_repair(output: str, retries: Optional[int] = None) -> EvaluationScore:
+    """Async parse_or_repair(): the repair call is awaited"""
+    retries = _repair_retries() if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            evaluation = parse_evaluation(output)
+        except StructuredOutputError as e:
+            if attempt == retries:
+                _count("failed")
+                raise
+            print(f"⚠️ Evaluation output invalid ({e}), repairing")
+            response = await _repair_chain().ainvoke({"output": output, "error": str(e)})
+            output = response.content
+            continue
+        _count("repaired" if attempt else "parsed")
+        return evaluation
+
+
+def render_evaluation(evaluation: EvaluationScore) -> str:
+    """Format evaluation for display"""
+    return f"""Score: {evaluation.total}/100
 
 Breakdown:
 - Correctness: {evaluation.correctness}/40
@@ -132,6 +160,87 @@ Improvement:
 """
 
 
+@prompt_registry.prompt("structured_evaluation")
+def _structured_evaluation_prompt(category):
+    system = """You are an expert technical interviewer evaluating a candidate's answer.
+
+Use this rubric:
+- Correctness (0-40): Technical accuracy, sound reasoning, correct algorithms/concepts
+- Clarity (0-30): How well explained, logical flow, appropriate terminology
+- Completeness (0-30): Covers edge cases, discusses tradeoffs, considers alternatives
+
+Be strict but fair. Most answers score 60-80. Only exceptional answers score 90+.
+
+{format_instructions}"""
+    human = """Question:
+{question}
+
+Expert Examples (for reference):
+{expert_context}
+
+Candidate's Answer:
+{user_answer}
+
+Evaluation (JSON):"""
+    static = {"format_instructions": compact_format_instructions(EvaluationScore)}
+    return [("system", system), ("human", human)], static
+
+
+class StructuredEvaluator:
+    """Evaluates interview answers with JSON-mode structured output"""
+
+    def __init__(self):
+        self.llm = get_model_router().routed(
+            "scoring",
+            temperature=0.3,  # Lower for consistency
+        )
+        self.json_llm = self.llm.bind(**JSON_MODE)
+
+    def evaluate(
+        self,
+        question: str,
+        user_answer: str,
+        expert_context: str,
+        question_id: Optional[str] = None,
+    ) -> EvaluationScore:
+        """
+        Evaluate answer using structured rubric
+
+        Args:
+            question: The interview question
+            user_answer: Candidate's response
+            expert_context: Retrieved expert examples from RAG
+            question_id: Bank question id (caches the compacted context)
+
+        Returns:
+            EvaluationScore with all fields populated
+
+        Raises:
+            StructuredOutputError: output still invalid after the repair retries
+        """
+
+        prompt = get_prompt("structured_evaluation")
+        expert_context = get_context_compactor().compact(question_id, question, expert_context)
+        inputs = {
+            "question": question,
+            "expert_context": expert_context,
+            "user_answer": user_answer,
+        }
+        # Format instructions are part of the compiled instructions
+        token_usage.measure("scoring", {"instructions": prompt.instructions, **inputs})
+
+        formatted_prompt = prompt.template.format_messages(**inputs)
+
+        response = self.json_llm.invoke(formatted_prompt)
+
+        # Invalid output gets a bounded repair, never a made-up score
+        return parse_or_repair(response.content)
+
+    def format_evaluation(self, evaluation: EvaluationScore) -> str:
+        """Format evaluation for display"""
+        return render_evaluation(evaluation)
+
+
 # Test
 if __name__ == "__main__":
     from dotenv import load_dotenv
@@ -0,0 +1,298 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+
+class FaissVectorIndex:
+    """FAISS-backed vector index for large question banks.
+
+    index_type:
+        "flat" - exact inner-product search
+        "ivf"  - inverted lists, tuned by nprobe; retrained with more lists
+                 as the corpus grows (FAISS wants ~39 training points per list)
+        "hnsw" - graph index, tuned by ef_search
+
+    Vectors are unit-normalized so inner product is cosine similarity.
+    Documents get stable int64 labels (stored directly by IVF, through an
+    IndexIDMap2 for the other types), which lets
+    ``add`` be called incrementally and lets category/difficulty filters run
+    inside FAISS through an ID selector. HNSW can't delete vectors, so
+    replaced or removed documents are tombstoned and filtered out instead;
+    once more than ``max_dead_fraction`` of the labels are dead the index
+    is rebuilt from the live vectors.
+    """
+
+    INDEX_FILE = "index.faiss"
+    DOCS_FILE = "documents.json"
+
+    def __init__(
+        self,
+        index_dir: str = "backend/data/faiss_index",
+        index_type: str = "flat",
+        nlist: int = 256,
+        nprobe: int = 16,
+        hnsw_m: int = 32,
+        ef_search: int = 128,
+        max_dead_fraction: float = 0.25,
+    ):
+        if index_type not in ("flat", "ivf", "hnsw"):
+            raise ValueError(f"Unknown FAISS index type: {index_type}")
+
+        self.index_dir = Path(index_dir)
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.max_dead_fraction = max_dead_fraction
+
+        self.index = None
+        self.docs: List[Optional[dict]] = []  # label -> {"id", "text", "metadata"} or None
+        self.label_of: Dict[str, int] = {}
+        self._facets: Dict[tuple, set] = {}
+        self._selectors: Dict[tuple, tuple] = {}
+
+    # ---------- Index Construction ----------
+    def _new_index(self, dim: int, n_train: int):
+        if self.index_type == "flat":
+            inner = faiss.IndexFlatIP(dim)
+        elif self.index_type == "ivf":
+            # FAISS wants ~39 training points per list
+            nlist = max(1, min(self.nlist, n_train // 39))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.nprobe = min(self.nprobe, nlist)
+            # IVF keeps ids itself; an id map would renumber on removal
+            # while the inverted lists don't
+            return index
+        else:
+            inner = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            inner.hnsw.efSearch = self.ef_search
+        return faiss.IndexIDMap2(inner)
+
+    def _inner(self):
+        """The index behind the id map (the index itself for IVF)"""
+        if isinstance(self.index, faiss.IndexIDMap2):
+            return faiss.downcast_index(self.index.index)
+        return faiss.downcast_index(self.index)
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    # ---------- Add / Remove ----------
+    def add(self, ids, texts, metadatas, vectors):
+        """Add documents; an id that already exists is replaced."""
+        if not len(ids):
+            return
+        vectors = self._normalize(vectors)
+
+        if self.index is None:
+            self.index = self._new_index(vectors.shape[1], len(vectors))
+        inner = self._inner()
+        if not inner.is_trained:
+            inner.train(vectors)
+
+        self.remove([doc_id for doc_id in ids if doc_id in self.label_of])
+
+        labels = np.arange(len(self.docs), len(self.docs) + len(ids), dtype=np.int64)
+        self.index.add_with_ids(vectors, labels)
+
+        for label, doc_id, text, metadata in zip(labels, ids, texts, metadatas):
+            label = int(label)
+            self.docs.append({"id": doc_id, "text": text, "metadata": metadata})
+            self.label_of[doc_id] = label
+            self._index_facets(label, metadata)
+        self._selectors.clear()
+        self._maybe_rebuild()
+
+    def remove(self, ids):
+        labels = [self.label_of.pop(doc_id) for doc_id in ids if doc_id in self.label_of]
+        if not labels:
+            return
+        if self.index_type != "hnsw":
+            self.index.remove_ids(np.array(labels, dtype=np.int64))
+        for label in labels:
+            self._unindex_facets(label, self.docs[label]["metadata"])
+            self.docs[label] = None
+        self._selectors.clear()
+        self._maybe_rebuild()
+
+    # ---------- Rebuild ----------
+    def _maybe_rebuild(self):
+        """Rebuild when dead labels pile up or an IVF index outgrew its lists"""
+        if not self.docs or self.index is None:
+            return
+        live = len(self.label_of)
+        if len(self.docs) - live > self.max_dead_fraction * len(self.docs):
+            self.rebuild()
+        elif self.index_type == "ivf":
+            nlist = self._inner().nlist
+            if min(self.nlist, live // 39) >= 2 * nlist:
+                self.rebuild()
+
+    def _vectors(self, labels) -> np.ndarray:
+        """Stored (normalized) vectors for labels"""
+        if self.index_type != "ivf":
+            return np.vstack([self.index.reconstruct(label) for label in labels])
+
+        # IVF has no id -> vector map: read the raw vectors off its lists
+        inner = self._inner()
+        wrapped = isinstance(self.index, faiss.IndexIDMap2)  # saved by older versions
+        id_map = faiss.vector_to_array(self.index.id_map) if wrapped else None
+        by_label = {}
+        for list_no in range(inner.nlist):
+            size = inner.invlists.list_size(list_no)
+            if not size:
+                continue
+            ids = faiss.rev_swig_ptr(inner.invlists.get_ids(list_no), size)
+            codes = faiss.rev_swig_ptr(inner.invlists.get_codes(list_no), size * inner.code_size)
+            vectors = np.frombuffer(codes, dtype=np.float32).reshape(size, inner.d)
+            for label, vector in zip(ids, vectors):
+                by_label[int(id_map[label] if wrapped else label)] = vector.copy()
+        return np.vstack([by_label[label] for label in labels])
+
+    def rebuild(self, index_type: Optional[str] = None):
+        """Rebuild from the live vectors: drops dead labels, retrains IVF
+        on the whole corpus, or converts to ``index_type``."""
+        labels = sorted(self.label_of.values())
+        vectors = self._vectors(labels) if labels else None
+        docs = [self.docs[label] for label in labels]
+
+        self.index_type = index_type or self.index_type
+        self.index, self.docs = None, []
+        self.label_of, self._facets, self._selectors = {}, {}, {}
+        if docs:
+            self.add(
+                [doc["id"] for doc in docs],
+                [doc["text"] for doc in docs],
+                [doc["metadata"] for doc in docs],
+                vectors,
+            )
+
+    def _index_facets(self, label: int, metadata: dict):
+        self._facets.setdefault(("*", None), set()).add(label)
+        for field in ("category", "difficulty"):
+            if field in metadata:
+                self._facets.setdefault((field, metadata[field]), set()).add(label)
+
+    def _unindex_facets(self, label: int, metadata: dict):
+        self._facets.get(("*", None), set()).discard(label)
+        for field in ("category", "difficulty"):
+            self._facets.get((field, metadata.get(field)), set()).discard(label)
+
+    # ---------- Persistence ----------
+    def exists(self) -> bool:
+        return (self.index_dir / self.INDEX_FILE).exists() and (
+            self.index_dir / self.DOCS_FILE
+        ).exists()
+
+    def save(self):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        index_tmp = self.index_dir / f"{self.INDEX_FILE}.tmp"
+        faiss.write_index(self.index, str(index_tmp))
+        docs_tmp = self.index_dir / f"{self.DOCS_FILE}.tmp"
+        with open(docs_tmp, "w", encoding="utf-8") as f:
+            json.dump({"index_type": self.index_type, "docs": self.docs}, f)
+        os.replace(index_tmp, self.index_dir / self.INDEX_FILE)
+        os.replace(docs_tmp, self.index_dir / self.DOCS_FILE)
+
+    def load(self):
+        with open(self.index_dir / self.DOCS_FILE, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        configured = self.index_type
+        self.index_type = saved["index_type"]
+        self.docs = saved["docs"]
+        self.index = faiss.read_index(str(self.index_dir / self.INDEX_FILE))
+
+        inner = self._inner()
+        if self.index_type == "ivf":
+            inner.nprobe = min(self.nprobe, inner.nlist)
+        elif self.index_type == "hnsw":
+            inner.hnsw.efSearch = self.ef_search
+
+        self.label_of, self._facets, self._selectors = {}, {}, {}
+        for label, doc in enumerate(self.docs):
+            if doc is not None:
+                self.label_of[doc["id"]] = label
+                self._index_facets(label, doc["metadata"])
+
+        legacy_ivf = self.index_type == "ivf" and isinstance(self.index, faiss.IndexIDMap2)
+        if self.index_type != configured or legacy_ivf:
+            print(
+                f"⚠️ FAISS index at {self.index_dir} is {self.index_type}, "
+                f"configured type is {configured}: rebuilding"
+            )
+            self.rebuild(index_type=configured)
+            self.save()
+        return self
+
+    def stored_hashes(self) -> Dict[str, Optional[str]]:
+        return {
+            doc_id: self.docs[label]["metadata"].get("content_hash")
+            for doc_id, label in self.label_of.items()
+        }
+
+    # ---------- Search ----------
+    def _search_params(self, category: Optional[str], difficulty: Optional[str]):
+        """FAISS search parameters restricting results to the filter, or None."""
+        tombstoned = len(self.label_of) < len(self.docs)
+        if category is None and difficulty is None and not tombstoned:
+            return None
+
+        key = (category, difficulty)
+        if key not in self._selectors:
+            allowed = set(self._facets.get(("*", None), set()))
+            if category is not None:
+                allowed &= self._facets.get(("category", category), set())
+            if difficulty is not None:
+                allowed &= self._facets.get(("difficulty", difficulty), set())
+            labels = np.fromiter(allowed, dtype=np.int64, count=len(allowed))
+            # the selector keeps a pointer into labels, so hold on to both
+            self._selectors[key] = (labels, faiss.IDSelectorBatch(len(labels), faiss.swig_ptr(labels)))
+
+        labels, selector = self._selectors[key]
+        if not len(labels):
+            return False
+
+        if self.index_type == "ivf":
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self._inner().nprobe)
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=self.ef_search)
+        return faiss.SearchParameters(sel=selector)
+
+    def search(
+        self,
+        query_vector,
+        category: Optional[str] = None,
+        k: int = 3,
+        difficulty: Optional[str] = None,
+    ) -> List[Document]:
+        """Top-k documents by cosine similarity, filtered by category/difficulty."""
+        if self.index is None or not self.label_of:
+            return []
+
+        params = self._search_params(category, difficulty)
+        if params is False:
+            return []
+
+        query = self._normalize(np.asarray(query_vector).reshape(1, -1))
+        if params is None:
+            _, labels = self.index.search(query, k)
+        else:
+            _, labels = self.index.search(query, k, params=params)
+
+        results = []
+        for label in labels[0]:
+            if label < 0 or self.docs[label] is None:
+                continue
+            doc = self.docs[label]
+            results.append(Document(page_content=doc["text"], metadata=doc["metadata"]))
+        return results
@@ -0,0 +1,364 @@
+# backend/app/services/ingestion.py
+"""
+Streaming ingestion of large question banks.
+
+    python run.py ingest path/to/questions.jsonl --workers 8 --batch-size 256
+
+Questions are read incrementally (JSON ``{category: [question, ...]}`` or
+JSONL with one ``{"category": ..., **question}`` per line), rendered and
+embedded in batches across a process pool, and written to the vector store
+in bounded chunks. After every chunk a checkpoint records how many
+questions are durable, so a failed run resumes from there. Questions whose
+content hash is already stored are not re-embedded. Documents ingested
+here aren't in the knowledge base's bank manifest, so its startup sync
+(Chroma or FAISS) leaves them in place.
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+from tqdm import tqdm
+
+from .knowledge_base import InterviewKnowledgeBase, load_embeddings
+
+
+# ---------- Incremental Readers ----------
+def _iter_json_bank(f, chunk_size=1 << 16):
+    """Yield (category, question) from a ``{category: [question, ...]}`` stream."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        data = f.read(chunk_size)
+        eof = not data
+        buf, pos = buf[pos:] + data, 0
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ""
+            fill()
+
+    def expect(chars):
+        nonlocal pos
+        c = peek()
+        if not c or c not in chars:
+            raise ValueError(f"❌ Malformed question bank: expected {chars!r}, got {c!r}")
+        pos += 1
+        return c
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, pos = decoder.raw_decode(buf, pos)
+                return obj
+            except json.JSONDecodeError:
+                # Value runs past the buffered text
+                if eof:
+                    raise
+                fill()
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        category = value()
+        expect(":")
+        expect("[")
+        if peek() == "]":
+            pos += 1
+        else:
+            while True:
+                yield category, value()
+                if expect(",]") == "]":
+                    break
+        if expect(",}") == "}":
+            return
+
+
+def iter_questions(path):
+    """Yield (category, question) pairs from a JSON or JSONL bank without loading it whole."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    q = json.loads(line)
+                    yield q.pop("category"), q
+        else:
+            yield from _iter_json_bank(f)
+
+
+def _batched(iterable, size):
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+# ---------- Worker Side ----------
+_worker_embeddings = None
+
+
+def _init_worker(embeddings_factory):
+    """Load the embedding model once per worker process."""
+    global _worker_embeddings
+    _worker_embeddings = embeddings_factory()
+
+
+def _process_batch(batch, stored):
+    """Render and embed one batch, skipping questions whose hash is in ``stored``.
+
+    Returns (ids, texts, metadatas, float32 vectors, number of questions read).
+    """
+    ids, texts, metadatas = [], [], []
+    for category, q in batch:
+        text, metadata = InterviewKnowledgeBase.build_document(category, q)
+        if stored.get(q["id"]) == metadata["content_hash"]:
+            continue
+        ids.append(q["id"])
+        texts.append(text)
+        metadatas.append(metadata)
+
+    vectors = np.asarray(
+        _worker_embeddings.embed_documents(texts) if texts else [], dtype=np.float32
+    )
+    return ids, texts, metadatas, vectors, len(batch)
+
+
+# ---------- Vector Store Sinks ----------
+class ChromaSink:
+    """Upserts into the knowledge base's Chroma collection."""
+
+    def __init__(self, persist_dir="backend/data/chroma_db", collection_name="interview_questions"):
+        import chromadb
+
+        self.persist_dir = persist_dir
+        self.client = chromadb.PersistentClient(path=persist_dir)
+        self.collection = self.client.get_or_create_collection(name=collection_name)
+        self.max_batch = self.client.get_max_batch_size()
+
+    def stored_hashes(self, page_size=10000):
+        stored, offset = {}, 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                stored[doc_id] = (meta or {}).get("content_hash")
+            if len(page["ids"]) < page_size:
+                return stored
+            offset += page_size
+
+    def write(self, ids, texts, metadatas, vectors):
+        for start in range(0, len(ids), self.max_batch):
+            end = start + self.max_batch
+            self.collection.upsert(
+                ids=ids[start:end],
+                embeddings=vectors[start:end],
+                metadatas=metadatas[start:end],
+                documents=texts[start:end],
+            )
+
+    def commit(self):
+        pass  # PersistentClient writes through
+
+
+class FaissSink:
+    """Adds to the FAISS index used by the ``faiss`` knowledge base backend."""
+
+    def __init__(self, index_dir="backend/data/vector_index", index_type="flat"):
+        from .faiss_index import FaissVectorIndex
+
+        self.index = FaissVectorIndex(index_dir, index_type=index_type)
+        if self.index.exists():
+            self.index.load()
+
+    def stored_hashes(self):
+        return self.index.stored_hashes()
+
+    def write(self, ids, texts, metadatas, vectors):
+        self.index.add(ids, texts, metadatas, vectors)
+
+    def commit(self):
+        if self.index.index is not None:
+            self.index.save()
+
+
+# ---------- Checkpoints ----------
+def _source_signature(path):
+    stat = Path(path).stat()
+    return {"source": str(Path(path).resolve()), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def load_checkpoint(checkpoint_path, source_path):
+    """Questions already written for this exact source file (0 if none)."""
+    if not checkpoint_path or not Path(checkpoint_path).exists():
+        return 0
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    signature = _source_signature(source_path)
+    if any(checkpoint.get(key) != value for key, value in signature.items()):
+        print("⚠️ Checkpoint is for a different or modified file, starting over")
+        return 0
+    return checkpoint.get("position", 0)
+
+
+def save_checkpoint(checkpoint_path, source_path, position):
+    checkpoint_path = Path(checkpoint_path)
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = checkpoint_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({**_source_signature(source_path), "position": position}, f)
+    os.replace(tmp_path, checkpoint_path)
+
+
+# ---------- Pipeline ----------
+def _ordered_results(batches, stored, workers, embeddings_factory):
+    """Process batches in a pool (inline when workers == 0), yielding in input order.
+
+    At most ``2 * workers`` batches are in flight, which bounds memory.
+    """
+    if workers <= 0:
+        _init_worker(embeddings_factory)
+        for batch in batches:
+            yield _process_batch(batch, stored)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(embeddings_factory,)
+    ) as pool:
+        pending = deque()
+        for batch in batches:
+            # Only ship the hashes this batch can match
+            known = {q["id"]: stored[q["id"]] for _, q in batch if q["id"] in stored}
+            pending.append(pool.submit(_process_batch, batch, known))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def ingest_file(
+    path,
+    sink,
+    batch_size=256,
+    write_size=4096,
+    workers=None,
+    checkpoint_path=None,
+    embeddings_factory=load_embeddings,
+):
+    """Stream a question bank into ``sink``; returns counts of what happened."""
+    workers = os.cpu_count() if workers is None else workers
+    position = load_checkpoint(checkpoint_path, path)
+    if position:
+        print(f"↩️ Resuming after {position} questions")
+
+    stored = sink.stored_hashes()
+    stats = {"read": 0, "embedded": 0, "unchanged": 0}
+    buffer = {"ids": [], "texts": [], "metadatas": [], "vectors": []}
+    consumed = 0
+
+    def flush():
+        nonlocal position, consumed
+        if buffer["ids"]:
+            sink.write(
+                buffer["ids"], buffer["texts"], buffer["metadatas"],
+                np.concatenate(buffer["vectors"]),
+            )
+            sink.commit()
+        position += consumed
+        consumed = 0
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, path, position)
+        for items in buffer.values():
+            items.clear()
+
+    started = time.perf_counter()
+    questions = islice(iter_questions(path), position, None)
+    results = _ordered_results(_batched(questions, batch_size), stored, workers, embeddings_factory)
+
+    with tqdm(desc="  ingest", unit="q", initial=position) as progress:
+        for ids, texts, metadatas, vectors, count in results:
+            stats["read"] += count
+            stats["embedded"] += len(ids)
+            stats["unchanged"] += count - len(ids)
+            consumed += count
+            progress.update(count)
+
+            if ids:
+                buffer["ids"].extend(ids)
+                buffer["texts"].extend(texts)
+                buffer["metadatas"].extend(metadatas)
+                buffer["vectors"].append(vectors)
+
+            if consumed >= write_size:
+                flush()
+        flush()
+
+    if checkpoint_path and Path(checkpoint_path).exists():
+        os.remove(checkpoint_path)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Ingested {stats['read']} questions in {elapsed:.1f}s "
+        f"({stats['read'] / elapsed if elapsed else 0:.0f}/s): "
+        f"{stats['embedded']} embedded, {stats['unchanged']} unchanged"
+    )
+    return stats
+
+
+# ---------- CLI ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a question bank into the vector store")
+    parser.add_argument("path", nargs="?", default="backend/data/interview_qa.json",
+                        help="JSON ({category: [...]}) or JSONL question bank")
+    parser.add_argument("--backend", choices=["chroma", "faiss"],
+                        default="faiss" if os.getenv("VECTOR_BACKEND") == "faiss" else "chroma")
+    parser.add_argument("--persist-dir", default="backend/data/chroma_db")
+    parser.add_argument("--index-dir", default=os.getenv("VECTOR_INDEX_DIR", "backend/data/vector_index"))
+    parser.add_argument("--faiss-index-type", default=os.getenv("FAISS_INDEX_TYPE", "flat"))
+    parser.add_argument("--batch-size", type=int, default=256, help="questions per embedding batch")
+    parser.add_argument("--write-size", type=int, default=4096,
+                        help="questions per vector store write and checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="embedding processes (0 embeds in this process)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file (default: ingest_checkpoint.json in the store dir)")
+    parser.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.backend == "faiss":
+        sink = FaissSink(args.index_dir, index_type=args.faiss_index_type)
+        store_dir = args.index_dir
+    else:
+        sink = ChromaSink(args.persist_dir)
+        store_dir = args.persist_dir
+
+    checkpoint = args.checkpoint or str(Path(store_dir) / "ingest_checkpoint.json")
+    if args.restart and Path(checkpoint).exists():
+        os.remove(checkpoint)
+
+    return ingest_file(
+        args.path,
+        sink,
+        batch_size=args.batch_size,
+        write_size=args.write_size,
+        workers=args.workers,
+        checkpoint_path=checkpoint,
+    )
+
+
+if __name__ == "__main__":
+    main()
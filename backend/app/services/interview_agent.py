@@ -1,9 +1,9 @@
 # backend/app/services/interview_agent.py
 
-import os
-from langchain_community.chat_models import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
 from .knowledge_base import InterviewKnowledgeBase
+from .model_router import get_model_router
+from .prompts import get_prompt
+from .token_budget import get_context_compactor, token_usage
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,11 +13,11 @@ class InterviewAgent:
     def __init__(self):
         """Agent uses Groq + local embeddings for RAG evaluation."""
         self.kb = InterviewKnowledgeBase()
-        self.llm = ChatGroq(
-            model="llama-3.1-8b-instant",
-            groq_api_key=os.getenv("GROQ_API_KEY"),
+        # Same model as before routing: the fast tier (LLM_ROUTE_AGENT to change)
+        self.llm = get_model_router().routed(
+            "agent",
             temperature=0.3,
-            max_tokens=1024
+            max_tokens=1024,
         )
 
     # ---------- Get Question ----------
@@ -39,29 +39,24 @@ class InterviewAgent:
             }
 
     # ---------- Evaluate Answer ----------
-    def evaluate_answer(self, question: str, user_answer: str, category: str):
-        """Use Groq LLaMA 3.1-8B model to evaluate user answers."""
-        expert_results = self.kb.search(question, category=category, k=2)
-        expert_context = "\n\n".join([r.page_content for r in expert_results])
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "You are an expert technical interviewer. "
-             "Evaluate the candidate's answer against expert examples. "
-             "Provide a score (0–100), strengths, weaknesses, and one improvement suggestion. "
-             "Be constructive and concise."),
-            ("human",
-             "Question: {question}\n\n"
-             "Expert Examples:\n{expert_context}\n\n"
-             "Candidate Answer:\n{user_answer}\n\n"
-             "Evaluation:")
-        ])
-
-        chain = prompt | self.llm
-        response = chain.invoke({
+    def evaluate_answer(self, question: str, user_answer: str, category: str, question_id: str = None):
+        """Evaluate a user answer with the agent's model (fast tier by default)."""
+        expert_context = self.kb.get_expert_context(question_id)
+        if expert_context is None:
+            # Not a bank question: retrieve similar ones instead
+            expert_results = self.kb.search(question, category=category, k=2)
+            expert_context = "\n\n".join([r.page_content for r in expert_results])
+        expert_context = get_context_compactor().compact(question_id, question, expert_context)
+
+        prompt = get_prompt("agent_evaluation")
+        inputs = {
             "question": question,
             "expert_context": expert_context,
             "user_answer": user_answer
-        })
+        }
+        token_usage.measure("agent_evaluation", {"instructions": prompt.instructions, **inputs})
+
+        chain = prompt.template | self.llm
+        response = chain.invoke(inputs)
 
         return response.content.strip()
@@ -1,11 +1,13 @@
-from langgraph.graph import StateGraph, END
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
 from typing import List
 from dataclasses import dataclass
-import os
 from dotenv import load_dotenv
-import time
+
+from .evaluator import JSON_MODE, aparse_or_repair, parse_or_repair, render_evaluation
+from .json_stream import IncrementalJSONParser
+from .model_router import get_model_router
+from .prompts import get_prompt
+from .token_budget import get_context_compactor, token_usage
+from .semantic_cache import create_semantic_cache
 
 # Load environment variables
 load_dotenv()
@@ -89,6 +91,19 @@ class InterviewKnowledgeBase:
         }
 
         self.question_index = {"coding": 0, "system_design": 0, "behavioral": 0}
+        self.expert_context = {
+            q["id"]: q["expert_answer"]
+            for questions in self.questions.values()
+            for q in questions
+        }
+
+    def get_expert_context(self, question_id: str):
+        """Expert answer for a bank question id, without touching the rotation.
+
+        Other ids (LLM follow-ups) get None, like InterviewKnowledgeBase, so
+        the graph falls back to a search.
+        """
+        return self.expert_context.get(question_id)
 
     def search(self, query: str, category: str = "coding", k: int = 1):
         """Get category-specific questions"""
@@ -125,13 +140,15 @@ class InterviewKnowledgeBase:
 
 # === MAIN GRAPH CLASS ===
 class InterviewGraph:
-    def __init__(self):
+    def __init__(self, semantic_cache=None):
         self.kb = InterviewKnowledgeBase()
-        self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0.7,
-            api_key=os.getenv("GROQ_API_KEY"),
+        self.semantic_cache = (
+            semantic_cache if semantic_cache is not None else create_semantic_cache()
         )
+        router = get_model_router()
+        self.llm = router.routed("evaluation", temperature=0.7)
+        # Follow-up wording may move to the fast model under load
+        self.followup_llm = router.routed("followup", temperature=0.7)
         self.graph = self.build_graph()
 
     # === NODE 1: Start Interview ===
@@ -173,96 +190,148 @@ class InterviewGraph:
         }
 
     # === NODE 3: Evaluate Answer ===
-    def evaluate_node(self, state: InterviewState):
-        """Evaluate answer using RAG with category context"""
-        category = state["category"]
-
-        # Get expert examples from knowledge base
-        expert_results = self.kb.search(
-            state["current_question"], category=category, k=2
+    def _expert_context(self, state: InterviewState) -> str:
+        """Precomputed expert context for the question, else a vector search,
+        compacted to the expert-context token budget"""
+        expert_context = self.kb.get_expert_context(state["current_question_id"])
+        if expert_context is None:
+            expert_results = self.kb.search(
+                state["current_question"], category=state["category"], k=2
+            )
+            expert_context = "\n\n".join([r.page_content for r in expert_results])
+        return get_context_compactor().compact(
+            state["current_question_id"], state["current_question"], expert_context
         )
-        expert_context = "\n\n".join([r.page_content for r in expert_results])
 
-        # Category-specific evaluation criteria
-        evaluation_focus = {
-            "coding": "code quality, algorithm efficiency, time/space complexity, edge cases",
-            "system_design": "scalability, reliability, trade-offs, component design, data flow",
-            "behavioral": "STAR method (Situation, Task, Action, Result), specific examples, impact, lessons learned",
+    def _evaluation_inputs(self, state: InterviewState):
+        """Build the evaluation prompt and its inputs for the current answer"""
+        prompt = get_prompt("evaluation", state["category"])
+        inputs = {
+            "question": state["current_question"],
+            "expert_context": self._expert_context(state),
+            "user_answer": state["user_answer"],
         }
+        token_usage.measure("evaluation", {"instructions": prompt.instructions, **inputs})
+        return prompt.template, inputs
 
-        focus = evaluation_focus.get(category, "overall quality")
-
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    f"""You are an expert {category} interviewer. Evaluate the candidate's answer focusing on: {focus}
-
-Provide your evaluation in this exact format:
-
-Score: X/100
+    def _evaluation_update(self, state: InterviewState, content: str, score: int):
+        """Turn an evaluation into a state update"""
+        evaluator_msg = Message(role="evaluator", content=content)
 
-Strengths:
-- [specific strength 1]
-- [specific strength 2]
+        print(f"⭐ Score: {score}/100")
 
-Weaknesses:
-- [specific weakness 1]
-- [specific weakness 2]
+        return {
+            "evaluation": content,
+            "score": score,
+            "messages": state["messages"] + [evaluator_msg],
+        }
 
-Improvement:
-[one actionable suggestion]
+    def _scored_update(self, state: InterviewState, evaluation, vector):
+        """State update for a parsed EvaluationScore, remembered for similar answers"""
+        update = self._evaluation_update(state, render_evaluation(evaluation), evaluation.total)
+        if vector is not None:
+            self.semantic_cache.add(self._semantic_key(state), vector, update["evaluation"], update["score"])
+        return update
 
-Be constructive, specific, and reference the expert examples.""",
-                ),
-                (
-                    "human",
-                    """Question: {question}
+    @staticmethod
+    def _semantic_key(state: InterviewState):
+        # LLM follow-ups reuse an id with different text, so key on both;
+        # the prompt version keeps evaluations from an older prompt out
+        version = get_prompt("evaluation", state["category"]).version
+        return (state["current_question_id"], state["current_question"], version)
 
-Expert Examples:
-{expert_context}
+    def evaluate_node(self, state: InterviewState):
+        """Evaluate answer using RAG with category context"""
+        vector = None
+        if self.semantic_cache:
+            vector = self.semantic_cache.embed(state["user_answer"])
+            cached = self.semantic_cache.match(self._semantic_key(state), vector)
+            if cached:
+                return self._evaluation_update(state, cached["evaluation"], cached["score"])
+
+        prompt, inputs = self._evaluation_inputs(state)
+        chain = prompt | self.llm.bind(**JSON_MODE)
+        response = chain.invoke(inputs)
+        return self._scored_update(state, parse_or_repair(response.content), vector)
+
+    async def _acached_evaluation(self, state: InterviewState):
+        """(cached {"evaluation", "score"} or None, answer vector or None)"""
+        if not self.semantic_cache:
+            return None, None
+        vector = await self.semantic_cache.aembed(state["user_answer"])
+        return self.semantic_cache.match(self._semantic_key(state), vector), vector
+
+    async def aevaluate_node(self, state: InterviewState):
+        """Async evaluate_node: awaits the LLM instead of blocking the event loop"""
+        cached, vector = await self._acached_evaluation(state)
+        if cached is not None:
+            return self._evaluation_update(state, cached["evaluation"], cached["score"])
+
+        prompt, inputs = self._evaluation_inputs(state)
+        chain = prompt | self.llm.bind(**JSON_MODE)
+        response = await chain.ainvoke(inputs)
+        return self._scored_update(state, await aparse_or_repair(response.content), vector)
+
+    async def astream_evaluation(self, state: InterviewState):
+        """Yield evaluation fields as the LLM produces them.
+
+        Yields ``(field, value)`` for each top-level field of the JSON
+        evaluation as soon as it is complete (the scores come first), then
+        ``("update", state update)`` with the same update as evaluate_node.
+        A semantic cache hit yields only the update.
+
+        Groq's JSON mode can't stream (the client falls back to one
+        blocking call), so this path streams in plain mode: the prompt
+        already asks for only the JSON object, the incremental parser skips
+        any fences or preamble, and aparse_or_repair() validates the result.
+        """
+        cached, vector = await self._acached_evaluation(state)
+        if cached is not None:
+            yield "update", self._evaluation_update(state, cached["evaluation"], cached["score"])
+            return
+
+        prompt, inputs = self._evaluation_inputs(state)
+        chain = prompt | self.llm
+        parser = IncrementalJSONParser()
+        async for chunk in chain.astream(inputs):
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            for field in parser.feed(text):
+                yield field
 
-Candidate Answer:
-{user_answer}
+        evaluation = await aparse_or_repair(parser.text)
+        yield "update", self._scored_update(state, evaluation, vector)
 
-Evaluation:""",
-                ),
-            ]
-        )
+    # === NODE 4: Generate Follow-up ===
+    def _followup_prompt(self, category: str):
+        """Prompt for LLM-generated follow-ups (used when the bank runs out)"""
+        return get_prompt("followup", category).template
 
-        chain = prompt | self.llm
-        response = chain.invoke(
-            {
-                "question": state["current_question"],
-                "expert_context": expert_context,
-                "user_answer": state["user_answer"],
-            }
-        )
+    def _followup_inputs(self, state: InterviewState):
+        return {
+            "question": state["current_question"],
+            "score": state["score"],
+            "category": state["category"],
+        }
 
+    def _generated_followup(self, state: InterviewState, response):
+        """Extract (question, id) from an LLM follow-up response"""
         content = response.content if hasattr(response, "content") else str(response)
+        new_question = content.strip().strip("\"'").split("\n")[0]
+        new_id = f"{state['current_question_id']}_followup"
+        return new_question, new_id
 
-        # Extract score
-        score = 70  # default
-        for line in content.split("\n"):
-            if "Score:" in line or "score:" in line.lower():
-                try:
-                    score_part = line.split(":")[1].strip().split("/")[0]
-                    score = int("".join(filter(str.isdigit, score_part)))
-                    break
-                except:
-                    pass
-
-        evaluator_msg = Message(role="evaluator", content=content)
+    def followup_update(self, state: InterviewState, new_question: str, new_id: str):
+        interviewer_msg = Message(role="interviewer", content=new_question)
 
-        print(f"⭐ Score: {score}/100")
+        print(f"➡️  Next question: {new_question[:100]}...")
 
         return {
-            "evaluation": content,
-            "score": score,
-            "messages": state["messages"] + [evaluator_msg],
+            "current_question": new_question,
+            "current_question_id": new_id,
+            "question_count": state["question_count"] + 1,
+            "messages": state["messages"] + [interviewer_msg],
         }
 
-    # === NODE 4: Generate Follow-up ===
     def followup_node(self, state: InterviewState):
         """Generate category-appropriate follow-up question"""
         category = state["category"]
@@ -275,63 +344,61 @@ Evaluation:""",
             new_id = results[0].metadata["id"]
         else:
             # Fallback: generate with LLM
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    (
-                        "system",
-                        f"""You are an expert {category} interviewer. Generate ONE relevant follow-up question.
-
-If score >= 70: Ask a deeper or optimization question
-If score < 70: Ask a clarifying or foundational question
-
-Keep it specific to {category} interviews.""",
-                    ),
-                    (
-                        "human",
-                        """Previous question: {question}
-Answer score: {score}/100
-Category: {category}
-
-Generate one follow-up question:""",
-                    ),
-                ]
-            )
+            chain = self._followup_prompt(category) | self.followup_llm
+            response = chain.invoke(self._followup_inputs(state))
+            new_question, new_id = self._generated_followup(state, response)
 
-            chain = prompt | self.llm
-            response = chain.invoke(
-                {
-                    "question": state["current_question"],
-                    "score": state["score"],
-                    "category": category,
-                }
-            )
+        return self.followup_update(state, new_question, new_id)
 
-            content = (
-                response.content if hasattr(response, "content") else str(response)
-            )
-            new_question = content.strip().strip("\"'").split("\n")[0]
-            new_id = f"{state['current_question_id']}_followup"
+    @staticmethod
+    def followup_branch(score: int) -> str:
+        """Which LLM follow-up prompt branch a score takes"""
+        return "deeper" if score >= 70 else "foundational"
 
-        interviewer_msg = Message(role="interviewer", content=new_question)
+    async def agenerate_followup(self, state: InterviewState):
+        chain = self._followup_prompt(state["category"]) | self.followup_llm
+        response = await chain.ainvoke(self._followup_inputs(state))
+        return self._generated_followup(state, response)
 
-        print(f"➡️  Next question: {new_question[:100]}...")
+    async def anext_question(self, state: InterviewState, allow_llm: bool = True):
+        """Pick the next question without touching state.
 
-        return {
-            "current_question": new_question,
-            "current_question_id": new_id,
-            "question_count": state["question_count"] + 1,
-            "messages": state["messages"] + [interviewer_msg],
-        }
+        Returns (question, id, branch) where branch is "bank" for a bank
+        question, otherwise the followup_branch() of the score used. With
+        allow_llm=False a bank miss returns (None, None, None).
+        """
+        category = state["category"]
+
+        results = self.kb.search(f"{category} followup", category=category, k=1)
+
+        if results and state["question_count"] < 3:
+            return results[0].metadata["question"], results[0].metadata["id"], "bank"
+
+        if not allow_llm:
+            return None, None, None
+
+        new_question, new_id = await self.agenerate_followup(state)
+        return new_question, new_id, self.followup_branch(state["score"])
+
+    async def afollowup_node(self, state: InterviewState):
+        """Async followup_node: the LLM fallback is awaited, not blocking"""
+        new_question, new_id, _ = await self.anext_question(state)
+        return self.followup_update(state, new_question, new_id)
 
     # === CONDITIONAL: Continue or End ===
+    def will_continue(self, state: InterviewState) -> bool:
+        return state.get("question_count", 0) < 3
+
     def should_continue(self, state: InterviewState):
         count = state.get("question_count", 0)
-        result = "continue" if count < 3 else "end"
+        result = "continue" if self.will_continue(state) else "end"
         print(f"🔄 Question {count}/3 - {result}")
         return result
 
     # === BUILD GRAPH ===
     def build_graph(self):
+        from langgraph.graph import StateGraph, END
+
         workflow = StateGraph(InterviewState)
 
         # Nodes
@@ -0,0 +1,156 @@
+import json
+from typing import Any, List, Tuple
+
+
+class StructuredOutputError(ValueError):
+    """LLM output couldn't be turned into the expected structure."""
+
+
+class IncrementalJSONParser:
+    """Surfaces the fields of a streamed JSON object as they complete.
+
+    Feed it chunks of model output; ``feed`` returns the top-level
+    ``(key, value)`` pairs finished by that chunk, so ``{"total": 85,``
+    yields ``("total", 85)`` before the rest of the object has arrived.
+    Strings complete at their closing quote, arrays and nested objects at
+    their closing bracket, numbers and literals at the following comma or
+    brace. Text before the first ``{`` (code fences, preambles) is ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields: dict = {}
+        self._pos = 0
+        self._depth = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._key_start = None
+        self._key = None
+        self._expect = "start"  # start | key | colon | value | comma | done
+        self._value_start = None
+
+    @property
+    def done(self) -> bool:
+        return self._expect == "done"
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        completed = []
+        for i in range(self._pos, len(self.text)):
+            field = self._step(i, self.text[i])
+            if field is not None:
+                self.fields[field[0]] = field[1]
+                completed.append(field)
+        self._pos = len(self.text)
+        return completed
+
+    def _emit(self, start: int, end: int):
+        key, self._key, self._value_start = self._key, None, None
+        try:
+            return key, json.loads(self.text[start:end])
+        except json.JSONDecodeError:
+            return None  # left to the final parse to report
+
+    def _step(self, i: int, c: str):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                if self._depth == 1:
+                    if self._expect == "key":
+                        self._key = json.loads(self.text[self._string_start : i + 1])
+                        self._expect = "colon"
+                    elif self._expect == "value" and self._value_start == self._string_start:
+                        self._expect = "comma"
+                        return self._emit(self._value_start, i + 1)
+            return None
+
+        if self._expect == "start":
+            if c == "{":
+                self._depth, self._stack, self._expect = 1, ["{"], "key"
+            return None
+        if self._expect == "done":
+            return None
+
+        if c == '"':
+            self._in_string = True
+            self._string_start = i
+            if self._depth == 1 and self._expect == "key":
+                self._key_start = i
+            if self._depth == 1 and self._expect == "value" and self._value_start is None:
+                self._value_start = i
+        elif c in "{[":
+            if self._depth == 1 and self._expect == "value" and self._value_start is None:
+                self._value_start = i
+            self._depth += 1
+            self._stack.append(c)
+        elif c in "}]":
+            self._depth -= 1
+            self._stack.pop()
+            if self._depth == 1 and self._expect == "value" and self._value_start is not None:
+                self._expect = "comma"
+                return self._emit(self._value_start, i + 1)
+            if self._depth == 0:
+                pending = self._expect == "value" and self._value_start is not None
+                start, self._expect = self._value_start, "done"
+                if pending:
+                    return self._emit(start, i)
+        elif self._depth == 1:
+            if c == ":" and self._expect == "colon":
+                self._expect, self._value_start = "value", None
+            elif c == ",":
+                pending = self._expect == "value" and self._value_start is not None
+                start, self._expect = self._value_start, "key"
+                if pending:
+                    return self._emit(start, i)
+            elif not c.isspace() and self._expect == "value" and self._value_start is None:
+                self._value_start = i  # number, true, false or null
+        return None
+
+    def closed_text(self) -> str:
+        """The object so far with open strings and brackets closed.
+
+        Lets output cut off by max_tokens be parsed for the fields it did
+        finish; a trailing key without a value is dropped.
+        """
+        start = self.text.find("{")
+        if start < 0:
+            return ""
+        dangling_key = self._depth == 1 and (
+            self._expect == "colon"
+            or (self._expect == "key" and self._in_string)
+            or (self._expect == "value" and self._value_start is None)
+        )
+        if dangling_key:
+            text = self.text[: self._key_start]
+        else:
+            text = self.text + ('"' if self._in_string else "")
+        text = text[start:].rstrip().rstrip(",")
+        return text + "".join("}" if b == "{" else "]" for b in reversed(self._stack))
+
+
+def parse_json_object(text: str) -> dict:
+    """The JSON object in ``text`` (fences and surrounding prose ignored).
+
+    Output truncated mid-object is closed and parsed as far as it goes.
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    if parser.done:
+        candidate = text[text.find("{") : text.rfind("}") + 1]
+    else:
+        candidate = parser.closed_text()
+    if not candidate:
+        raise StructuredOutputError("no JSON object in the output")
+    try:
+        value = json.loads(candidate)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"invalid JSON: {e}") from None
+    if not isinstance(value, dict):
+        raise StructuredOutputError("expected a JSON object")
+    return value
@@ -2,35 +2,138 @@
 
 import os
 import json
+import hashlib
+import threading
+from itertools import islice
 from pathlib import Path
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
 # from langchain_community.vectorstores.pgvector import PGVector  # optional for PostgreSQL later
-from tqdm import tqdm
-import chromadb
+
+from .embedding_batcher import EmbeddingBatcher
+from .lru_cache import LRUCache
+from .vector_index import NumpyVectorIndex
+
+
+def load_embeddings():
+    """Load the local MiniLM sentence-transformers model (normalized vectors)."""
+    from langchain_huggingface import HuggingFaceEmbeddings  # pulls in torch; load on demand
+
+    cache_folder = Path("backend/data/models")
+    cache_folder.mkdir(parents=True, exist_ok=True)
+
+    print("🔧 Loading embedding model (all-MiniLM-L6-v2)...")
+    embeddings = HuggingFaceEmbeddings(
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        cache_folder=str(cache_folder),
+        model_kwargs={'device': 'cpu'},  # change to 'cuda' if GPU available
+        encode_kwargs={'normalize_embeddings': True}
+    )
+    print("✅ Embedding model loaded and cached locally!")
+    return embeddings
+
+
+_shared_embeddings = None
+_shared_embeddings_lock = threading.Lock()
+
+
+def get_embeddings():
+    """The process-wide embedding model, shared by every consumer.
+
+    EMBEDDING_MODE:
+        "batched" (default) - in-process model behind an EmbeddingBatcher
+                              (EMBEDDING_BATCH_WINDOW_MS, EMBEDDING_BATCH_SIZE)
+        "process"           - batches are encoded in EMBEDDING_WORKERS worker
+                              processes, off the API process's GIL
+        "inline"            - the model is called directly
+    """
+    global _shared_embeddings
+    with _shared_embeddings_lock:
+        if _shared_embeddings is None:
+            mode = os.getenv("EMBEDDING_MODE", "batched")
+            if mode == "process":
+                from .embedding_pool import ProcessPoolEmbeddings
+
+                embeddings = ProcessPoolEmbeddings(
+                    load_embeddings, workers=int(os.getenv("EMBEDDING_WORKERS", "2"))
+                )
+            else:
+                embeddings = load_embeddings()
+            if mode in ("batched", "process"):
+                embeddings = EmbeddingBatcher(
+                    embeddings,
+                    max_wait_ms=float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5")),
+                    max_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+                )
+            _shared_embeddings = embeddings
+    return _shared_embeddings
+
+
+def close_embedding_workers():
+    """Stop the EMBEDDING_MODE=process worker processes, if any were started.
+
+    The preforking server calls this before fork(): forked workers start
+    their own pool, so the master's would only sit idle holding a model.
+    """
+    embeddings = _shared_embeddings
+    pool = getattr(embeddings, "embeddings", embeddings)
+    if hasattr(pool, "close"):
+        pool.close(wait=True)
+
+
+def load_manifest(path, source=None):
+    """{question id: content hash} stored at path, {} if there is none.
+
+    With ``source``, a manifest written for a different question bank
+    counts as none.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if source is not None and manifest.get("source", source) != source:
+        return {}
+    return manifest.get("documents", {})
+
+
+def save_manifest(path, hashes, source=None):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    manifest = {"count": len(hashes), "documents": hashes}
+    if source is not None:
+        manifest["source"] = source
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
 
 
 class InterviewKnowledgeBase:
-    def __init__(self, persist_dir="backend/data/chroma_db", use_pgvector=False):
-        """Knowledge base using HuggingFace embeddings and ChromaDB or pgvector."""
+    MANIFEST_FILE = "ingest_manifest.json"
+    SYNC_BATCH_SIZE = 256
+
+    def __init__(self, persist_dir="backend/data/chroma_db", use_pgvector=False,
+                 backend=None, index_dir=None):
+        """Knowledge base using HuggingFace embeddings and ChromaDB, pgvector or a NumPy index.
+
+        backend: "chroma", "pgvector", "numpy" or "faiss" (default: VECTOR_BACKEND
+        env, else "pgvector" when use_pgvector is set, else "chroma").
+        """
         self.persist_dir = persist_dir
-        self.use_pgvector = use_pgvector
+        self.backend = backend or ("pgvector" if use_pgvector else os.getenv("VECTOR_BACKEND", "chroma"))
+        self.use_pgvector = self.backend == "pgvector"
+        self.index_dir = index_dir or os.getenv("VECTOR_INDEX_DIR", "backend/data/vector_index")
         self.vector_store = None
+        self.vector_index = None
+        self.expert_context = {}  # question id -> rendered expert context
+
+        # query text -> embedding, and (embedding, filters, k) -> results
+        self.query_cache = LRUCache(int(os.getenv("KB_QUERY_CACHE_SIZE", "2048")))
+        self.result_cache = LRUCache(int(os.getenv("KB_RESULT_CACHE_SIZE", "2048")))
 
         # ---------- Load Embedding Model ----------
         print("🚀 Initializing Interview Knowledge Base...")
-        cache_folder = Path("backend/data/models")
-        cache_folder.mkdir(parents=True, exist_ok=True)
-
-        print("🔧 Loading embedding model (all-MiniLM-L6-v2)...")
         try:
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2",
-                cache_folder=str(cache_folder),
-                model_kwargs={'device': 'cpu'},  # change to 'cuda' if GPU available
-                encode_kwargs={'normalize_embeddings': True}
-            )
-            print("✅ Embedding model loaded and cached locally!")
+            self.embeddings = get_embeddings()
             # Initialize vector store with questions
             try:
                 self.ingest()
@@ -43,27 +146,33 @@ class InterviewKnowledgeBase:
             raise
 
     # ---------- Load JSON Questions ----------
-    def load_questions(self):
+    @staticmethod
+    def question_bank_path():
         # Resolve path from project root no matter where script runs
         base_dir = Path(__file__).resolve().parents[2]  # goes up from /app/services/ to /backend
-        file_path = base_dir / "data" / "interview_qa.json"
+        return Path(os.getenv("QUESTION_BANK_PATH", base_dir / "data" / "interview_qa.json"))
+
+    def iter_questions(self):
+        """Yield (category, question) from QUESTION_BANK_PATH (JSON or JSONL), streamed."""
+        from .ingestion import iter_questions
 
+        file_path = self.question_bank_path()
         if not file_path.exists():
-            raise FileNotFoundError(f"❌ interview_qa.json not found at {file_path.resolve()}")
+            raise FileNotFoundError(f"❌ Question bank not found at {file_path.resolve()}")
+        return iter_questions(file_path)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    # ---------- Ingest into Vector Store ----------
-    def ingest(self):
-        """Ingest questions into Chroma or pgvector with progress bar."""
-        print("📚 Loading questions...")
-        data = self.load_questions()
-        texts, metadatas = [], []
+    def load_questions(self):
+        """{category: [question, ...]} from QUESTION_BANK_PATH (JSON or JSONL)."""
+        data = {}
+        for category, q in self.iter_questions():
+            data.setdefault(category, []).append(q)
+        return data
 
-        for category, questions in data.items():
-            print(f"  Processing {category}...")
-            for q in tqdm(questions, desc=f"  {category}"):
-                doc = f"""
+    # ---------- Render Documents ----------
+    @staticmethod
+    def render_document(category, q):
+        """Text that gets embedded for one question."""
+        doc = f"""
 Question: {q['question']}
 Category: {category}
 Difficulty: {q['difficulty']}
@@ -80,30 +189,118 @@ Common Mistakes:
 Follow-ups:
 {chr(10).join(f"- {f}" for f in q['follow_ups'])}
 """
-                texts.append(doc.strip())
-                metadatas.append({
-                    "id": q["id"],
-                    "category": category,
-                    "difficulty": q["difficulty"],
-                    "question": q["question"]
-                })
+        return doc.strip()
+
+    @staticmethod
+    def render_expert_context(q):
+        """Reference material the evaluator compares an answer against."""
+        return f"""Expert Approach:
+{q['expert_approach']}
+
+Key Points:
+{chr(10).join(f"- {p}" for p in q['key_points'])}
+
+Common Mistakes:
+{chr(10).join(f"- {m}" for m in q['common_mistakes'])}"""
+
+    def get_expert_context(self, question_id):
+        """Precomputed expert context for a bank question, None for anything else."""
+        return self.expert_context.get(question_id)
+
+    @staticmethod
+    def content_hash(text, metadata):
+        """Stable hash of a rendered document and its metadata."""
+        payload = json.dumps([text, metadata], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def build_document(cls, category, q):
+        """(text, metadata) stored for one question, metadata carrying its content hash."""
+        text = cls.render_document(category, q)
+        metadata = {
+            "id": q["id"],
+            "category": category,
+            "difficulty": q["difficulty"],
+            "question": q["question"]
+        }
+        metadata["content_hash"] = cls.content_hash(text, metadata)
+        return text, metadata
+
+    # ---------- Ingestion Manifest ----------
+    @property
+    def manifest_path(self):
+        if self.backend in ("numpy", "faiss"):
+            return Path(self.index_dir) / f"{self.backend}_{self.MANIFEST_FILE}"
+        return Path(self.persist_dir) / self.MANIFEST_FILE
+
+    @property
+    def manifest_source(self):
+        return str(self.question_bank_path().resolve())
 
-        print(f"📊 Embedding {len(texts)} documents (this may take 30–60s)...")
+    def load_manifest(self):
+        """{question id: content hash} from the last successful ingest of this bank.
 
-        # ---------- Create Vector Store ----------
+        These are the documents the bank owns: only they are ever deleted
+        by a sync, so documents added by ``run.py ingest`` survive.
+        """
+        return load_manifest(self.manifest_path, source=self.manifest_source)
+
+    def save_manifest(self, hashes):
+        save_manifest(self.manifest_path, hashes, source=self.manifest_source)
+
+    # ---------- Ingest into Vector Store ----------
+    def ingest(self):
+        """Sync the vector store with the question bank (see ``_ingest``)."""
+        try:
+            return self._ingest()
+        finally:
+            # Cached results may point at replaced or removed documents
+            self.result_cache.clear()
+
+    def _documents(self):
+        """Yield (id, (text, metadata)) per bank question, refreshing expert context."""
+        for category, q in self.iter_questions():
+            self.expert_context[q["id"]] = self.render_expert_context(q)
+            yield q["id"], self.build_document(category, q)
+
+    def _ingest(self):
+        """Sync questions into Chroma or pgvector, keyed by question id.
+
+        Only documents whose content hash changed are re-embedded (upserted);
+        ids the bank owned at the last sync but no longer contains are
+        deleted. When the manifest and collection already match the bank
+        nothing is embedded at all. The bank is streamed: one pass hashes
+        it, a second embeds changed documents in SYNC_BATCH_SIZE batches.
+        """
+        print("📚 Loading questions...")
+        self.expert_context = {}
+
+        if self.backend in ("numpy", "faiss"):
+            documents = dict(self._documents())
+            hashes = {doc_id: meta["content_hash"] for doc_id, (_, meta) in documents.items()}
+            if self.backend == "numpy":
+                return self._ingest_numpy(documents, hashes)
+            return self._ingest_faiss(documents, hashes)
+
+        hashes = {doc_id: meta["content_hash"] for doc_id, (_, meta) in self._documents()}
+        owned = self.load_manifest()
+
+        # ---------- Open Vector Store ----------
         if self.use_pgvector:
             # PostgreSQL + pgvector (future production)
             from langchain_community.vectorstores.pgvector import PGVector
-            from sqlalchemy import create_engine
-            engine = create_engine(os.getenv("POSTGRES_URL"))
             self.vector_store = PGVector(
                 connection_string=os.getenv("POSTGRES_URL"),
                 embedding_function=self.embeddings,
                 collection_name="interview_qa"
             )
             print("✅ Using PostgreSQL + pgvector as vector store.")
+            collection = None
         else:
             # Local development (Chroma)
+            import chromadb
+            from langchain_chroma import Chroma
+
             try:
                 client = chromadb.PersistentClient(path=self.persist_dir)
                 collection = client.get_or_create_collection(name="interview_questions")
@@ -113,22 +310,195 @@ Follow-ups:
                     collection_name="interview_questions",
                     embedding_function=self.embeddings,
                 )
-
-                # Add documents to collection
-                self.vector_store.add_texts(
-                    texts=texts,
-                    metadatas=metadatas
-                )
-                print(f"✅ Stored in ChromaDB: {self.persist_dir}")
             except Exception as e:
                 print(f"⚠️ Error with ChromaDB: {str(e)}")
                 raise
 
-        return len(texts)
+            if owned == hashes and self._stored_count(collection, list(hashes)) == len(hashes):
+                print(f"✅ Knowledge base up to date ({len(hashes)} documents)")
+                return len(hashes)
+
+        removed = [doc_id for doc_id in owned if doc_id not in hashes]
+        if removed:
+            print(f"🗑️ Removing {len(removed)} stale documents...")
+            self.vector_store.delete(ids=removed)
+
+        changed = 0
+        documents = self._documents()
+        while batch := list(islice(documents, self.SYNC_BATCH_SIZE)):
+            if collection is None:
+                # pgvector can't cheaply list stored hashes, so trust the manifest
+                stored = owned
+            else:
+                existing = collection.get(ids=[doc_id for doc_id, _ in batch], include=["metadatas"])
+                stored = {
+                    doc_id: (meta or {}).get("content_hash")
+                    for doc_id, meta in zip(existing["ids"], existing["metadatas"])
+                }
+            batch = [(doc_id, doc) for doc_id, doc in batch if stored.get(doc_id) != hashes[doc_id]]
+            if batch:
+                print(f"📊 Embedding {len(batch)} new/changed documents...")
+                self.vector_store.add_texts(
+                    texts=[text for _, (text, _) in batch],
+                    metadatas=[meta for _, (_, meta) in batch],
+                    ids=[doc_id for doc_id, _ in batch]
+                )
+                changed += len(batch)
+
+        self.save_manifest(hashes)
+        print(
+            f"✅ Knowledge base synced: {changed} upserted, "
+            f"{len(removed)} removed, {len(hashes) - changed} unchanged"
+        )
+
+        return len(hashes)
+
+    def _stored_count(self, collection, ids):
+        """How many of ``ids`` the Chroma collection holds."""
+        return sum(
+            len(collection.get(ids=ids[start:start + 1000], include=[])["ids"])
+            for start in range(0, len(ids), 1000)
+        )
+
+    def _numpy_index(self):
+        return NumpyVectorIndex(
+            self.index_dir,
+            dtype=os.getenv("VECTOR_INDEX_DTYPE", "float32"),
+            rerank_factor=int(os.getenv("VECTOR_INDEX_RERANK", "4")),
+        )
+
+    def _ingest_numpy(self, documents, hashes):
+        """Rebuild the memory-mapped index, embedding only changed documents.
+
+        Stored documents the bank never owned are carried over, like the
+        other backends' sync leaves them in place.
+        """
+        index = self._numpy_index()
+        dtype = index.dtype
+        stored = index.load().stored_hashes() if index.exists() else {}
+        owned = self.load_manifest()
+
+        changed = [doc_id for doc_id, h in hashes.items() if stored.get(doc_id) != h]
+        removed = [doc_id for doc_id in owned if doc_id not in hashes and doc_id in stored]
+        if not changed and not removed and index.dtype == dtype:
+            self.vector_index = index
+            if owned != hashes:
+                self.save_manifest(hashes)
+            print(f"✅ Vector index up to date ({len(hashes)} documents)")
+            return len(documents)
+
+        changed_ids = set(changed)
+        unchanged = [doc_id for doc_id in hashes if doc_id not in changed_ids]
+        documents = dict(documents)
+        kept = [doc_id for doc_id in stored if doc_id not in hashes and doc_id not in owned]
+        row_of = {doc_id: row for row, doc_id in enumerate(index.ids)}
+        for doc_id in kept:
+            documents[doc_id] = (index.texts[row_of[doc_id]], index.metadatas[row_of[doc_id]])
+
+        vectors = {}
+        if unchanged or kept:
+            reused = unchanged + kept
+            vectors.update(zip(reused, index.get_vectors(reused)))
+        if changed:
+            print(f"📊 Embedding {len(changed)} new/changed documents...")
+            embedded = self.embeddings.embed_documents([documents[i][0] for i in changed])
+            vectors.update(zip(changed, embedded))
+
+        ids = list(documents)
+        index.dtype = dtype  # may differ from the stored one when VECTOR_INDEX_DTYPE changed
+        index.build(
+            ids,
+            [documents[i][0] for i in ids],
+            [documents[i][1] for i in ids],
+            [vectors[i] for i in ids],
+        )
+        self.save_manifest(hashes)
+        self.vector_index = index
+        print(
+            f"✅ Vector index rebuilt at {self.index_dir}: {len(changed)} embedded, "
+            f"{len(removed)} removed, {len(unchanged) + len(kept)} reused"
+        )
+        return len(hashes)
+
+    def _faiss_index(self):
+        from .faiss_index import FaissVectorIndex
+
+        index = FaissVectorIndex(
+            self.index_dir, index_type=os.getenv("FAISS_INDEX_TYPE", "flat")
+        )
+        return index.load() if index.exists() else index
+
+    def _ingest_faiss(self, documents, hashes):
+        """Incrementally add/replace/remove documents in the FAISS index.
+
+        Only ids the bank owned at the last sync are removed, so documents
+        added by ``run.py ingest --backend faiss`` survive.
+        """
+        index = self._faiss_index()
+        stored = index.stored_hashes()
+        owned = self.load_manifest()
+
+        changed = [doc_id for doc_id, h in hashes.items() if stored.get(doc_id) != h]
+        removed = [doc_id for doc_id in owned if doc_id not in hashes and doc_id in stored]
+
+        if changed or removed:
+            index.remove(removed)
+            if changed:
+                print(f"📊 Embedding {len(changed)} new/changed documents...")
+                index.add(
+                    changed,
+                    [documents[i][0] for i in changed],
+                    [documents[i][1] for i in changed],
+                    self.embeddings.embed_documents([documents[i][0] for i in changed]),
+                )
+            index.save()
+        if owned != hashes:
+            self.save_manifest(hashes)
+
+        self.vector_index = index
+        print(
+            f"✅ FAISS {index.index_type} index synced: {len(changed)} upserted, "
+            f"{len(removed)} removed, {len(hashes) - len(changed)} unchanged"
+        )
+        return len(documents)
 
     # ---------- Search ----------
-    def search(self, query: str, category: str = None, k: int = 3):
+    def embed_query(self, query: str):
+        """Query embedding, served from the LRU cache when seen before."""
+        vector = self.query_cache.get(query)
+        if vector is None:
+            vector = tuple(self.embeddings.embed_query(query))
+            self.query_cache.put(query, vector)
+        return vector
+
+    def cache_stats(self):
+        """Hit/miss counters for the query-embedding and result caches."""
+        return {
+            "query_embeddings": self.query_cache.get_stats(),
+            "results": self.result_cache.get_stats(),
+        }
+
+    def search(self, query: str, category: str = None, k: int = 3, difficulty: str = None):
         """Search for similar questions in the knowledge base."""
+        vector = self.embed_query(query)
+        key = (vector, category, k, difficulty)
+        results = self.result_cache.get(key)
+        if results is None:
+            results = self._search_by_vector(list(vector), category, k, difficulty)
+            self.result_cache.put(key, results)
+        return list(results)
+
+    def _search_by_vector(self, vector, category, k, difficulty):
+        if self.backend in ("numpy", "faiss"):
+            if self.vector_index is None:
+                if self.backend == "numpy":
+                    self.vector_index = self._numpy_index().load()
+                else:
+                    self.vector_index = self._faiss_index()
+            return self.vector_index.search(
+                vector, category=category, k=k, difficulty=difficulty
+            )
+
         if not self.vector_store:
             if self.use_pgvector:
                 from langchain_community.vectorstores.pgvector import PGVector
@@ -138,6 +508,9 @@ Follow-ups:
                     collection_name="interview_qa"
                 )
             else:
+                import chromadb
+                from langchain_chroma import Chroma
+
                 client = chromadb.PersistentClient(path=self.persist_dir)
                 self.vector_store = Chroma(
                     client=client,
@@ -145,9 +518,12 @@ Follow-ups:
                     embedding_function=self.embeddings
                 )
 
-        filter_dict = {"category": category} if category else None
-        results = self.vector_store.similarity_search(query, k=k, filter=filter_dict)
-        return results
+        filter_dict = {field: value for field, value in
+                       (("category", category), ("difficulty", difficulty)) if value} or None
+        if filter_dict and len(filter_dict) > 1 and not self.use_pgvector:
+            # Chroma needs an explicit $and for more than one field
+            filter_dict = {"$and": [{field: value} for field, value in filter_dict.items()]}
+        return self.vector_store.similarity_search_by_vector(vector, k=k, filter=filter_dict)
 
 
 # ---------- Run Test ----------
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from ..utils.forking import reset_after_fork
+
+
+class SQLiteLLMCache(BaseCache):
+    """Exact-match LLM response cache on local disk.
+
+    Entries are keyed on a hash of LangChain's llm_string (model, temperature
+    and the other call parameters) plus the rendered prompt. The table is
+    kept to max_entries by evicting the least recently used rows, and rows
+    older than ttl_seconds are treated as misses.
+    """
+
+    def __init__(
+        self,
+        path: str = "backend/data/llm_cache.db",
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._connect()
+        reset_after_fork(self._connect)
+
+    def _connect(self):
+        # Also runs in forked workers: SQLite connections must not cross fork()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.make_key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or self._expired(row[1], now):
+                self.stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.stats["hits"] += 1
+
+        return self._deserialize(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self.make_key(prompt, llm_string)
+        now = time.time()
+        value = self._serialize(return_val)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    @staticmethod
+    def _serialize(generations: RETURN_VAL_TYPE) -> str:
+        payload = []
+        for gen in generations:
+            if isinstance(gen, ChatGeneration):
+                payload.append({"message": messages_to_dict([gen.message])[0]})
+            else:
+                payload.append({"text": gen.text})
+        return json.dumps(payload)
+
+    @staticmethod
+    def _deserialize(value: str) -> RETURN_VAL_TYPE:
+        generations = []
+        for item in json.loads(value):
+            if "message" in item:
+                message = messages_from_dict([item["message"]])[0]
+                generations.append(ChatGeneration(message=message))
+            else:
+                generations.append(Generation(text=item["text"]))
+        return generations
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float):
+        """Drop expired rows, then least recently used rows over the limit"""
+        evicted = 0
+        if self.ttl_seconds is not None:
+            evicted += self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            evicted += self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+
+        self.stats["evictions"] += evicted
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": entries,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+_llm_cache: Optional[SQLiteLLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """Process-wide cache shared by every ChatGroq client (None if disabled)"""
+    global _llm_cache
+
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            ttl = float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+            _llm_cache = SQLiteLLMCache(
+                path=os.getenv("LLM_CACHE_PATH", "backend/data/llm_cache.db"),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000)),
+                ttl_seconds=ttl if ttl > 0 else None,
+            )
+        return _llm_cache
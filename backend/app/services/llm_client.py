@@ -0,0 +1,278 @@
+import functools
+import os
+import threading
+from typing import Optional
+
+import httpx
+
+from .llm_cache import get_llm_cache
+from .resilience import ResilientChatMixin
+from .singleflight import SingleFlightChatMixin
+from .token_budget import TokenUsageCallback
+
+# Per-model defaults; anything passed to create_chat_model wins
+MODEL_DEFAULTS = {
+    "llama-3.3-70b-versatile": {"request_timeout": 60.0},
+    "llama-3.1-8b-instant": {"request_timeout": 20.0, "max_tokens": 1024},
+}
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("LLM_HTTP2", "true").lower() in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class _MeteredStream:
+    """Response body that marks the request finished when it is closed."""
+
+    def __init__(self, stream, done):
+        self._stream = stream
+        self._done = done
+
+    def __iter__(self):
+        yield from self._stream
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._done()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+
+class _SyncStream(_MeteredStream, httpx.SyncByteStream):
+    pass
+
+
+class _AsyncStream(_MeteredStream, httpx.AsyncByteStream):
+    pass
+
+
+class PooledTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Keep-alive connection pool shared by every LLM client in the process.
+
+    Wraps one httpx sync and one async transport (each with its own pool,
+    both capped by ``limits``) and counts requests while they are in flight,
+    i.e. until the response body is closed. The inner transports are created
+    on first use and dropped in forked children, whose connections would
+    otherwise be the parent's sockets.
+    """
+
+    def __init__(self, limits: httpx.Limits, http2: bool = False):
+        self.limits = limits
+        self.http2 = http2
+        self.stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._sync = None
+        self._async = None
+        self.stats["in_flight"] = 0
+
+    def _started(self):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+
+    def _finished(self, error: bool = False):
+        with self._lock:
+            self.stats["in_flight"] -= 1
+            if error:
+                self.stats["errors"] += 1
+
+    def _once(self):
+        done = False
+
+        def finish():
+            nonlocal done
+            if not done:
+                done = True
+                self._finished()
+
+        return finish
+
+    # ---------- Transports ----------
+    def _sync_transport(self) -> httpx.HTTPTransport:
+        with self._lock:
+            if self._sync is None:
+                self._sync = httpx.HTTPTransport(limits=self.limits, http2=self.http2)
+            return self._sync
+
+    def _async_transport(self) -> httpx.AsyncHTTPTransport:
+        with self._lock:
+            if self._async is None:
+                self._async = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            return self._async
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._started()
+        try:
+            response = self._sync_transport().handle_request(request)
+        except Exception:
+            self._finished(error=True)
+            raise
+        return self._metered(response, _SyncStream)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._started()
+        try:
+            response = await self._async_transport().handle_async_request(request)
+        except Exception:
+            self._finished(error=True)
+            raise
+        return self._metered(response, _AsyncStream)
+
+    def _metered(self, response: httpx.Response, stream_type) -> httpx.Response:
+        finish = self._once()
+        if response.is_closed:
+            # Body already buffered (nothing left to stream)
+            finish()
+        else:
+            response.stream = stream_type(response.stream, finish)
+        return response
+
+    def close(self):
+        if self._sync is not None:
+            self._sync.close()
+
+    async def aclose(self):
+        if self._async is not None:
+            await self._async.aclose()
+
+    # ---------- Metrics ----------
+    @staticmethod
+    def _connections(transport) -> dict:
+        # httpcore's pool keeps its connection list private-ish; best effort
+        connections = list(getattr(getattr(transport, "_pool", None), "connections", []))
+        return {
+            "open": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+        }
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "http2": self.http2,
+            "sync_connections": self._connections(self._sync),
+            "async_connections": self._connections(self._async),
+        }
+
+
+_transport: Optional[PooledTransport] = None
+_clients: Optional[tuple] = None
+_clients_lock = threading.Lock()
+
+
+def get_http_clients() -> tuple:
+    """Process-wide (httpx.Client, httpx.AsyncClient) for LLM API calls"""
+    global _transport, _clients
+
+    with _clients_lock:
+        if _clients is None:
+            _transport = PooledTransport(
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("LLM_POOL_SIZE", 20)),
+                    max_keepalive_connections=int(os.getenv("LLM_POOL_KEEPALIVE", 20)),
+                    keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_SECONDS", 60)),
+                ),
+                http2=_http2_enabled(),
+            )
+            timeout = httpx.Timeout(
+                float(os.getenv("LLM_TIMEOUT_SECONDS", 60)),
+                connect=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", 5)),
+                # Waiting for a free connection when the pool is saturated
+                pool=float(os.getenv("LLM_POOL_TIMEOUT_SECONDS", 30)),
+            )
+            _clients = (
+                httpx.Client(transport=_transport, timeout=timeout),
+                httpx.AsyncClient(transport=_transport, timeout=timeout),
+            )
+        return _clients
+
+
+def get_pool_stats() -> dict:
+    """Connection pool usage (empty until the first LLM client is created)"""
+    return _transport.get_stats() if _transport is not None else {}
+
+
+if hasattr(os, "register_at_fork"):
+    # Forked server workers open their own connections
+    os.register_at_fork(after_in_child=lambda: _transport and _transport._reset())
+
+
+@functools.lru_cache(maxsize=None)
+def _chat_model_class(single_flight: bool, resilient: bool):
+    from langchain_groq import ChatGroq
+
+    # Order matters: coalesce first, then deadline/hedge/retry the one call
+    mixins = tuple(
+        mixin for mixin, enabled in (
+            (SingleFlightChatMixin, single_flight),
+            (ResilientChatMixin, resilient),
+        ) if enabled
+    )
+    if not mixins:
+        return ChatGroq
+    return type("PooledChatGroq", mixins + (ChatGroq,), {"__module__": __name__})
+
+
+# Shared by every chat model: records token usage per call
+_usage_callback = TokenUsageCallback()
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "true").lower() not in ("0", "false", "no")
+
+
+def create_chat_model(model: Optional[str] = None, temperature: float = 0.7, **overrides):
+    """ChatGroq client on the shared connection pool.
+
+    ``model`` defaults to Settings.llm_model (LLM_MODEL). Per-model defaults from MODEL_DEFAULTS
+    (timeouts, max_tokens) apply unless overridden. The response cache is
+    attached as before, identical concurrent requests are coalesced
+    (LLM_SINGLE_FLIGHT) and calls run under the model's resilience policy
+    (LLM_RESILIENCE). The policy does the retrying, so the SDK's own
+    retries (LLM_MAX_RETRIES) default to off unless the policy is disabled.
+    Prompt/completion tokens of every call are recorded in token_usage.
+    """
+    resilient = _flag("LLM_RESILIENCE")
+    if not model:
+        from ...config import settings
+
+        model = settings.llm_model
+    http_client, http_async_client = get_http_clients()
+    options = {
+        "max_retries": int(os.getenv("LLM_MAX_RETRIES", 0 if resilient else 2)),
+        **MODEL_DEFAULTS.get(model, {}),
+        **overrides,
+    }
+    return _chat_model_class(_flag("LLM_SINGLE_FLIGHT"), resilient)(
+        model=model,
+        temperature=temperature,
+        api_key=os.getenv("GROQ_API_KEY"),
+        cache=get_llm_cache(),
+        http_client=http_client,
+        http_async_client=http_async_client,
+        callbacks=[_usage_callback],
+        **options,
+    )
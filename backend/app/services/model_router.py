@@ -0,0 +1,178 @@
+import os
+import threading
+from typing import Optional
+
+from langchain_core.runnables import Runnable
+
+from .llm_client import create_chat_model, get_pool_stats
+from .resilience import get_policy
+
+
+class RoutedChatModel(Runnable):
+    """Chat model stand-in that asks the router which model to use per call.
+
+    Works anywhere a chat model does in a chain (``prompt | llm``): invoke,
+    ainvoke, stream and astream are forwarded to the model picked for the
+    task at that moment.
+    """
+
+    def __init__(self, router: "ModelRouter", task: str, **model_options):
+        self.router = router
+        self.task = task
+        self.model_options = model_options
+
+    def current(self):
+        return self.router.model_for(self.task, **self.model_options)
+
+    @property
+    def client(self):
+        # API client of the task's preferred model (warmup health check)
+        route = self.router.routes[self.task]
+        return self.router.model("quality" if route == "auto" else route, **self.model_options).client
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.current().invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self.current().ainvoke(input, config, **kwargs)
+
+    def stream(self, input, config=None, **kwargs):
+        yield from self.current().stream(input, config, **kwargs)
+
+    async def astream(self, input, config=None, **kwargs):
+        async for chunk in self.current().astream(input, config, **kwargs):
+            yield chunk
+
+
+class ModelRouter:
+    """Picks a model per LLM task from quality tiers and recent health.
+
+    Tiers map to models: "quality" is Settings.llm_model (LLM_MODEL) and
+    "fast" is Settings.llm_fast_model (LLM_FAST_MODEL), so values from
+    ``.env`` apply too. Each task routes to "quality", "fast" or "auto"
+    (LLM_ROUTE_<TASK>). Scoring tasks stay on the quality tier by default;
+    repairing malformed JSON output and InterviewAgent's RAG evaluation
+    ("agent") use the fast one. "auto" tasks (follow-up wording) use the
+    quality model unless it is degraded, then the fast one:
+
+        - its circuit breaker isn't closed
+        - its recent error rate is above max_error_rate
+        - its p95 latency is above latency_slo seconds
+        - the shared LLM connection pool is more than load_factor busy
+
+    and only while the fast model itself is healthy.
+    """
+
+    TASKS = ("evaluation", "scoring", "followup", "repair", "agent")
+    DEFAULT_ROUTES = {
+        "evaluation": "quality", "scoring": "quality", "followup": "auto", "repair": "fast",
+        "agent": "fast",
+    }
+
+    def __init__(
+        self,
+        tiers: Optional[dict] = None,
+        routes: Optional[dict] = None,
+        latency_slo: float = 8.0,
+        max_error_rate: float = 0.2,
+        load_factor: float = 0.75,
+        model_factory=create_chat_model,
+    ):
+        if not tiers:
+            from ...config import settings
+
+            tiers = {"quality": settings.llm_model, "fast": settings.llm_fast_model}
+        self.tiers = tiers
+        self.routes = {
+            task: os.getenv(f"LLM_ROUTE_{task.upper()}", default).lower()
+            for task, default in self.DEFAULT_ROUTES.items()
+        }
+        self.routes.update(routes or {})
+        self.latency_slo = latency_slo
+        self.max_error_rate = max_error_rate
+        self.load_factor = load_factor
+        self.model_factory = model_factory
+
+        self._models: dict = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            task: {"quality": 0, "fast": 0, "downgrades": {}} for task in self.TASKS
+        }
+
+    # ---------- Models ----------
+    def model(self, tier: str, **options):
+        """Chat model for a tier (created once per tier and options)"""
+        key = (tier, tuple(sorted(options.items())))
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = self.model_factory(model=self.tiers[tier], **options)
+            return self._models[key]
+
+    def routed(self, task: str, **options) -> RoutedChatModel:
+        return RoutedChatModel(self, task, **options)
+
+    # ---------- Routing ----------
+    def _unhealthy(self, tier: str) -> Optional[str]:
+        policy = get_policy(self.tiers[tier])
+        if policy.breaker.state != "closed":
+            return "breaker"
+        if policy.error_rate > self.max_error_rate:
+            return "errors"
+        return None
+
+    def degraded(self, tier: str) -> Optional[str]:
+        """Why a tier's model shouldn't take optional work, or None"""
+        reason = self._unhealthy(tier)
+        if reason:
+            return reason
+        policy = get_policy(self.tiers[tier])
+        p95 = policy.latencies.percentile(0.95)
+        if p95 is not None and p95 > self.latency_slo:
+            return "latency"
+        pool = get_pool_stats()
+        if pool and pool["in_flight"] >= self.load_factor * pool["max_connections"]:
+            return "load"
+        return None
+
+    def select(self, task: str) -> str:
+        """Tier to use for one call of ``task``"""
+        route = self.routes[task]
+        tier = route
+        if route == "auto":
+            tier = "quality"
+            reason = self.degraded("quality")
+            # Only move work to a fast model that is itself healthy
+            if reason and not self._unhealthy("fast"):
+                tier = "fast"
+                with self._lock:
+                    downgrades = self.stats[task]["downgrades"]
+                    downgrades[reason] = downgrades.get(reason, 0) + 1
+        with self._lock:
+            self.stats[task][tier] += 1
+        return tier
+
+    def model_for(self, task: str, **options):
+        return self.model(self.select(task), **options)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = {task: {**s, "downgrades": dict(s["downgrades"])} for task, s in self.stats.items()}
+        return {"tiers": dict(self.tiers), "routes": dict(self.routes), "tasks": stats}
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Process-wide router shared by the graph, evaluator and agent"""
+    global _router
+
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(
+                latency_slo=float(os.getenv("LLM_ROUTER_LATENCY_SLO_SECONDS", 8.0)),
+                max_error_rate=float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", 0.2)),
+                load_factor=float(os.getenv("LLM_ROUTER_LOAD_FACTOR", 0.75)),
+            )
+        return _router
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
+# Category-specific evaluation criteria
+EVALUATION_FOCUS = {
+    "coding": "code quality, algorithm efficiency, time/space complexity, edge cases",
+    "system_design": "scalability, reliability, trade-offs, component design, data flow",
+    "behavioral": "STAR method (Situation, Task, Action, Result), specific examples, impact, lessons learned",
+}
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """A template with its static parts filled in, plus its version.
+
+    ``version`` is a hash of the message templates and the static values
+    filled into them: it changes exactly when the prompt the LLM sees
+    changes, so response caches can key on it. ``instructions`` is the
+    rendered system message (for token accounting).
+    """
+
+    name: str
+    category: Optional[str]
+    template: ChatPromptTemplate
+    version: str
+    instructions: str
+
+
+class PromptRegistry:
+    """Builds each prompt once per (name, category) and keeps it.
+
+    A prompt is registered as a function of the category returning the
+    message list and the static values to fill in (evaluation focus,
+    format instructions, ...). Per-call work is then only formatting the
+    per-answer inputs.
+    """
+
+    def __init__(self):
+        self._builders: dict = {}
+        self._compiled: dict = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, build: Callable[[Optional[str]], tuple]):
+        """``build(category) -> (messages, static values)``"""
+        with self._lock:
+            self._builders[name] = build
+            self._compiled = {k: v for k, v in self._compiled.items() if k[0] != name}
+
+    def prompt(self, name: str):
+        """Decorator form of register()"""
+
+        def decorator(build):
+            self.register(name, build)
+            return build
+
+        return decorator
+
+    def get(self, name: str, category: Optional[str] = None) -> CompiledPrompt:
+        key = (name, category)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(key)
+                if compiled is None:
+                    compiled = self._compiled[key] = self._compile(name, category)
+        return compiled
+
+    def _compile(self, name: str, category: Optional[str]) -> CompiledPrompt:
+        messages, static = self._builders[name](category)
+        payload = json.dumps([name, category, messages, static], sort_keys=True)
+        template = ChatPromptTemplate.from_messages(messages)
+        return CompiledPrompt(
+            name=name,
+            category=category,
+            template=template.partial(**static) if static else template,
+            version=hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12],
+            instructions=messages[0][1].format(**static),
+        )
+
+    def versions(self) -> dict:
+        """Version of every prompt compiled so far ("name[:category]" -> hash)"""
+        with self._lock:
+            compiled = list(self._compiled.values())
+        return {
+            f"{p.name}:{p.category}" if p.category else p.name: p.version for p in compiled
+        }
+
+
+prompt_registry = PromptRegistry()
+
+
+def get_prompt(name: str, category: Optional[str] = None) -> CompiledPrompt:
+    return prompt_registry.get(name, category)
+
+
+# ---------- Interview graph ----------
+@prompt_registry.prompt("evaluation")
+def _evaluation_prompt(category):
+    # Imported here: evaluator builds on this registry
+    from .evaluator import EvaluationScore, compact_format_instructions
+
+    system = """You are an expert {category} interviewer. Evaluate the candidate's answer focusing on: {focus}
+
+Use this rubric:
+- Correctness (0-40): Technical accuracy, sound reasoning
+- Clarity (0-30): How well explained, logical flow
+- Completeness (0-30): Edge cases, trade-offs, alternatives
+
+Give 2-3 specific strengths and weaknesses and one actionable improvement.
+Be constructive, specific, and reference the expert examples.
+
+{format_instructions}"""
+    human = """Question: {question}
+
+Expert Examples:
+{expert_context}
+
+Candidate Answer:
+{user_answer}
+
+Evaluation (JSON):"""
+    static = {
+        "category": category,
+        "focus": EVALUATION_FOCUS.get(category, "overall quality"),
+        "format_instructions": compact_format_instructions(EvaluationScore),
+    }
+    return [("system", system), ("human", human)], static
+
+
+@prompt_registry.prompt("followup")
+def _followup_prompt(category):
+    """LLM-generated follow-ups (used when the bank runs out)"""
+    system = """You are an expert {category} interviewer. Generate ONE relevant follow-up question.
+
+If score >= 70: Ask a deeper or optimization question
+If score < 70: Ask a clarifying or foundational question
+
+Keep it specific to {category} interviews."""
+    human = """Previous question: {question}
+Answer score: {score}/100
+Category: {category}
+
+Generate one follow-up question:"""
+    return [("system", system), ("human", human)], {"category": category}
+
+
+# ---------- InterviewAgent ----------
+@prompt_registry.prompt("agent_evaluation")
+def _agent_evaluation_prompt(category):
+    system = (
+        "You are an expert technical interviewer. "
+        "Evaluate the candidate's answer against expert examples. "
+        "Provide a score (0–100), strengths, weaknesses, and one improvement suggestion. "
+        "Be constructive and concise."
+    )
+    human = (
+        "Question: {question}\n\n"
+        "Expert Examples:\n{expert_context}\n\n"
+        "Candidate Answer:\n{user_answer}\n\n"
+        "Evaluation:"
+    )
+    return [("system", system), ("human", human)], {}
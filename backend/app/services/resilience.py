@@ -0,0 +1,482 @@
+import asyncio
+import contextvars
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+
+class LLMUnavailable(Exception):
+    """The LLM couldn't answer in time; callers should fail fast (503)."""
+
+
+class DeadlineExceeded(LLMUnavailable, TimeoutError):
+    pass
+
+
+class CircuitOpen(LLMUnavailable):
+    pass
+
+
+def _transient_errors() -> tuple:
+    # Client libraries only raise their errors once imported, so a module
+    # that isn't loaded yet can be left out (keeps the LLM stack unimported)
+    errors = [TimeoutError, ConnectionError]  # asyncio.TimeoutError is TimeoutError
+    for module, name in (("httpx", "TransportError"), ("groq", "APIConnectionError")):
+        error = getattr(sys.modules.get(module), name, None)
+        if error is not None:
+            errors.append(error)
+    return tuple(errors)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection errors, 429 and 5xx are worth another try"""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, _transient_errors())
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds)"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-quantile of the window, or None until min_samples are in"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitBreaker:
+    """Stops calling an upstream that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls fail immediately for ``reset_seconds``; then one trial call is let
+    through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+def _llm_budget() -> float:
+    # Share of the endpoint latency budget left for LLM calls; the rest
+    # covers retrieval, persistence and the response itself
+    return float(os.getenv("LLM_LATENCY_BUDGET_SECONDS", 30)) * 0.8
+
+
+# When the current request's LLM budget runs out (time.monotonic())
+_request_deadline = contextvars.ContextVar("llm_request_deadline", default=None)
+# When the running attempt's HTTP request should give up
+_attempt_deadline = contextvars.ContextVar("llm_attempt_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float] = None):
+    """Share one LLM budget between every call made inside the block.
+
+    Each call then gets the smaller of its own deadline and what is left
+    of ``seconds`` (default: 80% of LLM_LATENCY_BUDGET_SECONDS), so an
+    endpoint making several calls in a row still answers within budget.
+    A nested block never extends the outer deadline. Tasks started inside
+    the block inherit it.
+    """
+    deadline = time.monotonic() + (_llm_budget() if seconds is None else seconds)
+    outer = _request_deadline.get()
+    token = _request_deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        try:
+            _request_deadline.reset(token)
+        except ValueError:
+            pass  # an abandoned generator finalized from another context
+
+
+def attempt_timeout() -> Optional[float]:
+    """Seconds the running attempt has left (None outside a policy call)"""
+    deadline = _attempt_deadline.get()
+    return None if deadline is None else max(0.001, deadline - time.monotonic())
+
+
+# Sync attempts (and their hedges) run here so the caller can stop waiting
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_HEDGE_THREADS", 32)), thread_name_prefix="llm-call"
+)
+
+
+class ResiliencePolicy:
+    """Deadline, hedging, retries and a circuit breaker for one model.
+
+    Every call gets ``deadline`` seconds in total. An attempt that hasn't
+    answered after the model's recent ``hedge_quantile`` latency (p95, at
+    least ``hedge_min_delay``) gets a duplicate request; the first answer
+    wins and the other is cancelled (async) or abandoned (sync). Retryable
+    failures are retried with full-jitter exponential backoff while the
+    deadline allows, and consecutive retryable failures trip the breaker,
+    after which calls fail immediately with CircuitOpen; other errors are
+    raised as they are. The caller's wait is therefore
+    bounded by the deadline whatever the upstream tail does. Inside a
+    request_deadline() block the deadline is also capped by what is left
+    of the request's budget.
+    """
+
+    def __init__(
+        self,
+        deadline: float = 24.0,
+        retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 2.0,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.5,
+        breaker: Optional[CircuitBreaker] = None,
+        latencies: Optional[LatencyTracker] = None,
+    ):
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = latencies or LatencyTracker()
+        self.error_rate = 0.0
+        self.error_alpha = 0.1
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0, "failures": 0, "retries": 0, "hedges": 0,
+            "hedge_wins": 0, "deadline_exceeded": 0, "rejected": 0,
+        }
+
+    def _outcome(self, ok: bool):
+        # Recent error rate (EWMA over attempts) feeds the model router
+        with self._lock:
+            self.error_rate += self.error_alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (None: not enough data / disabled)"""
+        if not self.hedge:
+            return None
+        p = self.latencies.percentile(self.hedge_quantile)
+        return None if p is None else max(self.hedge_min_delay, p)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _count(self, name: str):
+        self.stats[name] += 1
+
+    def _admit(self):
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpen("LLM circuit breaker is open")
+
+    def _call_deadline(self) -> float:
+        """Deadline for a call starting now (time.monotonic())"""
+        now = time.monotonic()
+        deadline = now + self.deadline
+        shared = _request_deadline.get()
+        if shared is not None and shared < deadline:
+            if shared <= now:
+                self._count("deadline_exceeded")
+                raise DeadlineExceeded("the request's LLM latency budget is spent")
+            deadline = shared
+        return deadline
+
+    def _failed(self, error: BaseException, attempt: int, deadline: float) -> float:
+        """Record a failure; seconds to sleep before retrying, or re-raise"""
+        self._count("failures")
+        if not is_retryable(error):
+            # A bad request or a bug says nothing about the upstream's health;
+            # it also ends a half-open breaker's trial
+            self.breaker.record_success()
+            raise error
+        self._outcome(ok=False)
+        if isinstance(error, DeadlineExceeded):
+            self._count("deadline_exceeded")
+            raise error
+        pause = self._backoff(attempt)
+        if attempt >= self.retries or time.monotonic() + pause >= deadline:
+            raise error
+        self._count("retries")
+        return pause
+
+    # ---------- Sync ----------
+    def call(self, fn):
+        self._count("calls")
+        deadline = self._call_deadline()
+        attempt = 0
+        while True:
+            self._admit()
+            try:
+                result = self._attempt(fn, deadline)
+            except Exception as e:
+                time.sleep(self._failed(e, attempt, deadline))
+                attempt += 1
+                continue
+            self._outcome(ok=True)
+            return result
+
+    def _timed(self, fn, deadline: float):
+        # Runs in a copied context: attempt_timeout() lets the HTTP request
+        # end at the deadline, so an abandoned hedge frees its thread then
+        _attempt_deadline.set(deadline)
+        started = time.monotonic()
+        result = fn()
+        self.latencies.record(time.monotonic() - started)
+        return result
+
+    def _attempt(self, fn, deadline: float):
+        started = time.monotonic()
+        delay = self.hedge_delay()
+        pending = {_executor.submit(contextvars.copy_context().run, self._timed, fn, deadline)}
+        primary = next(iter(pending))
+        hedged = False
+        error = None
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                can_hedge = delay is not None and not hedged
+                timeout = min(remaining, started + delay - time.monotonic()) if can_hedge else remaining
+                done, pending = wait(pending, timeout=max(0, timeout), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is not primary:
+                            self._count("hedge_wins")
+                        return future.result()
+                    error = future.exception()
+                if done:
+                    continue
+                if can_hedge and time.monotonic() < deadline:
+                    hedged = True
+                    self._count("hedges")
+                    pending.add(
+                        _executor.submit(contextvars.copy_context().run, self._timed, fn, deadline)
+                    )
+                    continue
+                raise DeadlineExceeded("LLM call exceeded its deadline")
+            raise error
+        finally:
+            for future in pending:
+                future.cancel()
+
+    # ---------- Async ----------
+    async def acall(self, fn):
+        self._count("calls")
+        deadline = self._call_deadline()
+        attempt = 0
+        while True:
+            self._admit()
+            try:
+                result = await self._aattempt(fn, deadline)
+            except Exception as e:
+                await asyncio.sleep(self._failed(e, attempt, deadline))
+                attempt += 1
+                continue
+            self._outcome(ok=True)
+            return result
+
+    async def _atimed(self, fn):
+        started = time.monotonic()
+        result = await fn()
+        self.latencies.record(time.monotonic() - started)
+        return result
+
+    async def _aattempt(self, fn, deadline: float):
+        started = time.monotonic()
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(self._atimed(fn))
+        pending = {primary}
+        hedged = False
+        error = None
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                can_hedge = delay is not None and not hedged
+                timeout = min(remaining, started + delay - time.monotonic()) if can_hedge else remaining
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0, timeout), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._count("hedge_wins")
+                        return task.result()
+                    error = task.exception()
+                if done:
+                    continue
+                if can_hedge and time.monotonic() < deadline:
+                    hedged = True
+                    self._count("hedges")
+                    pending.add(asyncio.ensure_future(self._atimed(fn)))
+                    continue
+                raise DeadlineExceeded("LLM call exceeded its deadline")
+            raise error
+        finally:
+            # The losing request is cancelled, closing its connection
+            for task in pending:
+                task.cancel()
+
+    async def astream(self, start_stream):
+        """Yield from ``start_stream()`` under the breaker and deadline.
+
+        Streams aren't hedged or retried (tokens may already be on their
+        way to the client), but a stalled stream ends at the deadline.
+        """
+        self._count("calls")
+        deadline = self._call_deadline()
+        self._admit()
+        stream = start_stream().__aiter__()
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=max(0, remaining))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded("LLM stream exceeded its deadline") from None
+                yield chunk
+        except Exception as e:
+            self._count("failures")
+            if not is_retryable(e):
+                self.breaker.record_success()
+                raise
+            self._outcome(ok=False)
+            if isinstance(e, DeadlineExceeded):
+                self._count("deadline_exceeded")
+            raise
+        finally:
+            await stream.aclose()
+        self._outcome(ok=True)
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "breaker": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "hedge_delay": self.hedge_delay(),
+            "p95": self.latencies.percentile(0.95),
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+_policies: dict = {}
+_policies_lock = threading.Lock()
+
+
+def _flag(name: str, default: str = "true") -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+
+def get_policy(model: str) -> ResiliencePolicy:
+    """Per-model policy (latency and breaker state aren't shared across models).
+
+    The per-call deadline defaults to 80% of LLM_LATENCY_BUDGET_SECONDS, the
+    latency budget of the endpoints that wait on the LLM; endpoints making
+    several calls share that budget through request_deadline().
+    """
+    with _policies_lock:
+        if model not in _policies:
+            _policies[model] = ResiliencePolicy(
+                deadline=float(os.getenv("LLM_DEADLINE_SECONDS", _llm_budget())),
+                retries=int(os.getenv("LLM_RETRIES", 2)),
+                hedge=_flag("LLM_HEDGE"),
+                hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", 0.95)),
+                hedge_min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", 0.5)),
+                breaker=CircuitBreaker(
+                    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", 5)),
+                    reset_seconds=float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30)),
+                ),
+            )
+        return _policies[model]
+
+
+def get_resilience_stats() -> dict:
+    with _policies_lock:
+        policies = dict(_policies)
+    return {model: policy.get_stats() for model, policy in policies.items()}
+
+
+class ResilientChatMixin:
+    """Chat model mixin running every generation through the model's policy.
+
+    Sits below SingleFlightChatMixin, so a hedge is a real second request
+    rather than being coalesced into the first.
+    """
+
+    def _policy(self) -> ResiliencePolicy:
+        return get_policy(self.model_name)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super()._generate
+        return self._policy().call(
+            lambda: generate(
+                messages, stop=stop, run_manager=run_manager,
+                **{"timeout": attempt_timeout(), **kwargs},
+            )
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        agenerate = super()._agenerate
+        return await self._policy().acall(
+            lambda: agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        astream = super()._astream
+        async for chunk in self._policy().astream(
+            lambda: astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        ):
+            yield chunk
@@ -0,0 +1,152 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_answer(answer: str) -> str:
+    """Lowercase and collapse whitespace so trivial edits embed identically"""
+    return re.sub(r"\s+", " ", answer.strip().lower())
+
+
+class _QuestionIndex:
+    """Answer vectors and their stored evaluations for one question"""
+
+    def __init__(self, dim: int, capacity: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.evaluations = [None] * capacity
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+
+class SemanticEvaluationCache:
+    """Reuses evaluations of near-identical answers to the same question.
+
+    Answers are normalized, embedded, and compared by cosine similarity
+    against earlier answers to the same question. A match at or above
+    ``threshold`` returns the stored evaluation text and score instead of
+    calling the LLM. Each question keeps at most ``max_entries_per_question``
+    answers (least recently used evicted) and at most ``max_questions``
+    questions are indexed.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        threshold: float = 0.95,
+        max_entries_per_question: int = 256,
+        max_questions: int = 1024,
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries_per_question = max_entries_per_question
+        self.max_questions = max_questions
+
+        self._indexes: "OrderedDict[tuple, _QuestionIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    # ---------- Embedding ----------
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, answer: str) -> np.ndarray:
+        return self._unit(self.embeddings.embed_query(normalize_answer(answer)))
+
+    async def aembed(self, answer: str) -> np.ndarray:
+        return self._unit(await self.embeddings.aembed_query(normalize_answer(answer)))
+
+    # ---------- Lookup / Store ----------
+    def match(self, key: tuple, vector: np.ndarray, record: bool = True) -> Optional[dict]:
+        """Stored {"evaluation", "score"} for the closest answer, or None.
+
+        ``record=False`` leaves the hit/miss stats and LRU order untouched
+        (warmup lookups).
+        """
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or index.size == 0:
+                if record:
+                    self.stats["misses"] += 1
+                return None
+
+            if record:
+                self._indexes.move_to_end(key)
+            similarities = index.vectors[: index.size] @ vector
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.threshold:
+                if record:
+                    self.stats["misses"] += 1
+                return None
+
+            if record:
+                index.last_used[best] = time.monotonic()
+                self.stats["hits"] += 1
+            return dict(index.evaluations[best], similarity=float(similarities[best]))
+
+    def add(self, key: tuple, vector: np.ndarray, evaluation: str, score: int):
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                if len(self._indexes) >= self.max_questions:
+                    _, dropped = self._indexes.popitem(last=False)
+                    self.stats["evictions"] += dropped.size
+                index = _QuestionIndex(len(vector), self.max_entries_per_question)
+                self._indexes[key] = index
+            self._indexes.move_to_end(key)
+
+            if index.size < self.max_entries_per_question:
+                row = index.size
+                index.size += 1
+            else:
+                row = int(np.argmin(index.last_used))
+                self.stats["evictions"] += 1
+
+            index.vectors[row] = vector
+            index.evaluations[row] = {"evaluation": evaluation, "score": score}
+            index.last_used[row] = time.monotonic()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries = sum(index.size for index in self._indexes.values())
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "questions": len(self._indexes),
+                "entries": entries,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+def create_semantic_cache() -> Optional[SemanticEvaluationCache]:
+    """Semantic cache configured from SEMANTIC_CACHE_* env vars, None if disabled.
+
+    Shares the MiniLM model (and its micro-batcher) with
+    InterviewKnowledgeBase; if it can't be loaded the evaluation path
+    simply runs uncached.
+    """
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+
+    try:
+        from .knowledge_base import get_embeddings
+
+        embeddings = get_embeddings()
+    except Exception as e:
+        print(f"⚠️ Semantic evaluation cache disabled: {str(e)}")
+        return None
+
+    return SemanticEvaluationCache(
+        embeddings,
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95)),
+        max_entries_per_question=int(os.getenv("SEMANTIC_CACHE_MAX_PER_QUESTION", 256)),
+        max_questions=int(os.getenv("SEMANTIC_CACHE_MAX_QUESTIONS", 1024)),
+    )
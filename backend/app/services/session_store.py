@@ -0,0 +1,220 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from ..utils.forking import reset_after_fork
+from .interview_state import InterviewState, Message
+
+_STATE_FIELDS = (
+    "category",
+    "question_count",
+    "current_question",
+    "current_question_id",
+    "user_answer",
+    "evaluation",
+    "score",
+)
+
+
+# ==================== SERIALIZATION ====================
+
+
+def serialize_session(record: dict) -> bytes:
+    """Compact, zlib-compressed encoding of {"state": InterviewState, "db_id"}.
+
+    Messages become [role, content] pairs; they may be dicts or the
+    dataclass Message objects the graph nodes create.
+    """
+    state = record["state"]
+    messages = [
+        [m["role"], m["content"]] if isinstance(m, dict) else [m.role, m.content]
+        for m in state["messages"]
+    ]
+    payload = {
+        "db_id": record["db_id"],
+        "state": [state[field] for field in _STATE_FIELDS],
+        "messages": messages,
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize_session(data: bytes) -> dict:
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    state = InterviewState(
+        messages=[Message(role=role, content=content) for role, content in payload["messages"]],
+        **dict(zip(_STATE_FIELDS, payload["state"])),
+    )
+    return {"state": state, "db_id": payload["db_id"]}
+
+
+# ==================== STORES ====================
+
+
+class SessionStore(ABC):
+    """Where active interview sessions live between requests.
+
+    get() returns a fresh copy, so callers must put() after changing a
+    session for the change to be seen by other requests or workers.
+    Sessions expire after ttl_seconds without a get() or put().
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, record: dict) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store bounded by entry count (LRU) and idle time (TTL)"""
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 2 * 3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(session_id)
+            if entry is None:
+                return None
+            updated_at, data = entry
+            now = time.time()
+            if now - updated_at > self.ttl_seconds:
+                del self._data[session_id]
+                return None
+            # Reading keeps an active interview alive (idle-time TTL)
+            self._data[session_id] = (now, data)
+            self._data.move_to_end(session_id)
+        return deserialize_session(data)
+
+    def put(self, session_id: str, record: dict) -> None:
+        data = serialize_session(record)
+        with self._lock:
+            self._data[session_id] = (time.time(), data)
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store shared by every worker process on the host through one SQLite file"""
+
+    TOUCH_INTERVAL = 60.0
+
+    def __init__(self, path: str = "backend/data/sessions.db", ttl_seconds: float = 2 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._puts = 0
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._connect()
+        reset_after_fork(self._connect)
+
+    def _connect(self):
+        # Also runs in forked workers: SQLite connections must not cross fork()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS active_sessions (
+                session_id TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, updated_at FROM active_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.ttl_seconds:
+            return None
+        if now - row[1] > self.TOUCH_INTERVAL:
+            # Reading keeps an active interview alive; at most one write a minute
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE active_sessions SET updated_at = ? WHERE session_id = ?",
+                    (now, session_id),
+                )
+                self._conn.commit()
+        return deserialize_session(row[0])
+
+    def put(self, session_id: str, record: dict) -> None:
+        data = serialize_session(record)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO active_sessions (session_id, payload, updated_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, data, now),
+            )
+            # Abandoned interviews are swept every so often
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._conn.execute(
+                    "DELETE FROM active_sessions WHERE updated_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+            self._conn.commit()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM active_sessions WHERE session_id = ?", (session_id,)
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM active_sessions").fetchone()
+        return count
+
+
+def create_session_store() -> SessionStore:
+    """Session store chosen by SESSION_STORE ("memory" or "sqlite")"""
+    backend = os.getenv("SESSION_STORE", "memory").lower()
+    ttl = float(os.getenv("SESSION_TTL_SECONDS", 2 * 3600))
+
+    if backend == "sqlite":
+        return SQLiteSessionStore(
+            path=os.getenv("SESSION_STORE_PATH", "backend/data/sessions.db"),
+            ttl_seconds=ttl,
+        )
+    if backend == "memory":
+        return InMemorySessionStore(
+            max_sessions=int(os.getenv("SESSION_MAX_ENTRIES", 10000)),
+            ttl_seconds=ttl,
+        )
+    raise ValueError(f"Unknown SESSION_STORE: {backend}")
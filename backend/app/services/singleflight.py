@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+from langchain_core.load import dumps
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait and get the same result or exception.
+    Nothing is remembered once the call finishes: this only deduplicates
+    work that is in flight, caching is left to the caches in front.
+
+    ``do`` serves threads, ``ado`` coroutines. Async calls run as a task
+    that every waiter shields, so one caller giving up (client disconnect)
+    doesn't cancel the request the others are waiting on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self._tasks: dict = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Tasks belong to one event loop
+        key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.stats["calls"] += 1
+            task = self._tasks.get(key)
+            if task is None:
+                task = self._tasks[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._forget(key))
+            else:
+                self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key):
+        with self._lock:
+            self._tasks.pop(key, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls) + len(self._tasks)
+        stats["coalesce_rate"] = (
+            round(stats["coalesced"] / stats["calls"], 3) if stats["calls"] else 0.0
+        )
+        return stats
+
+
+# Shared by every chat model in the process
+llm_flights = SingleFlight()
+
+
+class SingleFlightChatMixin:
+    """Chat model mixin: identical concurrent generations share one request.
+
+    The fingerprint is LangChain's llm_string (model and call parameters)
+    plus the serialized messages, the same inputs the response cache keys
+    on, so coalescing sits right behind the cache. Streaming isn't
+    coalesced. Each caller gets its own copy of the result; waiters' copies
+    carry ``response_metadata["coalesced"]`` so token accounting counts the
+    upstream usage once, for the leader.
+    """
+
+    def _flight_key(self, messages, stop, kwargs) -> str:
+        fingerprint = self._get_llm_string(stop=stop, **kwargs) + dumps(messages)
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+    @staticmethod
+    def _own_copy(result, leader: bool):
+        result = result.model_copy(deep=True)
+        if not leader:
+            for generation in result.generations:
+                generation.message.response_metadata["coalesced"] = True
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super()._generate
+        ran = []
+
+        def lead():
+            ran.append(True)
+            return generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        result = llm_flights.do(self._flight_key(messages, stop, kwargs), lead)
+        return self._own_copy(result, leader=bool(ran))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        agenerate = super()._agenerate
+        ran = []
+
+        def lead():
+            ran.append(True)
+            return agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        result = await llm_flights.ado(self._flight_key(messages, stop, kwargs), lead)
+        return self._own_copy(result, leader=bool(ran))
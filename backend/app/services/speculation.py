@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .interview_graph import InterviewGraph, InterviewState
+
+
+class SpeculativeFollowup:
+    """Next-question preparation started while the evaluation is running"""
+
+    def __init__(self, scheduler: "FollowupScheduler", task: asyncio.Task):
+        self.scheduler = scheduler
+        self.task = task
+
+    async def resolve(self, state: InterviewState):
+        """Follow-up state update for the evaluated state.
+
+        Bank questions never depend on the score, so they are always kept.
+        An LLM follow-up is kept only if the real score takes the same
+        branch as the provisional one; otherwise it is discarded and
+        regenerated with the real score. If the speculation itself failed
+        the follow-up is prepared as if there had been none.
+        """
+        graph = self.scheduler.graph
+        try:
+            new_question, new_id, branch = await self.task
+        except Exception as e:
+            print(f"⚠️ Speculative follow-up failed ({e}), preparing it now")
+            self.scheduler.stats["failed"] += 1
+            return await graph.afollowup_node(state)
+
+        if branch != "bank" and branch != graph.followup_branch(state["score"]):
+            # Bank miss without a provisional score (branch None) lands here too
+            self.scheduler.stats["discarded"] += 1
+            new_question, new_id = await graph.agenerate_followup(state)
+        else:
+            self.scheduler.stats["used"] += 1
+
+        return graph.followup_update(state, new_question, new_id)
+
+    def cancel(self):
+        if not self.task.done():
+            self.task.cancel()
+            self.scheduler.stats["cancelled"] += 1
+
+
+class FollowupScheduler:
+    """Runs followup preparation concurrently with evaluate_node"""
+
+    def __init__(self, graph: InterviewGraph):
+        self.graph = graph
+        self.stats = {"started": 0, "used": 0, "discarded": 0, "cancelled": 0, "failed": 0}
+
+    def speculate(
+        self, state: InterviewState, provisional_score: Optional[int] = None
+    ) -> Optional[SpeculativeFollowup]:
+        """Start preparing the next question, or None if there won't be one.
+
+        provisional_score defaults to the previous answer's score; the
+        first answer has none, so only a bank lookup is speculated then.
+        """
+        if not self.graph.will_continue(state):
+            return None
+
+        if provisional_score is None and state["question_count"] > 1:
+            provisional_score = state["score"]
+
+        # Snapshot: the evaluation updates state while this runs
+        snapshot = {**state, "messages": list(state["messages"])}
+
+        if provisional_score is None:
+            task = asyncio.create_task(
+                self.graph.anext_question(snapshot, allow_llm=False)
+            )
+        else:
+            snapshot["score"] = provisional_score
+            task = asyncio.create_task(self.graph.anext_question(snapshot))
+
+        self.stats["started"] += 1
+        return SpeculativeFollowup(self, task)
@@ -0,0 +1,253 @@
+import math
+import os
+import re
+import threading
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .lru_cache import LRUCache
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+_STOPWORDS = {
+    "the", "and", "for", "you", "your", "with", "what", "how", "why", "when",
+    "does", "are", "can", "this", "that", "from", "into", "use", "using",
+    "explain", "describe", "would", "about", "between", "tell", "time",
+}
+
+
+def _load_encoder():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+_encoder = _load_encoder()
+
+
+def count_tokens(text: str) -> int:
+    """Token count of ``text``.
+
+    Uses tiktoken's cl100k_base when installed (close to the LLaMA 3
+    tokenizer for English); otherwise estimates one token per word or
+    punctuation mark plus one per further 6 characters of long words.
+    """
+    if not text:
+        return 0
+    if _encoder is not None:
+        return len(_encoder.encode(text))
+    return sum(1 + (len(piece) - 1) // 6 for piece in _WORD.findall(text))
+
+
+def _terms(text: str) -> set:
+    return {
+        word for word in re.findall(r"[a-z0-9]+", text.lower())
+        if len(word) > 2 and word not in _STOPWORDS
+    }
+
+
+class ContextCompactor:
+    """Fits expert context into a token budget, keeping the relevant parts.
+
+    Context is split into units (bullets and sentences, each under its
+    section header such as "Key Points:"). Units are ranked by term overlap
+    with the question, taken greedily while they fit ``budget_tokens``, and
+    put back in their original order and sections. Context already within
+    budget, or any context when ``budget_tokens`` is 0 (the default), is
+    returned unchanged. Results are cached per question_id.
+    """
+
+    def __init__(self, budget_tokens: int = 0, cache_size: int = 1024):
+        self.budget_tokens = budget_tokens
+        self.cache = LRUCache(cache_size)
+        self.stats = {"compacted": 0, "tokens_in": 0, "tokens_out": 0}
+        self._lock = threading.Lock()
+
+    # ---------- Splitting ----------
+    @staticmethod
+    def _blocks(context: str):
+        """[(header or None, [units], joiner)] per blank-line separated block"""
+        blocks = []
+        for block in re.split(r"\n\s*\n", context.strip()):
+            lines = [line.strip() for line in block.splitlines() if line.strip()]
+            header = None
+            if lines and lines[0].endswith(":") and len(lines) > 1:
+                header, lines = lines[0], lines[1:]
+            if all(line.startswith("- ") for line in lines):
+                blocks.append((header, lines, "\n"))
+            else:
+                sentences = re.split(r"(?<=[.!?])\s+", " ".join(lines))
+                blocks.append((header, [s for s in sentences if s], " "))
+        return blocks
+
+    # ---------- Compaction ----------
+    def compact(self, question_id: Optional[str], question: str, context: str) -> str:
+        if not context or self.budget_tokens <= 0:
+            return context
+        key = (question_id, hash(context), self.budget_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        compacted = self._compact(question, context)
+        self.cache.put(key, compacted)
+        return compacted
+
+    def _compact(self, question: str, context: str) -> str:
+        tokens_in = count_tokens(context)
+        if tokens_in <= self.budget_tokens:
+            return context
+
+        blocks = self._blocks(context)
+        query = _terms(question)
+        ranked = []
+        for b, (_, units, _) in enumerate(blocks):
+            for u, unit in enumerate(units):
+                terms = _terms(unit)
+                overlap = len(query & terms) / math.sqrt(len(terms)) if terms else 0.0
+                ranked.append((-overlap, b, u))
+        ranked.sort()
+
+        chosen = set()
+        headers_used = set()
+        remaining = self.budget_tokens
+        for _, b, u in ranked:
+            header = blocks[b][0]
+            cost = count_tokens(blocks[b][1][u])
+            if header and b not in headers_used:
+                cost += count_tokens(header)
+            if cost <= remaining:
+                chosen.add((b, u))
+                headers_used.add(b)
+                remaining -= cost
+
+        if chosen:
+            parts = []
+            for b, (header, units, joiner) in enumerate(blocks):
+                kept = [unit for u, unit in enumerate(units) if (b, u) in chosen]
+                if kept:
+                    parts.append("\n".join(filter(None, [header, joiner.join(kept)])))
+            compacted = "\n\n".join(parts)
+        else:
+            # Even the most relevant unit is too long: keep its start
+            _, b, u = ranked[0]
+            kept, used = [], 1  # the ellipsis
+            for word in blocks[b][1][u].split():
+                used += count_tokens(word)
+                if used > self.budget_tokens:
+                    break
+                kept.append(word)
+            compacted = " ".join(kept) + " …"
+
+        with self._lock:
+            self.stats["compacted"] += 1
+            self.stats["tokens_in"] += tokens_in
+            self.stats["tokens_out"] += count_tokens(compacted)
+        return compacted
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        return {**stats, "budget_tokens": self.budget_tokens, "cache": self.cache.get_stats()}
+
+
+class TokenUsage:
+    """Token accounting: estimated prompt sections and real usage per model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompts: dict = {}  # task -> {"prompts", section -> total tokens}
+        self.models: dict = {}  # model -> {"calls", "prompt_tokens", ...}
+
+    def measure(self, task: str, sections: dict) -> dict:
+        """Count and record the tokens in each section of one prompt"""
+        counts = {name: count_tokens(text) for name, text in sections.items()}
+        with self._lock:
+            totals = self.prompts.setdefault(task, {"prompts": 0})
+            totals["prompts"] += 1
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        return counts
+
+    def record_call(self, model: str, prompt_tokens: int, completion_tokens: int,
+                    hit: Optional[str] = None):
+        """Record one model call.
+
+        ``hit`` is "cached" (response cache) or "coalesced" (shared another
+        caller's in-flight request): counted apart from upstream calls,
+        whose tokens were already recorded.
+        """
+        with self._lock:
+            totals = self.models.setdefault(model, {
+                "calls": 0, "cached": 0, "coalesced": 0,
+                "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            if hit:
+                totals[hit] += 1
+                return
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            prompts = {
+                task: {
+                    "prompts": totals["prompts"],
+                    "avg_section_tokens": {
+                        name: round(count / totals["prompts"], 1)
+                        for name, count in totals.items() if name != "prompts"
+                    },
+                }
+                for task, totals in self.prompts.items()
+            }
+            models = {model: dict(totals) for model, totals in self.models.items()}
+        return {"prompts": prompts, "models": models}
+
+
+token_usage = TokenUsage()
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """Records prompt/completion tokens of every chat model call.
+
+    Response cache hits replay the stored message, usage included; LangChain
+    marks them with a zero ``total_cost``, which upstream responses don't set.
+    Single-flight waiters get the leader's message marked "coalesced".
+    """
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                model = (message.response_metadata.get("model_name") if message else None) \
+                    or (response.llm_output or {}).get("model_name", "unknown")
+                if "total_cost" in usage:
+                    hit = "cached"
+                elif message is not None and message.response_metadata.get("coalesced"):
+                    hit = "coalesced"
+                else:
+                    hit = None
+                token_usage.record_call(
+                    model, usage.get("input_tokens", 0), usage.get("output_tokens", 0), hit=hit
+                )
+
+
+_compactor: Optional[ContextCompactor] = None
+_compactor_lock = threading.Lock()
+
+
+def get_context_compactor() -> ContextCompactor:
+    """Process-wide compactor (off unless EXPERT_CONTEXT_TOKEN_BUDGET is set)"""
+    global _compactor
+
+    with _compactor_lock:
+        if _compactor is None:
+            _compactor = ContextCompactor(
+                budget_tokens=int(os.getenv("EXPERT_CONTEXT_TOKEN_BUDGET", 0)),
+                cache_size=int(os.getenv("EXPERT_CONTEXT_CACHE_SIZE", 1024)),
+            )
+        return _compactor
@@ -0,0 +1,217 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+class NumpyVectorIndex:
+    """Exact vector search over a memory-mapped ``.npy`` matrix.
+
+    Rows hold unit-normalized embeddings, grouped by category so a
+    category filter is a contiguous slice. Cosine similarity is a single
+    matrix-vector product and top-k uses ``argpartition``. Because the
+    matrix is opened with ``mmap_mode="r"``, worker processes share its
+    pages through the OS page cache.
+
+    dtype="float16" or "int8" stores the scanned matrix quantized (int8
+    with one float32 scale per vector), a half or a quarter of float32.
+    The first pass scores ``rerank_factor * k`` candidates on the quantized
+    matrix; those are re-scored against a full-precision copy that stays
+    on disk and is only paged in for the candidate rows.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    FULL_VECTORS_FILE = "vectors_full.npy"
+    SCALES_FILE = "scales.npy"
+    DOCS_FILE = "documents.json"
+    SCAN_CHUNK = 1024  # float16 rows upcast at a time when scanning
+
+    def __init__(
+        self,
+        index_dir: str = "backend/data/vector_index",
+        dtype: str = "float32",
+        rerank_factor: int = 4,
+    ):
+        self.index_dir = Path(index_dir)
+        self.dtype = np.dtype(dtype)
+        if self.dtype.name not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unsupported vector index dtype: {dtype}")
+        self.rerank_factor = rerank_factor
+        self.vectors = None
+        self.full_vectors = None
+        self.scales = None
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self.difficulties = None
+        self.category_ranges: Dict[str, List[int]] = {}
+
+    def exists(self) -> bool:
+        return (self.index_dir / self.VECTORS_FILE).exists() and (
+            self.index_dir / self.DOCS_FILE
+        ).exists()
+
+    # ---------- Build / Load ----------
+    def build(self, ids, texts, metadatas, vectors):
+        """Write a new index (replacing any existing one) and open it."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        # Group rows by category so each category is one contiguous range
+        order = sorted(range(len(ids)), key=lambda i: metadatas[i].get("category", ""))
+        category_ranges = {}
+        for row, i in enumerate(order):
+            category = metadatas[i].get("category", "")
+            category_ranges.setdefault(category, [row, row])
+            category_ranges[category][1] = row + 1
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        vectors = vectors[order]
+        arrays = {self.VECTORS_FILE: vectors}
+        if self.dtype.name == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1
+            arrays[self.VECTORS_FILE] = np.round(vectors / scales[:, None]).astype(np.int8)
+            arrays[self.SCALES_FILE] = scales.astype(np.float32)
+        elif self.dtype.name == "float16":
+            arrays[self.VECTORS_FILE] = vectors.astype(np.float16)
+        if self.dtype.name != "float32":
+            arrays[self.FULL_VECTORS_FILE] = vectors
+
+        # Write beside the live files and swap, so readers holding the old
+        # mapping keep a consistent view
+        for name, array in arrays.items():
+            with open(self.index_dir / f"{name}.tmp", "wb") as f:
+                np.save(f, array)
+        docs_tmp = self.index_dir / f"{self.DOCS_FILE}.tmp"
+        with open(docs_tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dtype": self.dtype.name,
+                    "ids": [ids[i] for i in order],
+                    "texts": [texts[i] for i in order],
+                    "metadatas": [metadatas[i] for i in order],
+                    "category_ranges": category_ranges,
+                },
+                f,
+            )
+        for name in arrays:
+            os.replace(self.index_dir / f"{name}.tmp", self.index_dir / name)
+        os.replace(docs_tmp, self.index_dir / self.DOCS_FILE)
+        if self.dtype.name == "float32":
+            # Not needed any more if this index was quantized before
+            for name in (self.FULL_VECTORS_FILE, self.SCALES_FILE):
+                if (self.index_dir / name).exists():
+                    os.remove(self.index_dir / name)
+
+        self.load()
+
+    def load(self):
+        with open(self.index_dir / self.DOCS_FILE, "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        self.ids = docs["ids"]
+        self.texts = docs["texts"]
+        self.metadatas = docs["metadatas"]
+        self.category_ranges = docs["category_ranges"]
+        self.difficulties = np.array([m.get("difficulty") for m in self.metadatas], dtype=object)
+        self.vectors = np.load(self.index_dir / self.VECTORS_FILE, mmap_mode="r")
+        self.dtype = self.vectors.dtype
+
+        self.scales = self.full_vectors = None
+        if self.dtype.name == "int8":
+            self.scales = np.load(self.index_dir / self.SCALES_FILE)
+        if self.dtype.name != "float32":
+            self.full_vectors = np.load(self.index_dir / self.FULL_VECTORS_FILE, mmap_mode="r")
+        return self
+
+    def memory_bytes(self) -> dict:
+        """Bytes scanned per query vs held only for re-ranking."""
+        scanned = self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+        rerank = self.full_vectors.nbytes if self.full_vectors is not None else 0
+        return {"scanned": scanned, "rerank": rerank}
+
+    def stored_hashes(self) -> Dict[str, Optional[str]]:
+        return {
+            doc_id: meta.get("content_hash")
+            for doc_id, meta in zip(self.ids, self.metadatas)
+        }
+
+    def get_vectors(self, ids) -> np.ndarray:
+        """Stored float32 vectors for the given ids (re-used on rebuild)."""
+        row_of = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        source = self.vectors if self.full_vectors is None else self.full_vectors
+        return np.asarray(source[[row_of[i] for i in ids]], dtype=np.float32)
+
+    # ---------- Search ----------
+    def _rows(self, category: Optional[str]):
+        if category is None:
+            return 0, len(self.ids)
+        return tuple(self.category_ranges.get(category, (0, 0)))
+
+    def search(
+        self,
+        query_vector,
+        category: Optional[str] = None,
+        k: int = 3,
+        difficulty: Optional[str] = None,
+    ) -> List[Document]:
+        """Top-k documents by cosine similarity, optionally within a category/difficulty."""
+        start, end = self._rows(category)
+        if end <= start:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = self._scan(start, end, query)
+
+        if difficulty is not None:
+            mask = self.difficulties[start:end] == difficulty
+            scores[~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+            if k == 0:
+                return []
+
+        k = min(k, len(scores))
+        if self.full_vectors is None:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            # Re-rank the quantized candidates at full precision; sorted rows
+            # keep the reads from the memory-mapped copy sequential
+            n_candidates = min(len(scores), k * self.rerank_factor)
+            candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+            candidates = np.sort(candidates[np.isfinite(scores[candidates])])
+            exact = np.asarray(self.full_vectors[start + candidates]) @ query
+            top = candidates[np.argsort(-exact)[:k]]
+
+        return [
+            Document(
+                page_content=self.texts[start + i],
+                metadata=self.metadatas[start + i],
+            )
+            for i in top
+        ]
+
+    def _scan(self, start: int, end: int, query: np.ndarray) -> np.ndarray:
+        """Approximate (quantized) or exact (float32) scores for rows start..end."""
+        block = self.vectors[start:end]
+        if self.dtype.name == "float32":
+            return block @ query
+        if self.dtype.name == "int8":
+            # einsum reads int8 directly (a quarter of the memory traffic)
+            return np.einsum("ij,j->i", block, query) * self.scales[start:end]
+
+        # float16 has no BLAS or einsum fast path: upcast small chunks
+        # into one reusable buffer that stays in cache
+        scores = np.empty(end - start, dtype=np.float32)
+        buffer = np.empty((min(self.SCAN_CHUNK, end - start), block.shape[1]), dtype=np.float32)
+        for chunk in range(0, end - start, self.SCAN_CHUNK):
+            rows = buffer[: min(self.SCAN_CHUNK, end - start - chunk)]
+            rows[...] = block[chunk : chunk + len(rows)]
+            scores[chunk : chunk + len(rows)] = rows @ query
+        return scores
@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Callable
+
+
+class Warmup:
+    """Warms every component an interview needs and tracks its state.
+
+    Components (in order):
+        graph         - InterviewGraph built (LLM client, compiled LangGraph)
+        embeddings    - one embedding through the shared model
+        vector_search - one lookup in the semantic cache index and, when the
+                        graph uses a vector knowledge base, one search
+        llm           - the LLM API is reachable and the connection pool has
+                        a live TLS connection (lists models, no tokens used)
+
+    Each component is "pending", "warming", "ready", "failed", "disabled"
+    (not used in this configuration) or "skipped" (an earlier step failed).
+    The instance is ready once every required component is ready or
+    disabled. The LLM check is reported but not required: an upstream
+    outage shouldn't take every instance out of the load balancer.
+    """
+
+    COMPONENTS = ("graph", "embeddings", "vector_search", "llm")
+    REQUIRED = ("graph", "embeddings", "vector_search")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.components = {name: {"status": "pending"} for name in self.COMPONENTS}
+        self.enabled = True
+
+    # ---------- Running ----------
+    def run(self, get_graph: Callable, check_llm: bool = True):
+        """Warm everything in order (blocking; call from a thread)."""
+        graph = self._step("graph", get_graph)
+        if graph is None:
+            for name in self.COMPONENTS[1:]:
+                self._set(name, status="skipped")
+            return self
+
+        vector = self._step("embeddings", lambda: self._embed(graph))
+        self._step("vector_search", lambda: self._search(graph, vector))
+        if check_llm:
+            self._step("llm", lambda: self._check_llm(graph.llm))
+        return self
+
+    def disable(self):
+        """Warmup turned off: report ready without warming anything."""
+        self.enabled = False
+
+    def _step(self, name: str, fn: Callable):
+        self._set(name, status="warming")
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            print(f"⚠️ Warmup of {name} failed: {str(e)}")
+            self._set(name, status="failed", error=str(e),
+                      duration_ms=round((time.perf_counter() - started) * 1000, 1))
+            return None
+        self._set(name, status="disabled" if result is False else "ready",
+                  duration_ms=round((time.perf_counter() - started) * 1000, 1))
+        return result
+
+    def _set(self, name: str, **state):
+        with self._lock:
+            self.components[name] = state
+
+    # ---------- Steps ----------
+    @staticmethod
+    def _embed(graph):
+        if not graph.semantic_cache:
+            return False
+        return graph.semantic_cache.embed("warmup")
+
+    @staticmethod
+    def _search(graph, vector):
+        searched = False
+        if graph.semantic_cache and vector is not None:
+            # Not a real lookup: keep it out of the hit rate
+            graph.semantic_cache.match(("warmup", "warmup"), vector, record=False)
+            searched = True
+        if hasattr(graph.kb, "embed_query"):
+            # Vector knowledge base (the built-in bank is a plain lookup)
+            graph.kb.search("warmup", k=1)
+            searched = True
+        return searched
+
+    @staticmethod
+    def _check_llm(llm):
+        client = getattr(getattr(llm, "client", None), "_client", None)
+        if client is None or not hasattr(client, "models"):
+            return False
+        client.models.list()
+        return True
+
+    # ---------- Reporting ----------
+    def ready(self) -> bool:
+        if not self.enabled:
+            return True
+        with self._lock:
+            return all(
+                self.components[name]["status"] in ("ready", "disabled")
+                for name in self.REQUIRED
+            )
+
+    def report(self) -> dict:
+        with self._lock:
+            components = {name: dict(state) for name, state in self.components.items()}
+        return {"ready": self.ready(), "warmup": self.enabled, "components": components}
+
+
+def run_in_background(warmup: Warmup, get_graph: Callable, check_llm: bool = True) -> threading.Thread:
+    thread = threading.Thread(
+        target=warmup.run, args=(get_graph,), kwargs={"check_llm": check_llm},
+        name="warmup", daemon=True,
+    )
+    thread.start()
+    return thread
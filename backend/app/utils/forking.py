@@ -0,0 +1,20 @@
+import os
+import weakref
+
+
+def reset_after_fork(method):
+    """Call a bound ``method`` in every child process forked from now on.
+
+    Used to reopen SQLite connections, restart background threads and drop
+    executor handles that can't be used across ``fork()`` (the preload-and-
+    fork server). Holds only a weak reference to the object.
+    """
+    ref = weakref.WeakMethod(method)
+
+    def hook():
+        bound = ref()
+        if bound is not None:
+            bound()
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=hook)
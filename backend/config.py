@@ -16,6 +16,7 @@ class Settings(BaseSettings):
 
     # LLM Settings
     llm_model: str = "llama-3.3-70b-versatile"
+    llm_fast_model: str = "llama-3.1-8b-instant"
     llm_temperature: float = 0.7
     embedding_model: str = "text-embedding-3-small"
 
@@ -26,6 +27,12 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = 10
 
+    # Production server (python run.py serve)
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 0  # 0 = one per CPU
+    backlog: int = 2048
+
     class Config:
         env_file = ".env"
         case_sensitive = False
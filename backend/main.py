@@ -1,15 +1,43 @@
-from fastapi import FastAPI, Depends  # ✅ Added Depends
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Request  # ✅ Added Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session  # ✅ Added Session
 from sqlalchemy import text
 
 from backend.app.routers import interview, analytics
 from backend.app.models.database import get_db
+from backend.app.services.json_stream import StructuredOutputError
+from backend.app.services.resilience import LLMUnavailable
+from backend.app.services.warmup import Warmup, run_in_background
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the graph, embedding model, vector search and LLM connection.
+
+    STARTUP_WARMUP: "background" (default) serves immediately and warms in
+    a thread (/health/ready reports 503 until done), "blocking" finishes
+    warming before serving, "off" leaves everything to the first request.
+    """
+    mode = os.getenv("STARTUP_WARMUP", "background")
+    app.state.warmup = Warmup()
+    if mode == "blocking":
+        await run_in_threadpool(app.state.warmup.run, interview.get_graph)
+    elif mode == "background":
+        run_in_background(app.state.warmup, interview.get_graph)
+    else:
+        app.state.warmup.disable()
+    yield
+
 
 app = FastAPI(
     title="AI Interview Platform",
     description="AI-powered technical interview with Groq API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -26,11 +54,50 @@ app.include_router(interview.router)
 app.include_router(analytics.router)  # Add this
 
 
+@app.exception_handler(LLMUnavailable)
+async def llm_unavailable(request: Request, exc: LLMUnavailable):
+    """LLM deadline exceeded or breaker open: tell the client to retry"""
+    return JSONResponse(
+        {"detail": f"Evaluation service unavailable: {str(exc)}"},
+        status_code=503,
+        headers={"Retry-After": "5"},
+    )
+
+
+@app.exception_handler(StructuredOutputError)
+async def structured_output_error(request: Request, exc: StructuredOutputError):
+    """The LLM's evaluation stayed invalid after the repair retries"""
+    return JSONResponse(
+        {"detail": f"Evaluation output could not be parsed: {str(exc)}"},
+        status_code=502,
+    )
+
+
 @app.get("/")
 async def root():
     return {"message": "AI Interview Platform API", "docs": "/docs"}
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness(request: Request, db: Session = Depends(get_db)):
+    """Readiness probe: 200 only once every component is warm"""
+    report = request.app.state.warmup.report()
+    try:
+        await run_in_threadpool(db.execute, text("SELECT 1"))
+        report["database"] = "healthy"
+    except Exception as e:
+        report["database"] = f"unhealthy: {str(e)}"
+        report["ready"] = False
+
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
 @app.get("/health")
 async def health(db: Session = Depends(get_db)):
     """Health check including database"""
@@ -0,0 +1,158 @@
+"""
+Preload-and-fork production server.
+
+    python run.py serve
+
+The master process imports the app once: the embedding model, question
+bank and compiled InterviewGraph are built before any worker exists. It
+then binds the listening socket and forks ``settings.workers`` uvicorn
+workers that accept on it. Workers share the preloaded pages copy-on-write
+(``gc.freeze()`` keeps the collector from dirtying them), so each extra
+worker costs little memory and none of them has a cold start. Crashed
+workers are replaced; SIGINT/SIGTERM shut everything down.
+"""
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+
+def _event_loop():
+    try:
+        import uvloop  # noqa: F401
+        return "uvloop"
+    except ImportError:
+        return "asyncio"
+
+
+def _http_protocol():
+    try:
+        import httptools  # noqa: F401
+        return "httptools"
+    except ImportError:
+        return "h11"
+
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _preload():
+    """Import the app and build everything workers would otherwise build."""
+    started = time.perf_counter()
+    from backend.main import app
+    from backend.app.routers import interview
+    from backend.app.services.knowledge_base import close_embedding_workers
+    from backend.app.services.warmup import Warmup
+
+    # Connections opened here would be shared by every worker: the LLM check
+    # runs in each worker's own startup warmup instead
+    Warmup().run(interview.get_graph, check_llm=False)
+    # Embedding worker processes aren't shared across fork() either
+    close_embedding_workers()
+    print(f"📦 Preloaded app in {time.perf_counter() - started:.1f}s")
+    return app
+
+
+def _run_worker(app, sock, loop, http):
+    import uvicorn
+
+    # The master's handlers would otherwise run in the worker
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    config = uvicorn.Config(app, loop=loop, http=http, lifespan="on", access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app, sock, loop, http) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(app, sock, loop, http)
+        except BaseException as e:
+            print(f"❌ Worker {os.getpid()} crashed: {str(e)}")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(settings):
+    workers = settings.workers or os.cpu_count() or 1
+    if workers > 1 and "SESSION_STORE" not in os.environ:
+        # In-memory sessions would be private to one worker
+        os.environ["SESSION_STORE"] = "sqlite"
+        print("ℹ️ SESSION_STORE=sqlite so interviews survive switching workers")
+
+    app = _preload()
+    sock = _bind(settings.host, settings.port, settings.backlog)
+    loop, http = _event_loop(), _http_protocol()
+
+    # Objects that exist now are shared by every worker; keep the cyclic GC
+    # from touching (and so copying) their pages
+    gc.collect()
+    gc.freeze()
+
+    children = {_spawn(app, sock, loop, http) for _ in range(workers)}
+    print(
+        f"🚀 Serving on http://{settings.host}:{settings.port} "
+        f"with {workers} workers ({loop}/{http})"
+    )
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited ({status}), starting a replacement")
+            children.add(_spawn(app, sock, loop, http))
+
+    sock.close()
+    print("👋 Server stopped")
+
+
+def main(argv=None):
+    import argparse
+
+    from backend.config import Settings
+
+    settings = Settings()
+    parser = argparse.ArgumentParser(description="Preload-and-fork production server")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers,
+                        help="worker processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+
+    settings.host, settings.port, settings.workers = args.host, args.port, args.workers
+    serve(settings)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -5,6 +7,15 @@ from app.models.database import Base
 from app.services.db_service import DatabaseService
 
 
+@pytest.fixture(autouse=True)
+def llm_test_env(monkeypatch):
+    """Chat models get a placeholder key and no response/semantic caches"""
+    if not os.getenv("GROQ_API_KEY"):
+        monkeypatch.setenv("GROQ_API_KEY", "test-not-used")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "false")
+
+
 @pytest.fixture
 def test_db():
     """Create test database"""
@@ -31,3 +42,19 @@ def sample_session(db_service):
     return db_service.create_session(
         session_id="test_123", category="coding", difficulty="medium"
     )
+
+
+@pytest.fixture
+def fake_kb_embeddings(monkeypatch):
+    """Knowledge base embeds with a deterministic fake instead of the local model.
+
+    Call the fixture with an embeddings class to use a subclass instead.
+    """
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from app.services import knowledge_base
+
+    def use(embeddings_class=DeterministicFakeEmbedding):
+        monkeypatch.setattr(knowledge_base, "get_embeddings", lambda: embeddings_class(size=384))
+
+    use()
+    return use
@@ -50,7 +50,7 @@ def test_full_pipeline():
 
         start = time.time()
         try:
-            evaluation = agent.evaluate_answer(q['question'], answer, "coding")
+            evaluation = agent.evaluate_answer(q['question'], answer, "coding", question_id=q['id'])
             eval_time = time.time() - start
 
             # Extract score
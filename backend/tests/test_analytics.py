@@ -0,0 +1,30 @@
+import asyncio
+from types import SimpleNamespace
+
+from backend.app.routers import analytics, interview
+from backend.app.services.lru_cache import LRUCache
+
+
+def test_cache_stats_report_each_cache(monkeypatch):
+    results = LRUCache(4)
+    results.get("missing")
+    graph = SimpleNamespace(
+        semantic_cache=SimpleNamespace(get_stats=lambda: {"hits": 2, "misses": 1}),
+        kb=SimpleNamespace(cache_stats=lambda: {"results": results.get_stats()}),
+    )
+    monkeypatch.setattr(interview, "_graph", graph)
+
+    stats = asyncio.run(analytics.get_cache_stats())
+
+    assert stats["llm_responses"] is None  # LLM_CACHE_ENABLED=false in tests
+    assert stats["semantic_evaluations"] == {"hits": 2, "misses": 1}
+    assert stats["knowledge_base"]["results"]["misses"] == 1
+
+
+def test_cache_stats_do_not_build_the_graph(monkeypatch):
+    monkeypatch.setattr(interview, "_graph", None)
+
+    stats = asyncio.run(analytics.get_cache_stats())
+
+    assert stats["semantic_evaluations"] is None and stats["knowledge_base"] is None
+    assert interview._graph is None
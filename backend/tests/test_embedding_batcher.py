@@ -0,0 +1,68 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.app.services.embedding_batcher import EmbeddingBatcher
+
+
+def test_concurrent_queries_share_batches():
+    model = DeterministicFakeEmbedding(size=16)
+    batcher = EmbeddingBatcher(model, max_wait_ms=20, max_batch_size=64)
+    texts = [f"query {i % 10}" for i in range(40)]
+
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        vectors = list(pool.map(batcher.embed_query, texts))
+
+    assert vectors == [model.embed_query(t) for t in texts]
+    stats = batcher.get_stats()
+    assert stats["texts"] == 40
+    assert stats["batches"] < 40
+    assert stats["encoded"] < stats["texts"]  # duplicates encoded once per batch
+
+
+def test_async_callers_await_the_same_batch():
+    model = DeterministicFakeEmbedding(size=16)
+    batcher = EmbeddingBatcher(model, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.aembed_query(f"answer {i}") for i in range(8)))
+
+    vectors = asyncio.run(run())
+
+    assert vectors[3] == model.embed_query("answer 3")
+    assert batcher.get_stats()["batches"] == 1
+
+
+def test_model_errors_reach_every_caller():
+    class Broken(DeterministicFakeEmbedding):
+        def embed_documents(self, texts):
+            raise RuntimeError("model crashed")
+
+    batcher = EmbeddingBatcher(Broken(size=4), max_wait_ms=1)
+
+    with pytest.raises(RuntimeError, match="model crashed"):
+        batcher.embed_query("anything")
+
+
+def test_cancelled_caller_does_not_stop_the_worker():
+    class Slow(DeterministicFakeEmbedding):
+        def embed_documents(self, texts):
+            time.sleep(0.05)
+            return super().embed_documents(texts)
+
+    model = Slow(size=4)
+    batcher = EmbeddingBatcher(model, max_wait_ms=20)
+
+    async def cancel_one():
+        waiter = asyncio.create_task(batcher.aembed_query("gone"))
+        await asyncio.sleep(0.005)  # queued, batch still collecting
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await asyncio.wait_for(batcher.aembed_query("still served"), timeout=2)
+
+    assert asyncio.run(cancel_one()) == model.embed_query("still served")
+    assert batcher.embed_query("after") == model.embed_query("after")
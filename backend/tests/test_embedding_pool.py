@@ -0,0 +1,44 @@
+import asyncio
+from functools import partial
+
+import numpy as np
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.app.services.embedding_batcher import EmbeddingBatcher
+from backend.app.services.embedding_pool import ProcessPoolEmbeddings
+
+
+def test_worker_processes_return_the_same_vectors():
+    model = DeterministicFakeEmbedding(size=8)
+    pool = ProcessPoolEmbeddings(partial(DeterministicFakeEmbedding, size=8), workers=2)
+    try:
+        pool.warmup()
+        # float32 on the wire
+        np.testing.assert_allclose(
+            pool.embed_documents(["a", "b"]), model.embed_documents(["a", "b"]), rtol=1e-6
+        )
+
+        batcher = EmbeddingBatcher(pool, max_wait_ms=10)
+
+        async def run():
+            return await asyncio.gather(*(batcher.aembed_query(f"q{i}") for i in range(6)))
+
+        vectors = asyncio.run(run())
+        np.testing.assert_allclose(
+            vectors, [model.embed_query(f"q{i}") for i in range(6)], rtol=1e-6
+        )
+    finally:
+        pool.close()
+
+
+def test_closed_pool_starts_again_on_next_use():
+    pool = ProcessPoolEmbeddings(partial(DeterministicFakeEmbedding, size=8), workers=1)
+    try:
+        pool.warmup()
+        pool.close(wait=True)
+        assert pool._pool is None
+
+        assert len(pool.embed_query("after close")) == 8
+    finally:
+        pool.close()
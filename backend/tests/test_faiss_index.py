@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from backend.app.services.faiss_index import FaissVectorIndex
+
+
+def make_docs(start, count, dim=32):
+    vectors = np.random.default_rng(start).standard_normal((count, dim))
+    ids = [f"q{i}" for i in range(start, start + count)]
+    metadatas = [{"id": doc_id, "category": "coding"} for doc_id in ids]
+    return ids, [f"Question {doc_id}" for doc_id in ids], metadatas, vectors
+
+
+def nlist(index):
+    return index._inner().nlist
+
+
+def test_ivf_gets_more_lists_as_the_corpus_grows(tmp_path):
+    index = FaissVectorIndex(str(tmp_path), index_type="ivf", nlist=64)
+    index.add(*make_docs(0, 30))
+    assert nlist(index) == 1
+
+    batches = [make_docs(start, 200) for start in range(30, 2030, 200)]
+    for batch in batches:
+        index.add(*batch)
+
+    assert nlist(index) >= 32
+    assert index.search(batches[3][3][7], k=1)[0].metadata["id"] == batches[3][0][7]
+
+
+def test_ivf_search_is_right_after_removals(tmp_path):
+    index = FaissVectorIndex(str(tmp_path), index_type="ivf")
+    ids, texts, metadatas, vectors = make_docs(0, 100)
+    index.add(ids, texts, metadatas, vectors)
+    index.remove(ids[:10])
+
+    assert [index.search(vectors[i], k=1)[0].metadata["id"] for i in (20, 50, 99)] == [
+        "q20", "q50", "q99"
+    ]
+
+
+def test_hnsw_tombstones_are_compacted(tmp_path):
+    index = FaissVectorIndex(str(tmp_path), index_type="hnsw", max_dead_fraction=0.25)
+    ids, texts, metadatas, vectors = make_docs(0, 100)
+    index.add(ids, texts, metadatas, vectors)
+    index.remove(ids[:20])
+    assert len(index.docs) == 100  # below the threshold: tombstoned
+
+    index.remove(ids[20:40])
+    assert len(index.docs) == len(index.label_of) == 60
+    assert index.search(vectors[50], k=1)[0].metadata["id"] == "q50"
+
+
+def test_load_rebuilds_to_the_configured_type(tmp_path):
+    ids, texts, metadatas, vectors = make_docs(0, 50)
+    flat = FaissVectorIndex(str(tmp_path), index_type="flat")
+    flat.add(ids, texts, metadatas, vectors)
+    flat.save()
+
+    reopened = FaissVectorIndex(str(tmp_path), index_type="hnsw").load()
+
+    assert reopened.index_type == "hnsw"
+    assert reopened.search(vectors[10], k=1)[0].metadata["id"] == "q10"
+    # Saved in the new type, so the next start doesn't rebuild again
+    assert FaissVectorIndex(str(tmp_path), index_type="flat").load().index_type == "flat"
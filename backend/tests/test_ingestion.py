@@ -0,0 +1,127 @@
+import io
+import json
+from functools import partial
+from pathlib import Path
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.app.services.ingestion import (
+    ChromaSink,
+    FaissSink,
+    _iter_json_bank,
+    ingest_file,
+    iter_questions,
+)
+
+BANK = Path(__file__).resolve().parents[1] / "data" / "interview_qa.json"
+fake_embeddings = partial(DeterministicFakeEmbedding, size=32)
+
+
+def write_jsonl(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "category": ["coding", "system_design", "behavioral"][i % 3],
+                "id": f"gen_{i:05d}",
+                "question": f"Generated question {i}?",
+                "difficulty": "medium",
+                "expert_approach": "Think it through.",
+                "key_points": ["one", "two"],
+                "common_mistakes": ["rushing"],
+                "follow_ups": ["why?"],
+            }) + "\n")
+    return path
+
+
+def test_json_bank_is_streamed_in_small_chunks():
+    text = BANK.read_text(encoding="utf-8")
+    expected = [(c, q) for c, qs in json.loads(text).items() for q in qs]
+
+    assert list(_iter_json_bank(io.StringIO(text), chunk_size=7)) == expected
+    assert list(iter_questions(BANK)) == expected
+
+
+def test_ingest_resumes_from_checkpoint_and_skips_unchanged(tmp_path):
+    source = write_jsonl(tmp_path / "bank.jsonl", 50)
+    checkpoint = tmp_path / "checkpoint.json"
+    sink = ChromaSink(str(tmp_path / "chroma"))
+
+    class CrashingSink:
+        """Dies on the second write, after one chunk is durable"""
+        writes = 0
+
+        def __getattr__(self, name):
+            return getattr(sink, name)
+
+        def write(self, *args):
+            self.writes += 1
+            if self.writes == 2:
+                raise RuntimeError("boom")
+            sink.write(*args)
+
+    with pytest.raises(RuntimeError):
+        ingest_file(source, CrashingSink(), batch_size=10, write_size=20, workers=0,
+                    checkpoint_path=checkpoint, embeddings_factory=fake_embeddings)
+    assert json.loads(checkpoint.read_text())["position"] == 20
+    assert sink.collection.count() == 20
+
+    stats = ingest_file(source, sink, batch_size=10, write_size=20, workers=0,
+                        checkpoint_path=checkpoint, embeddings_factory=fake_embeddings)
+    assert stats == {"read": 30, "embedded": 30, "unchanged": 0}
+    assert sink.collection.count() == 50
+    assert not checkpoint.exists()
+
+    stats = ingest_file(source, sink, batch_size=10, workers=0,
+                        embeddings_factory=fake_embeddings)
+    assert stats == {"read": 50, "embedded": 0, "unchanged": 50}
+
+
+def test_process_pool_ingest_into_faiss(tmp_path):
+    pytest.importorskip("faiss")
+    source = write_jsonl(tmp_path / "bank.jsonl", 120)
+    sink = FaissSink(str(tmp_path / "faiss"))
+
+    stats = ingest_file(source, sink, batch_size=16, write_size=50, workers=2,
+                        embeddings_factory=fake_embeddings)
+
+    assert stats["embedded"] == 120
+    reopened = FaissSink(str(tmp_path / "faiss"))
+    assert len(reopened.stored_hashes()) == 120
+
+
+def test_bank_sync_keeps_cli_ingested_documents(tmp_path, monkeypatch):
+    from backend.app.services import knowledge_base
+
+    monkeypatch.setattr(knowledge_base, "get_embeddings", lambda: fake_embeddings())
+    persist_dir = str(tmp_path / "chroma")
+    source = write_jsonl(tmp_path / "big.jsonl", 50)
+    ingest_file(source, ChromaSink(persist_dir), batch_size=10, workers=0,
+                embeddings_factory=fake_embeddings)
+
+    kb = knowledge_base.InterviewKnowledgeBase(persist_dir=persist_dir)
+    bank = sum(len(items) for items in kb.load_questions().values())
+    knowledge_base.InterviewKnowledgeBase(persist_dir=persist_dir)
+
+    collection = kb.vector_store._collection
+    assert collection.count() == bank + 50
+    assert collection.get(ids=["gen_00000", "gen_00049"])["ids"]
+
+
+def test_faiss_bank_sync_keeps_cli_ingested_documents(tmp_path, monkeypatch):
+    pytest.importorskip("faiss")
+    from backend.app.services import knowledge_base
+
+    monkeypatch.setattr(knowledge_base, "get_embeddings", lambda: fake_embeddings())
+    index_dir = str(tmp_path / "faiss")
+    source = write_jsonl(tmp_path / "big.jsonl", 20)
+    ingest_file(source, FaissSink(index_dir), batch_size=10, workers=0,
+                embeddings_factory=fake_embeddings)
+
+    kb = knowledge_base.InterviewKnowledgeBase(backend="faiss", index_dir=index_dir)
+    bank = sum(len(items) for items in kb.load_questions().values())
+    reopened = knowledge_base.InterviewKnowledgeBase(backend="faiss", index_dir=index_dir)
+
+    stored = reopened.vector_index.stored_hashes()
+    assert len(stored) == bank + 20
+    assert "gen_00000" in stored and "gen_00019" in stored
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_groq import ChatGroq
+
+from backend.app.services import evaluator, interview_graph
+from backend.app.services.json_stream import (
+    IncrementalJSONParser,
+    StructuredOutputError,
+    parse_json_object,
+)
+
+EVALUATION = {
+    "correctness": 30,
+    "clarity": 25,
+    "completeness": 20,
+    "total": 75,
+    "strengths": ['Named the "three pointer" idea', "O(1) space"],
+    "weaknesses": ["No edge cases"],
+    "improvement": "Discuss the empty list",
+}
+
+
+def test_fields_surface_as_soon_as_they_complete():
+    text = json.dumps(EVALUATION)
+    parser = IncrementalJSONParser()
+    seen_at = {}
+    for i in range(0, len(text), 4):
+        for name, value in parser.feed(text[i : i + 4]):
+            seen_at[name] = i
+
+    assert parser.done and parser.fields == EVALUATION
+    # The scores are usable well before the feedback has streamed
+    assert seen_at["total"] < len(text) // 3
+    assert list(seen_at) == list(EVALUATION)
+
+
+def test_truncated_and_fenced_output_is_parsed_as_far_as_it_goes():
+    text = json.dumps(EVALUATION)
+    cut = text[: text.index("O(1)") + 2]
+
+    assert parse_json_object(cut)["strengths"] == ['Named the "three pointer" idea', "O("]
+    assert parse_json_object(text[: text.index('"clarity"') + 4]) == {"correctness": 30}
+    assert parse_json_object(f"```json\n{text}\n```") == EVALUATION
+    with pytest.raises(StructuredOutputError):
+        parse_json_object("Score: 80/100")
+
+
+def test_total_is_the_sum_of_the_parts():
+    result = evaluator.parse_evaluation(json.dumps({**EVALUATION, "total": 99}))
+    assert result.total == 75
+
+    with pytest.raises(StructuredOutputError, match="clarity"):
+        evaluator.parse_evaluation(json.dumps({**EVALUATION, "clarity": 45}))
+
+
+def test_invalid_output_gets_one_bounded_repair(monkeypatch):
+    repair = FakeListChatModel(responses=[json.dumps(EVALUATION), "still not json"])
+    prompt = evaluator.get_prompt("evaluation_repair").template
+    monkeypatch.setattr(evaluator, "_repair_chain", lambda: prompt | repair)
+    before = evaluator.get_structured_output_stats()
+
+    truncated = json.dumps(EVALUATION)[:60]
+    assert evaluator.parse_or_repair(truncated, retries=1).total == 75
+    with pytest.raises(StructuredOutputError):
+        asyncio.run(evaluator.aparse_or_repair("Score: 80/100", retries=1))
+
+    after = evaluator.get_structured_output_stats()
+    assert after["repaired"] - before["repaired"] == 1
+    assert after["failed"] - before["failed"] == 1
+
+
+class ChunkedChatGroq(ChatGroq):
+    """ChatGroq whose API streams the evaluation 8 characters at a time"""
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        text = json.dumps(EVALUATION)
+        for i in range(0, len(text), 8):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text[i : i + 8]))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise AssertionError("the stream fell back to a single blocking call")
+
+
+def test_streamed_evaluation_reaches_the_parser_in_chunks(monkeypatch):
+    feeds = []
+
+    class RecordingParser(IncrementalJSONParser):
+        def feed(self, chunk):
+            feeds.append(chunk)
+            return super().feed(chunk)
+
+    monkeypatch.setattr(interview_graph, "IncrementalJSONParser", RecordingParser)
+    graph = interview_graph.InterviewGraph()
+    graph.llm = ChunkedChatGroq(api_key="test-not-used", model="llama-3.3-70b-versatile")
+    state = {
+        "messages": [],
+        "category": "coding",
+        "question_count": 1,
+        "current_question": "Reverse a linked list.",
+        "current_question_id": "coding_q1",
+        "user_answer": "Three pointers.",
+        "evaluation": "",
+        "score": 0,
+    }
+
+    async def consume():
+        return [item async for item in graph.astream_evaluation(state)]
+
+    items = asyncio.run(consume())
+
+    assert len(feeds) > 1
+    assert [name for name, _ in items[:3]] == ["correctness", "clarity", "completeness"]
+    assert items[-1][0] == "update" and items[-1][1]["score"] == 75
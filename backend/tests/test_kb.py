@@ -13,5 +13,120 @@ def test_knowledge_base():
     
     return questions
 
+
+def test_ingest_is_idempotent(tmp_path, fake_kb_embeddings):
+    """Re-ingesting an unchanged bank embeds nothing and adds no duplicates"""
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    embedded = []
+
+    class CountingEmbeddings(DeterministicFakeEmbedding):
+        def embed_documents(self, texts):
+            embedded.append(len(texts))
+            return super().embed_documents(texts)
+
+    fake_kb_embeddings(CountingEmbeddings)
+
+    kb = InterviewKnowledgeBase(persist_dir=str(tmp_path))
+    total = sum(len(items) for items in kb.load_questions().values())
+
+    InterviewKnowledgeBase(persist_dir=str(tmp_path))
+    assert embedded == [total]
+
+    original = kb.load_questions()
+    original["coding"][0]["question"] += " (updated)"
+    removed = original["behavioral"].pop()
+    kb.iter_questions = lambda: ((c, q) for c, qs in original.items() for q in qs)
+    kb.ingest()
+
+    assert embedded == [total, 1]
+    collection = kb.vector_store._collection
+    assert collection.count() == total - 1
+    assert not collection.get(ids=[removed["id"]])["ids"]
+
+
+def test_numpy_backend_search(tmp_path, fake_kb_embeddings):
+    """The memory-mapped backend keeps the search(query, category, k) contract"""
+    kb = InterviewKnowledgeBase(backend="numpy", index_dir=str(tmp_path / "index"))
+    question = kb.load_questions()["system_design"][0]
+    query = kb.render_document("system_design", question)
+
+    results = kb.search(query, category="system_design", k=3)
+    assert len(results) == 3
+    assert results[0].metadata["id"] == question["id"]
+    assert all(r.metadata["category"] == "system_design" for r in results)
+
+    coding = kb.search(query, category="coding", k=2)
+    assert all(r.metadata["category"] == "coding" for r in coding)
+
+    reopened = InterviewKnowledgeBase(backend="numpy", index_dir=str(tmp_path / "index"))
+    assert reopened.search(query, k=1)[0].metadata["id"] == question["id"]
+
+
+def test_faiss_backend_filters_and_persists(tmp_path, monkeypatch, fake_kb_embeddings):
+    """FAISS backend: category/difficulty filters and incremental re-ingest"""
+    import pytest
+    pytest.importorskip("faiss")
+    monkeypatch.setenv("FAISS_INDEX_TYPE", "hnsw")
+
+    kb = InterviewKnowledgeBase(backend="faiss", index_dir=str(tmp_path / "faiss"))
+    question = kb.load_questions()["coding"][1]
+    query = kb.render_document("coding", question)
+
+    top = kb.search(query, category="coding", k=1)[0]
+    assert top.metadata["id"] == question["id"]
+
+    hard = kb.search(query, category="coding", k=5, difficulty="hard")
+    assert hard and all(r.metadata["difficulty"] == "hard" for r in hard)
+
+    reopened = InterviewKnowledgeBase(backend="faiss", index_dir=str(tmp_path / "faiss"))
+    assert len(reopened.vector_index.label_of) == sum(
+        len(items) for items in kb.load_questions().values()
+    )
+    assert reopened.search(query, k=1)[0].metadata["id"] == question["id"]
+
+
+def test_search_caches_query_embeddings_and_results(tmp_path, fake_kb_embeddings):
+    """Repeated queries skip the embedding model; ingest invalidates results"""
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    queries = []
+
+    class CountingEmbeddings(DeterministicFakeEmbedding):
+        def embed_query(self, text):
+            queries.append(text)
+            return super().embed_query(text)
+
+    fake_kb_embeddings(CountingEmbeddings)
+
+    kb = InterviewKnowledgeBase(backend="numpy", index_dir=str(tmp_path / "index"))
+    first = kb.search("coding interview question", category="coding", k=2)
+    again = kb.search("coding interview question", category="coding", k=2)
+    kb.search("coding interview question", category="behavioral", k=2)
+
+    assert queries == ["coding interview question"]
+    assert [d.metadata["id"] for d in again] == [d.metadata["id"] for d in first]
+    stats = kb.cache_stats()
+    assert stats["query_embeddings"]["hits"] == 2
+    assert stats["results"]["hits"] == 1
+
+    kb.ingest()
+    assert len(kb.result_cache) == 0
+    kb.search("coding interview question", category="coding", k=2)
+    assert queries == ["coding interview question"]
+
+
+def test_expert_context_table(tmp_path, fake_kb_embeddings):
+    """Bank questions get precomputed expert context; other ids get None"""
+    kb = InterviewKnowledgeBase(backend="numpy", index_dir=str(tmp_path / "index"))
+    question = kb.load_questions()["coding"][0]
+
+    context = kb.get_expert_context(question["id"])
+    assert question["expert_approach"] in context
+    assert all(point in context for point in question["key_points"])
+    assert all(mistake in context for mistake in question["common_mistakes"])
+    assert kb.get_expert_context(f"{question['id']}_followup") is None
+
+
 if __name__ == "__main__":
-    test_knowledge_base()
\ No newline at end of file
+    test_knowledge_base()
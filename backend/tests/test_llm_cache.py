@@ -0,0 +1,45 @@
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from backend.app.services.llm_cache import SQLiteLLMCache
+
+
+def test_repeated_prompt_is_served_from_cache(tmp_path):
+    cache = SQLiteLLMCache(path=str(tmp_path / "llm_cache.db"))
+    llm = FakeListChatModel(responses=["Score: 80/100", "Score: 20/100"], cache=cache)
+
+    first = llm.invoke("Evaluate: three pointers")
+    second = llm.invoke("Evaluate: three pointers")
+
+    assert first.content == second.content == "Score: 80/100"
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "llm_cache.db")
+    FakeListChatModel(responses=["cached"], cache=SQLiteLLMCache(path=path)).invoke("hi")
+
+    reopened = SQLiteLLMCache(path=path)
+    FakeListChatModel(responses=["cached"], cache=reopened).invoke("hi")
+
+    assert reopened.get_stats()["hits"] == 1
+
+
+def test_lru_eviction_and_ttl(tmp_path):
+    cache = SQLiteLLMCache(path=str(tmp_path / "llm_cache.db"), max_entries=2)
+    llm = FakeListChatModel(responses=["a", "b", "c"], cache=cache)
+
+    llm.invoke("one")
+    llm.invoke("two")
+    llm.invoke("one")  # touch "one" so "two" is least recently used
+    llm.invoke("three")
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.lookup("one", "anything") is None
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+from backend.app.services.llm_client import PooledTransport, create_chat_model
+
+
+def make_transport():
+    transport = PooledTransport(limits=httpx.Limits(max_connections=4))
+    # Stand-ins for the real pools; PooledTransport only wraps them. The sync
+    # one streams its body, the async one returns it already buffered
+    transport._sync = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=iter([b'{"ok": true}']))
+    )
+    transport._async = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+    return transport
+
+
+def test_requests_are_in_flight_until_the_body_is_closed():
+    transport = make_transport()
+    client = httpx.Client(transport=transport)
+
+    with client.stream("GET", "https://api.example/models") as response:
+        assert transport.get_stats()["in_flight"] == 1
+        response.read()
+    assert client.get("https://api.example/models").json() == {"ok": True}
+
+    stats = transport.get_stats()
+    assert stats["requests"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == 1
+    assert stats["max_connections"] == 4
+
+
+def test_async_requests_share_the_counters():
+    transport = make_transport()
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            await asyncio.gather(*(client.get("https://api.example/models") for _ in range(3)))
+
+    asyncio.run(run())
+
+    assert transport.get_stats()["requests"] == 3
+    assert transport.get_stats()["in_flight"] == 0
+
+
+def test_chat_models_share_one_pool():
+    large = create_chat_model(model="llama-3.3-70b-versatile")
+    small = create_chat_model(model="llama-3.1-8b-instant", temperature=0.3)
+
+    assert large.http_client is small.http_client
+    assert large.http_async_client is small.http_async_client
+    # Per-model defaults, overridable per call site
+    assert small.max_tokens == 1024
+    assert small.request_timeout == 20.0
+    assert create_chat_model(model="llama-3.1-8b-instant", max_tokens=64).max_tokens == 64
@@ -0,0 +1,70 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from backend.app.services import resilience
+from backend.app.services.model_router import ModelRouter
+
+TIERS = {"quality": "router-test-large", "fast": "router-test-small"}
+
+
+def make_router(**kwargs):
+    return ModelRouter(
+        tiers=TIERS,
+        model_factory=lambda model, **options: FakeListChatModel(responses=[model]),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def policies(monkeypatch):
+    """Fresh resilience policy per test tier, dropped again after the test"""
+    for model in TIERS.values():
+        monkeypatch.setitem(resilience._policies, model, resilience.ResiliencePolicy())
+    return {tier: resilience._policies[model] for tier, model in TIERS.items()}
+
+
+def test_scoring_stays_on_quality_tier_when_degraded(policies):
+    router = make_router()
+    policies["quality"].error_rate = 0.9
+
+    assert router.select("evaluation") == "quality"
+    assert router.select("scoring") == "quality"
+    assert router.select("followup") == "fast"
+    assert router.get_stats()["tasks"]["followup"]["downgrades"] == {"errors": 1}
+
+
+def test_followups_downgrade_on_slow_quality_model(policies):
+    router = make_router(latency_slo=1.0)
+    latencies = policies["quality"].latencies
+    assert router.select("followup") == "quality"
+
+    for _ in range(latencies.min_samples):
+        latencies.record(2.5)
+    assert router.select("followup") == "fast"
+
+    # ...but not onto a fast model that is failing too
+    policies["fast"].breaker.state = "open"
+    assert router.select("followup") == "quality"
+
+
+def test_routed_model_works_in_a_chain(policies):
+    router = make_router(routes={"followup": "fast"})
+    prompt = ChatPromptTemplate.from_messages([("human", "{question}")])
+
+    chain = prompt | router.routed("followup")
+
+    assert chain.invoke({"question": "Next?"}).content == "router-test-small"
+
+
+def test_tiers_come_from_settings(monkeypatch):
+    from backend.config import settings
+
+    monkeypatch.setattr(settings, "llm_model", "settings-large")
+    monkeypatch.setattr(settings, "llm_fast_model", "settings-small")
+    for model in ("settings-large", "settings-small"):
+        monkeypatch.setitem(resilience._policies, model, resilience.ResiliencePolicy())
+    router = ModelRouter(model_factory=lambda model, **options: FakeListChatModel(responses=[model]))
+
+    assert router.tiers == {"quality": "settings-large", "fast": "settings-small"}
+    assert router.select("agent") == "fast"
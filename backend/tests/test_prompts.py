@@ -0,0 +1,43 @@
+from backend.app.services.interview_graph import InterviewGraph
+from backend.app.services.prompts import PromptRegistry, get_prompt
+
+
+def test_prompts_compile_once_per_category_with_static_parts_filled():
+    coding = get_prompt("evaluation", "coding")
+
+    assert get_prompt("evaluation", "coding") is coding
+    assert get_prompt("evaluation", "behavioral").version != coding.version
+    # Only the per-answer inputs are left to fill
+    assert set(coding.template.input_variables) == {"question", "expert_context", "user_answer"}
+    assert "time/space complexity" in coding.instructions
+
+    messages = coding.template.format_messages(
+        question="Two sum?", expert_context="Hash map.", user_answer="Nested loops."
+    )
+    assert messages[0].content.startswith("You are an expert coding interviewer.")
+
+
+def test_version_changes_only_with_the_prompt():
+    def build(text):
+        return lambda category: ([("system", text), ("human", "{question}")], {})
+
+    first, second = PromptRegistry(), PromptRegistry()
+    first.register("p", build("Be strict."))
+    second.register("p", build("Be strict."))
+    assert first.get("p").version == second.get("p").version
+
+    second.register("p", build("Be lenient."))
+    assert second.get("p").version != first.get("p").version
+    assert second.versions() == {"p": second.get("p").version}
+
+
+def test_semantic_cache_key_carries_the_prompt_version():
+    state = {
+        "category": "coding",
+        "current_question_id": "coding_q1",
+        "current_question": "Two sum?",
+    }
+
+    key = InterviewGraph._semantic_key(state)
+
+    assert key == ("coding_q1", "Two sum?", get_prompt("evaluation", "coding").version)
@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    DeadlineExceeded,
+    LatencyTracker,
+    ResiliencePolicy,
+    attempt_timeout,
+    request_deadline,
+)
+
+
+class UpstreamError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def warmed_policy(**kwargs):
+    """Policy whose p95 is ~50ms, so it hedges after 50ms"""
+    latencies = LatencyTracker(min_samples=5)
+    for _ in range(20):
+        latencies.record(0.05)
+    return ResiliencePolicy(hedge_min_delay=0.01, latencies=latencies, **kwargs)
+
+
+def test_slow_call_is_hedged_and_loser_cancelled():
+    policy = warmed_policy()
+    calls = []
+    cancelled = []
+
+    async def upstream():
+        calls.append(1)
+        try:
+            # The first request hits the tail, the hedge doesn't
+            await asyncio.sleep(5 if len(calls) == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return len(calls)
+
+    started = time.monotonic()
+    assert asyncio.run(policy.acall(upstream)) == 2
+    assert time.monotonic() - started < 1
+    assert cancelled == [1]
+    assert policy.stats["hedges"] == 1 and policy.stats["hedge_wins"] == 1
+
+
+def test_sync_call_is_hedged():
+    policy = warmed_policy()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(1 if len(calls) == 1 else 0.01)
+        return len(calls)
+
+    started = time.monotonic()
+    assert policy.call(upstream) == 2
+    assert time.monotonic() - started < 0.5
+
+
+def test_deadline_bounds_the_wait():
+    policy = ResiliencePolicy(deadline=0.2, hedge=False)
+
+    async def stuck():
+        await asyncio.sleep(30)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(policy.acall(stuck))
+    assert time.monotonic() - started < 1
+    assert policy.stats["deadline_exceeded"] == 1
+
+
+def test_sequential_calls_share_the_request_budget():
+    """Each call gets what is left of the request's budget, not its own"""
+    policy = ResiliencePolicy(deadline=10, hedge=False)
+    timeouts = []
+
+    def upstream():
+        timeouts.append(attempt_timeout())
+        time.sleep(0.15)
+        return "ok"
+
+    started = time.monotonic()
+    with request_deadline(0.4):
+        policy.call(upstream)
+        policy.call(upstream)
+        with pytest.raises(DeadlineExceeded):
+            policy.call(upstream)
+        with pytest.raises(DeadlineExceeded):
+            policy.call(upstream)
+    assert time.monotonic() - started < 0.7
+    # The HTTP request is told how long it has, so abandoned attempts end too
+    assert timeouts[0] <= 0.4 and timeouts[1] < timeouts[0]
+    assert attempt_timeout() is None
+
+
+def test_retryable_errors_are_retried_others_are_not():
+    policy = ResiliencePolicy(retries=2, backoff_base=0.001, hedge=False)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise UpstreamError(503)
+        return "ok"
+
+    assert policy.call(flaky) == "ok"
+    assert policy.stats["retries"] == 2
+
+    def bad_request():
+        raise UpstreamError(400)
+
+    with pytest.raises(UpstreamError):
+        policy.call(bad_request)
+    assert policy.stats["retries"] == 2
+
+
+def test_programming_errors_are_not_retried_or_counted_against_the_upstream():
+    breaker = CircuitBreaker(failure_threshold=3)
+    policy = ResiliencePolicy(retries=2, backoff_base=0.001, hedge=False, breaker=breaker)
+    attempts = []
+
+    def bug():
+        attempts.append(1)
+        raise ValueError("bad prompt variables")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            policy.call(bug)
+    assert len(attempts) == 3 and policy.stats["retries"] == 0
+    assert breaker.state == "closed" and policy.error_rate == 0.0
+
+    def timeout():
+        attempts.append(1)
+        raise TimeoutError("read timed out")
+
+    with pytest.raises(TimeoutError):
+        policy.call(timeout)
+    assert policy.stats["retries"] == 2
+
+
+def test_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.1)
+    policy = ResiliencePolicy(retries=0, hedge=False, breaker=breaker)
+
+    def down():
+        raise UpstreamError(500)
+
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            policy.call(down)
+    with pytest.raises(CircuitOpen):
+        policy.call(lambda: "not called")
+
+    time.sleep(0.15)
+    # Half-open: one trial call closes it again
+    assert policy.call(lambda: "ok") == "ok"
+    assert breaker.state == "closed" and breaker.trips == 1
+
+
+def test_stalled_stream_ends_at_deadline():
+    policy = ResiliencePolicy(deadline=0.2)
+
+    async def stream():
+        yield "Score: 80/100"
+        await asyncio.sleep(30)
+        yield "never"
+
+    async def consume():
+        chunks = []
+        with pytest.raises(DeadlineExceeded):
+            async for chunk in policy.astream(stream):
+                chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(consume()) == ["Score: 80/100"]
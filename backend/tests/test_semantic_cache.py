@@ -0,0 +1,53 @@
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.app.services.semantic_cache import SemanticEvaluationCache
+
+
+class KeywordEmbeddings(Embeddings):
+    """Bag-of-words vectors over a tiny vocabulary"""
+
+    vocab = ["three", "pointers", "prev", "next", "recursion", "stack", "hash", "map"]
+
+    def embed_query(self, text):
+        words = text.split()
+        return [float(words.count(w)) for w in self.vocab]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+KEY = ("coding_q1", "Reverse a singly linked list.")
+
+
+def test_near_identical_answer_reuses_evaluation():
+    cache = SemanticEvaluationCache(KeywordEmbeddings(), threshold=0.95)
+    cache.add(KEY, cache.embed("Three pointers with prev and next"), "Score: 90/100", 90)
+
+    hit = cache.match(KEY, cache.embed("  three POINTERS prev   next "))
+    miss = cache.match(KEY, cache.embed("use recursion and a stack"))
+
+    assert hit["evaluation"] == "Score: 90/100"
+    assert hit["score"] == 90
+    assert miss is None
+    assert cache.get_stats()["hit_rate"] == 0.5
+
+
+def test_other_question_does_not_match():
+    cache = SemanticEvaluationCache(KeywordEmbeddings())
+    cache.add(KEY, cache.embed("three pointers"), "Score: 90/100", 90)
+
+    assert cache.match(("coding_q2", "Two sum"), cache.embed("three pointers")) is None
+
+
+def test_least_recently_used_answer_is_evicted():
+    cache = SemanticEvaluationCache(KeywordEmbeddings(), max_entries_per_question=2)
+    cache.add(KEY, cache.embed("three pointers"), "A", 80)
+    cache.add(KEY, cache.embed("recursion stack"), "B", 60)
+    cache.match(KEY, cache.embed("three pointers"))
+    cache.add(KEY, cache.embed("hash map"), "C", 40)
+
+    assert cache.match(KEY, cache.embed("recursion stack")) is None
+    assert cache.match(KEY, cache.embed("three pointers"))["evaluation"] == "A"
+    assert cache.get_stats()["evictions"] == 1
+    assert np.isclose(np.linalg.norm(cache.embed("hash map")), 1.0)
@@ -0,0 +1,88 @@
+import time
+from dataclasses import dataclass
+
+from backend.app.services.session_store import (
+    InMemorySessionStore,
+    SQLiteSessionStore,
+    deserialize_session,
+    serialize_session,
+)
+
+
+@dataclass
+class GraphMessage:
+    role: str
+    content: str
+
+
+def make_record():
+    state = {
+        "messages": [
+            GraphMessage(role="interviewer", content="Reverse a linked list."),
+            {"role": "candidate", "content": "Three pointers."},
+        ],
+        "category": "coding",
+        "question_count": 1,
+        "current_question": "Reverse a linked list.",
+        "current_question_id": "coding_q1",
+        "user_answer": "Three pointers.",
+        "evaluation": "Score: 80/100",
+        "score": 80,
+    }
+    return {"state": state, "db_id": 7}
+
+
+def test_serialization_round_trip():
+    record = deserialize_session(serialize_session(make_record()))
+
+    assert record["db_id"] == 7
+    assert record["state"]["score"] == 80
+    assert record["state"]["messages"][0] == {
+        "role": "interviewer",
+        "content": "Reverse a linked list.",
+    }
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = InMemorySessionStore(max_sessions=2)
+    store.put("a", make_record())
+    store.put("b", make_record())
+    store.get("a")
+    store.put("c", make_record())
+
+    assert "a" in store
+    assert "b" not in store
+    assert len(store) == 2
+
+
+def test_memory_store_expires_idle_sessions():
+    store = InMemorySessionStore(ttl_seconds=0.01)
+    store.put("a", make_record())
+    time.sleep(0.02)
+
+    assert store.get("a") is None
+
+
+def test_memory_store_reads_keep_a_session_alive():
+    store = InMemorySessionStore(ttl_seconds=0.05)
+    store.put("a", make_record())
+    for _ in range(4):
+        time.sleep(0.02)
+        assert store.get("a") is not None
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    worker_1 = SQLiteSessionStore(path=path)
+    worker_2 = SQLiteSessionStore(path=path)
+
+    record = make_record()
+    worker_1.put("session_1", record)
+    record = worker_2.get("session_1")
+    record["state"]["question_count"] = 2
+    worker_2.put("session_1", record)
+
+    assert worker_1.get("session_1")["state"]["question_count"] == 2
+
+    worker_1.delete("session_1")
+    assert worker_2.get("session_1") is None
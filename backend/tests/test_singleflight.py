@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from langchain_core.language_models.fake_chat_models import (
+    FakeListChatModel,
+    FakeMessagesListChatModel,
+)
+from langchain_core.messages import AIMessage
+
+from backend.app.services.singleflight import SingleFlight, SingleFlightChatMixin
+from backend.app.services.token_budget import TokenUsageCallback, token_usage
+
+
+class SlowFakeChat(SingleFlightChatMixin, FakeListChatModel):
+    """Fake model whose upstream call takes a while, counting real calls"""
+
+    upstream_calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.upstream_calls += 1
+        time.sleep(0.2)
+        return super()._call(*args, **kwargs)
+
+
+def test_concurrent_identical_prompts_share_one_call():
+    llm = SlowFakeChat(responses=["first", "second"])
+    results = []
+
+    def ask(prompt):
+        results.append(llm.invoke(prompt).content)
+
+    threads = [threading.Thread(target=ask, args=("Follow-up for q1",)) for _ in range(5)]
+    threads.append(threading.Thread(target=ask, args=("Follow-up for q2",)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert llm.upstream_calls == 2
+    # Five callers share one answer, the other prompt gets its own
+    assert sorted(Counter(results).values()) == [1, 5]
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    flights = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("rate limited")
+
+    errors = []
+
+    def run():
+        try:
+            flights.do("key", fail)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3 and len(calls) == 1
+    assert flights.do("key", lambda: "ok") == "ok"
+    assert flights.get_stats()["coalesced"] == 2
+
+
+def test_async_waiter_cancellation_does_not_cancel_the_leader():
+    flights = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "evaluation"
+
+    async def run():
+        leader = asyncio.create_task(flights.ado("key", upstream))
+        follower = asyncio.create_task(flights.ado("key", upstream))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == "evaluation"
+    assert len(calls) == 1
+    assert flights.get_stats() == {
+        "calls": 2, "coalesced": 1, "in_flight": 0, "coalesce_rate": 0.5
+    }
+
+
+class SlowMessagesChat(FakeMessagesListChatModel):
+    def _generate(self, *args, **kwargs):
+        time.sleep(0.2)
+        return super()._generate(*args, **kwargs)
+
+
+class SlowUsageChat(SingleFlightChatMixin, SlowMessagesChat):
+    """Fake model replaying a message with usage metadata"""
+
+
+def test_coalesced_callers_report_the_usage_once():
+    message = AIMessage(
+        content="Score: 80/100",
+        usage_metadata={"input_tokens": 120, "output_tokens": 30, "total_tokens": 150},
+        response_metadata={"model_name": "flight-usage-test-model"},
+    )
+    llm = SlowUsageChat(responses=[message], callbacks=[TokenUsageCallback()])
+
+    threads = [threading.Thread(target=llm.invoke, args=("Evaluate q1",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert token_usage.get_stats()["models"]["flight-usage-test-model"] == {
+        "calls": 1, "cached": 0, "coalesced": 3, "prompt_tokens": 120, "completion_tokens": 30
+    }
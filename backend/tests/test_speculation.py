@@ -0,0 +1,117 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from backend.app.services.interview_graph import InterviewGraph
+from backend.app.services.speculation import FollowupScheduler
+
+
+def make_state(question_count=1, score=0):
+    return {
+        "messages": [],
+        "category": "coding",
+        "question_count": question_count,
+        "current_question": "Reverse a linked list.",
+        "current_question_id": "coding_q1",
+        "user_answer": "Three pointers.",
+        "evaluation": "",
+        "score": score,
+    }
+
+
+def test_bank_question_is_kept():
+    """A bank follow-up doesn't depend on the score, so it is always used"""
+    graph = InterviewGraph()
+    scheduler = FollowupScheduler(graph)
+    state = make_state()
+    state.update(graph.start_node(state))
+    asked = state["current_question_id"]
+
+    async def run():
+        speculation = scheduler.speculate(state)
+        state.update({"score": 40, "evaluation": "Score: 40/100"})
+        return await speculation.resolve(state)
+
+    result = asyncio.run(run())
+
+    # The next bank question in rotation, not the one just answered
+    assert result["current_question_id"] == graph.kb.questions["coding"][1]["id"]
+    assert result["current_question_id"] != asked
+    assert result["question_count"] == 2
+    assert scheduler.stats == {
+        "started": 1, "used": 1, "discarded": 0, "cancelled": 0, "failed": 0
+    }
+
+
+def test_failed_speculation_falls_back_to_the_normal_followup():
+    """A transient error in the speculative call doesn't fail the answer"""
+    graph = InterviewGraph()
+    scheduler = FollowupScheduler(graph)
+    state = make_state()
+    state.update(graph.start_node(state))
+    next_question = graph.anext_question
+    calls = []
+
+    async def fails_once(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("upstream 503")
+        return await next_question(*args, **kwargs)
+
+    graph.anext_question = fails_once
+
+    async def run():
+        speculation = scheduler.speculate(state)
+        state.update({"score": 40})
+        return await speculation.resolve(state)
+
+    result = asyncio.run(run())
+
+    assert result["current_question_id"] == graph.kb.questions["coding"][1]["id"]
+    assert len(calls) == 2
+    assert scheduler.stats["failed"] == 1
+
+
+def test_llm_followup_discarded_on_branch_change():
+    """Provisional score 80 (deeper) vs real 40 (foundational) regenerates"""
+    graph = InterviewGraph()
+    graph.kb.search = lambda *args, **kwargs: []
+    graph.followup_llm = FakeListChatModel(responses=["Speculative?", "Foundational?"])
+    scheduler = FollowupScheduler(graph)
+
+    async def run():
+        state = make_state(question_count=2, score=80)
+        speculation = scheduler.speculate(state)
+        state.update({"score": 40})
+        return await speculation.resolve(state)
+
+    result = asyncio.run(run())
+
+    assert result["current_question"] == "Foundational?"
+    assert scheduler.stats["discarded"] == 1
+
+
+def test_no_speculation_on_last_question():
+    graph = InterviewGraph()
+    scheduler = FollowupScheduler(graph)
+
+    assert scheduler.speculate(make_state(question_count=3)) is None
+
+
+def test_evaluation_reads_expert_context_without_rotating():
+    """Evaluation uses the precomputed context, so the next question is unchanged"""
+    graph = InterviewGraph()
+    graph.llm = FakeListChatModel(responses=[
+        '{"correctness": 32, "clarity": 24, "completeness": 24, "total": 80, '
+        '"strengths": ["Sliding window"], "weaknesses": ["No complexity"], "improvement": "State O(n)"}'
+    ])
+    state = make_state()
+    state["current_question_id"] = "coding_q2"
+
+    prompt, inputs = graph._evaluation_inputs(state)
+    assert inputs["expert_context"].startswith("Use sliding window")
+
+    graph.evaluate_node(state)
+    assert graph.kb.question_index["coding"] == 0
+    # LLM follow-ups have no precomputed context, like the real knowledge base
+    assert graph.kb.get_expert_context("coding_q2_followup") is None
@@ -0,0 +1,40 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Must only load on first use (graph construction, ingestion, embeddings)
+LAZY_MODULES = ["langgraph", "langchain_groq", "chromadb", "langchain_huggingface", "torch"]
+
+
+def import_times(module):
+    """{module: cumulative import time in µs} from python -X importtime"""
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "test-not-used",
+        "DATABASE_URL": "sqlite:///:memory:",
+        "PYTHONPATH": str(ROOT),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line.strip())
+        if match:
+            times[match.group(2)] = int(match.group(1))
+    return times
+
+
+def test_backend_main_import_budget():
+    """Importing the app must not build the graph or load heavy dependencies"""
+    budget_ms = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+    times = import_times("backend.main")
+
+    loaded = sorted({name.split(".")[0] for name in times} & set(LAZY_MODULES))
+    assert not loaded, f"imported eagerly: {loaded}"
+    assert times["backend.main"] / 1000 < budget_ms
@@ -0,0 +1,101 @@
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from backend.app.services.token_budget import (
+    ContextCompactor,
+    TokenUsage,
+    TokenUsageCallback,
+    count_tokens,
+    token_usage,
+)
+
+CONTEXT = """Expert Approach:
+Use a hash map to store numbers as you iterate. For each number, check if the complement exists. Sorting first and using two pointers also works but costs O(n log n).
+
+Key Points:
+- Hash map lookup gives O(n) time
+- Single pass solution
+- Discuss the memory trade-off of the hash map against two pointers on a sorted copy
+- Mention that the interviewer may ask for all pairs rather than one
+
+Common Mistakes:
+- Using nested loops O(n²)
+- Not handling duplicates
+- Returning values instead of indices"""
+
+
+def test_context_within_budget_is_unchanged():
+    compactor = ContextCompactor(budget_tokens=1000)
+
+    assert compactor.compact("coding_q1", "Two sum", CONTEXT) == CONTEXT
+
+
+def test_compaction_keeps_relevant_units_in_order():
+    compactor = ContextCompactor(budget_tokens=40)
+    question = "Find two numbers that sum to a target using a hash map"
+
+    compacted = compactor.compact("coding_q1", question, CONTEXT)
+
+    assert count_tokens(compacted) <= 40 < count_tokens(CONTEXT)
+    assert "Use a hash map to store numbers as you iterate." in compacted
+    # Sections keep their headers and original order
+    assert compacted.index("Expert Approach:") < compacted.index("Key Points:")
+    assert "Hash map lookup gives O(n) time" in compacted
+
+    assert compactor.compact("coding_q1", question, CONTEXT) == compacted
+    assert compactor.get_stats()["cache"]["hits"] == 1
+    assert compactor.get_stats()["compacted"] == 1
+
+
+def test_oversized_unit_is_truncated():
+    compactor = ContextCompactor(budget_tokens=10)
+
+    compacted = compactor.compact(None, "anything", "word " * 100)
+
+    assert compacted.endswith("…") and count_tokens(compacted) <= 10
+
+
+def test_sections_and_call_usage_are_recorded():
+    usage = TokenUsage()
+    counts = usage.measure("evaluation", {"question": "Two sum?", "user_answer": ""})
+
+    assert counts == {"question": count_tokens("Two sum?"), "user_answer": 0}
+    assert usage.get_stats()["prompts"]["evaluation"]["prompts"] == 1
+
+    message = AIMessage(
+        content="Score: 80/100",
+        usage_metadata={"input_tokens": 120, "output_tokens": 30, "total_tokens": 150},
+        response_metadata={"model_name": "usage-test-model"},
+    )
+    TokenUsageCallback().on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+
+    assert token_usage.get_stats()["models"]["usage-test-model"] == {
+        "calls": 1, "cached": 0, "coalesced": 0, "prompt_tokens": 120, "completion_tokens": 30
+    }
+
+
+def test_compaction_is_off_by_default():
+    compactor = ContextCompactor()
+
+    assert compactor.compact("coding_q1", "Two sum", CONTEXT * 20) == CONTEXT * 20
+    assert compactor.get_stats()["compacted"] == 0
+
+
+def test_response_cache_hits_are_not_counted_as_calls():
+    from langchain_core.caches import InMemoryCache
+    from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+
+    message = AIMessage(
+        content="Score: 80/100",
+        usage_metadata={"input_tokens": 120, "output_tokens": 30, "total_tokens": 150},
+        response_metadata={"model_name": "cache-usage-test-model"},
+    )
+    llm = FakeMessagesListChatModel(
+        responses=[message], cache=InMemoryCache(), callbacks=[TokenUsageCallback()]
+    )
+    llm.invoke("Two sum?")
+    llm.invoke("Two sum?")
+
+    assert token_usage.get_stats()["models"]["cache-usage-test-model"] == {
+        "calls": 1, "cached": 1, "coalesced": 0, "prompt_tokens": 120, "completion_tokens": 30
+    }
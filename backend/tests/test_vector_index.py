@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from backend.app.services.vector_index import NumpyVectorIndex
+
+
+def make_corpus(n=600, dim=64, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((12, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, 12, n)] + 0.5 * rng.standard_normal((n, dim))
+    ids = [f"q{i}" for i in range(n)]
+    metadatas = [
+        {"id": ids[i], "category": ["coding", "behavioral"][i % 2],
+         "difficulty": ["easy", "hard"][i // 2 % 2]}
+        for i in range(n)
+    ]
+    return ids, [f"Question {i}" for i in ids], metadatas, vectors.astype(np.float32), rng
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_index_matches_exact_search(tmp_path, dtype):
+    ids, texts, metadatas, vectors, rng = make_corpus()
+    exact = NumpyVectorIndex(str(tmp_path / "exact"))
+    exact.build(ids, texts, metadatas, vectors)
+    quantized = NumpyVectorIndex(str(tmp_path / dtype), dtype=dtype)
+    quantized.build(ids, texts, metadatas, vectors)
+
+    for query in rng.standard_normal((20, vectors.shape[1])):
+        for kwargs in ({"category": "coding"}, {"category": "behavioral", "difficulty": "hard"}):
+            expected = [d.metadata["id"] for d in exact.search(query, k=5, **kwargs)]
+            found = [d.metadata["id"] for d in quantized.search(query, k=5, **kwargs)]
+            assert found == expected
+
+    reopened = NumpyVectorIndex(str(tmp_path / dtype)).load()
+    assert reopened.dtype == np.dtype(dtype)
+    ratio = {"float16": 2, "int8": 4}[dtype]
+    assert reopened.memory_bytes()["scanned"] <= exact.memory_bytes()["scanned"] / ratio * 1.1  # + int8 scales
+    np.testing.assert_allclose(
+        reopened.get_vectors(ids[:3]), exact.get_vectors(ids[:3]), rtol=1e-6
+    )
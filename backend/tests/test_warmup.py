@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.app.services.semantic_cache import SemanticEvaluationCache
+from backend.app.services.warmup import Warmup
+
+
+def make_graph(embeddings=None):
+    return SimpleNamespace(
+        semantic_cache=SemanticEvaluationCache(embeddings) if embeddings else None,
+        kb=SimpleNamespace(),
+        llm=SimpleNamespace(),
+    )
+
+
+def test_warmup_embeds_and_searches():
+    warmup = Warmup().run(lambda: make_graph(DeterministicFakeEmbedding(size=16)))
+    report = warmup.report()
+
+    assert report["ready"]
+    assert report["components"]["embeddings"]["status"] == "ready"
+    assert report["components"]["vector_search"]["status"] == "ready"
+    # No API client to check against (fake model)
+    assert report["components"]["llm"]["status"] == "disabled"
+
+
+def test_warmup_lookup_is_not_counted_as_a_cache_miss():
+    graph = make_graph(DeterministicFakeEmbedding(size=16))
+
+    Warmup().run(lambda: graph)
+
+    assert graph.semantic_cache.get_stats()["misses"] == 0
+
+
+def test_failed_graph_is_not_ready():
+    def broken():
+        raise RuntimeError("no model")
+
+    warmup = Warmup()
+    assert not warmup.ready()
+
+    warmup.run(broken)
+    report = warmup.report()
+
+    assert not report["ready"]
+    assert report["components"]["graph"]["status"] == "failed"
+    assert report["components"]["embeddings"]["status"] == "skipped"
+
+
+def test_disabled_warmup_is_ready():
+    warmup = Warmup()
+    warmup.disable()
+
+    assert warmup.ready()
+    assert warmup.report()["components"]["graph"]["status"] == "pending"
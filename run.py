@@ -13,19 +13,29 @@ if str(root) not in sys.path:
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description='Run tech-interview-ai components')
-    parser.add_argument('component', choices=['server', 'test-chroma', 'test-connections', 'interview-graph'],
+    parser.add_argument('component', choices=['server', 'serve', 'test-chroma', 'test-connections', 'interview-graph', 'ingest'],
                       help='Component to run')
-    args = parser.parse_args()
+    # Anything after the component is passed through (used by 'ingest')
+    args = parser.parse_args(sys.argv[1:2])
+    rest = sys.argv[2:]
 
     if args.component == 'server':
         import uvicorn
         uvicorn.run("backend.main:app", host="127.0.0.1", port=8000, reload=True)
+    elif args.component == 'serve':
+        # Production: preload once, fork workers (see backend/server.py)
+        from backend.server import main as serve
+        serve(rest)
     elif args.component == 'test-chroma':
         from backend.tests import test_chroma
         test_chroma.main()
     elif args.component == 'test-connections':
         from backend.tests import test_connections
         test_connections.main()
+    elif args.component == 'ingest':
+        # e.g. python run.py ingest questions.jsonl --workers 8
+        from backend.app.services.ingestion import main as ingest
+        ingest(rest)
     elif args.component == 'interview-graph':
         from backend.app.services.interview_graph import InterviewGraph
         graph = InterviewGraph()
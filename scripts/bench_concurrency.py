@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Concurrency benchmark for /api/interview/start + /api/interview/answer.
+
+Runs N simulated candidates against the FastAPI app in-process, with the
+Groq model swapped for a fake chat model that takes a fixed time per call.
+With the async graph nodes the p99 should stay close to a single LLM
+round-trip as N grows; with --blocking (the old sync behaviour, the call
+sleeps on the event loop) p99 grows linearly with N.
+
+    python scripts/bench_concurrency.py --latency 0.5 --levels 1 5 10 25 50
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+# Throwaway database and dummy key so the app can be imported offline
+_db_dir = tempfile.mkdtemp(prefix="bench_concurrency_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ.setdefault("GROQ_API_KEY", "bench-not-used")
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["SEMANTIC_CACHE_ENABLED"] = "false"
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+EVALUATION_JSON = json.dumps({
+    "correctness": 30, "clarity": 22, "completeness": 23, "total": 75,
+    "strengths": ["Clear approach"], "weaknesses": ["No edge cases"],
+    "improvement": "Discuss complexity",
+})
+
+
+class FakeLatencyChatModel(BaseChatModel):
+    """Chat model that answers after a fixed delay"""
+
+    latency: float = 0.5
+    blocking: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency"
+
+    def _result(self):
+        message = AIMessage(content=EVALUATION_JSON)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.blocking:
+            # What a sync chain.invoke inside an async endpoint does
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return self._result()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def run_candidate(client: httpx.AsyncClient) -> float:
+    """One candidate: start, then answer once; returns answer latency"""
+    start = await client.post("/api/interview/start", json={"category": "coding"})
+    session_id = start.json()["session_id"]
+
+    t0 = time.perf_counter()
+    response = await client.post(
+        "/api/interview/answer",
+        json={"session_id": session_id, "answer": "Use three pointers and iterate."},
+    )
+    elapsed = time.perf_counter() - t0
+    response.raise_for_status()
+    return elapsed
+
+
+async def run_level(app, concurrency: int) -> list:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await asyncio.gather(
+            *(run_candidate(client) for _ in range(concurrency))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview API concurrency benchmark")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake LLM latency (s)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="Simulate the old sync LLM call on the event loop",
+    )
+    args = parser.parse_args()
+
+    from backend.app.models.database import init_db
+    from backend.app.routers import interview
+    from backend.main import app
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+    graph = interview.get_graph()
+    graph.llm = graph.followup_llm = FakeLatencyChatModel(
+        latency=args.latency, blocking=args.blocking
+    )
+
+    mode = "blocking" if args.blocking else "async"
+    print(f"Mode: {mode}, fake LLM latency: {args.latency:.3f}s\n")
+    print(f"{'candidates':>10} {'p50 (s)':>10} {'p99 (s)':>10} {'p99/latency':>12}")
+
+    for level in args.levels:
+        # Node logging is noisy at high concurrency
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies = asyncio.run(run_level(app, level))
+        p50 = percentile(latencies, 50)
+        p99 = percentile(latencies, 99)
+        print(f"{level:>10} {p50:>10.3f} {p99:>10.3f} {p99 / args.latency:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
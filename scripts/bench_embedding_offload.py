@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+API latency while embeddings are being computed: in-process vs worker processes.
+
+A CPU-bound stand-in for MiniLM (pure Python, so it holds the GIL like
+tokenization and small-batch inference do) is kept busy by concurrent
+callers. At the same time a "/health"-like probe measures how long a trivial
+handler takes to get scheduled on the event loop.
+
+    python scripts/bench_embedding_offload.py --seconds 5 --callers 8
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+root = Path(__file__).resolve().parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from backend.app.services.embedding_batcher import EmbeddingBatcher
+from backend.app.services.embedding_pool import ProcessPoolEmbeddings
+
+
+class CpuBoundEmbeddings(Embeddings):
+    def __init__(self, cost_ms=15.0, dim=384):
+        self.cost = cost_ms / 1000
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        # fixed per-call overhead + per-text cost, all under the GIL
+        deadline = time.perf_counter() + self.cost * (1 + 0.2 * len(texts))
+        while time.perf_counter() < deadline:
+            pass
+        return [[float(len(t))] * self.dim for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+async def run(mode, seconds, callers, workers):
+    if mode == "inline":
+        model = CpuBoundEmbeddings()
+
+        async def embed(text):
+            # what FastAPI does with a sync dependency: a threadpool thread
+            return await asyncio.to_thread(model.embed_query, text)
+
+        pool = None
+    else:
+        pool = ProcessPoolEmbeddings(CpuBoundEmbeddings, workers=workers)
+        pool.warmup()
+        embed = EmbeddingBatcher(pool).aembed_query
+
+    stop = time.perf_counter() + seconds
+    done = 0
+
+    async def caller(i):
+        nonlocal done
+        while time.perf_counter() < stop:
+            await embed(f"query {i} {done}")
+            done += 1
+
+    async def probe():
+        lags = []
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - t0 - 0.005)
+        return lags
+
+    results = await asyncio.gather(probe(), *(caller(i) for i in range(callers)))
+    if pool:
+        pool.close()
+
+    lags = np.array(results[0]) * 1000
+    return np.percentile(lags, 50), np.percentile(lags, 99), done / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding offload benchmark")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--callers", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'probe p50 (ms)':>15} {'probe p99 (ms)':>15} {'embeds/s':>10}")
+    for mode in ("inline", "process"):
+        p50, p99, rate = asyncio.run(run(mode, args.seconds, args.callers, args.workers))
+        print(f"{mode:<10} {p50:>15.2f} {p99:>15.2f} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
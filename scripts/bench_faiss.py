@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Recall@k and QPS of the FAISS index types against exact search and Chroma.
+
+Synthetic documents are clustered unit vectors (like topic-grouped
+questions) with a category and difficulty each. Ground truth is exact
+cosine top-k within the query's category.
+
+    python scripts/bench_faiss.py --sizes 1000 10000 100000 --queries 300
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+root = Path(__file__).resolve().parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from backend.app.services.faiss_index import FaissVectorIndex
+from bench_vector_backends import CATEGORIES, build_chroma
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def clustered_corpus(n, dim, n_clusters=64, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, n_clusters, n)
+    vectors = centers[assignment] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    ids = [f"q{i}" for i in range(n)]
+    metadatas = [
+        {
+            "id": ids[i],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "difficulty": DIFFICULTIES[(i // len(CATEGORIES)) % len(DIFFICULTIES)],
+        }
+        for i in range(n)
+    ]
+    texts = [f"Question {i}" for i in range(n)]
+    return ids, texts, metadatas, vectors, centers
+
+
+def exact_top_k(vectors, metadatas, queries, categories, k):
+    category_of = np.array([m["category"] for m in metadatas])
+    truth = []
+    for q, category in zip(queries, categories):
+        scores = vectors @ q
+        scores[category_of != category] = -np.inf
+        truth.append(set(np.argsort(-scores)[:k].tolist()))
+    return truth
+
+
+def evaluate(search, queries, categories, truth, k):
+    found, t0 = [], time.perf_counter()
+    for q, category in zip(queries, categories):
+        found.append(search(q, category, k))
+    elapsed = time.perf_counter() - t0
+    recall = np.mean(
+        [len({int(d.metadata["id"][1:]) for d in docs} & t) / k for docs, t in zip(found, truth)]
+    )
+    return recall, len(queries) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS backend benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--skip-chroma", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'backend':<12} {'docs':>8} {'recall@' + str(args.k):>10} {'QPS':>10} {'build (s)':>10}")
+    for n in args.sizes:
+        ids, texts, metadatas, vectors, centers = clustered_corpus(n, args.dim)
+
+        rng = np.random.default_rng(1)
+        picks = rng.integers(0, len(centers), args.queries)
+        queries = centers[picks] + 0.6 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        categories = [CATEGORIES[i % len(CATEGORIES)] for i in range(args.queries)]
+        truth = exact_top_k(vectors, metadatas, queries, categories, args.k)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            backends = {}
+            for index_type in ("flat", "ivf", "hnsw"):
+                t0 = time.perf_counter()
+                index = FaissVectorIndex(f"{tmp}/{index_type}", index_type=index_type)
+                # Two batches to exercise incremental add
+                half = n // 2
+                index.add(ids[:half], texts[:half], metadatas[:half], vectors[:half])
+                index.add(ids[half:], texts[half:], metadatas[half:], vectors[half:])
+                index.save()
+                backends[f"faiss-{index_type}"] = (
+                    lambda q, c, k, index=index: index.search(q, category=c, k=k),
+                    time.perf_counter() - t0,
+                )
+
+            if not args.skip_chroma:
+                t0 = time.perf_counter()
+                store = build_chroma(f"{tmp}/chroma", ids, texts, metadatas, vectors)
+                backends["chroma"] = (
+                    lambda q, c, k: store.similarity_search_by_vector(
+                        q.tolist(), k=k, filter={"category": c}
+                    ),
+                    time.perf_counter() - t0,
+                )
+
+            for name, (search, build_time) in backends.items():
+                recall, qps = evaluate(search, queries, categories, truth, args.k)
+                print(f"{name:<12} {n:>8} {recall:>10.3f} {qps:>10.0f} {build_time:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
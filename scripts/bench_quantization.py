@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Memory, recall and latency of quantized NumPy index storage.
+
+Each dtype is compared with exact float32 search on clustered synthetic
+vectors: "scanned MB" is the matrix read on every query, recall@k is the
+overlap with the exact float32 top-k (after full-precision re-ranking).
+
+    python scripts/bench_quantization.py --sizes 10000 100000 --queries 300
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+root = Path(__file__).resolve().parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from backend.app.services.vector_index import NumpyVectorIndex
+from bench_faiss import clustered_corpus
+from bench_vector_backends import CATEGORIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantized vector index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'dtype':<8} {'docs':>8} {'scanned MB':>11} {'recall@' + str(args.k):>10} "
+        f"{'p50 (ms)':>10} {'QPS':>8}"
+    )
+    for n in args.sizes:
+        ids, texts, metadatas, vectors, centers = clustered_corpus(n, args.dim)
+        rng = np.random.default_rng(1)
+        queries = centers[rng.integers(0, len(centers), args.queries)]
+        queries = queries + 0.6 * rng.standard_normal(queries.shape).astype(np.float32)
+        categories = [CATEGORIES[i % len(CATEGORIES)] for i in range(args.queries)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            exact = None
+            for dtype in ("float32", "float16", "int8"):
+                index = NumpyVectorIndex(
+                    f"{tmp}/{dtype}", dtype=dtype, rerank_factor=args.rerank_factor
+                )
+                index.build(ids, texts, metadatas, vectors)
+                index.search(queries[0], category=CATEGORIES[0], k=args.k)  # warm up
+
+                found, latencies = [], []
+                for q, category in zip(queries, categories):
+                    t0 = time.perf_counter()
+                    docs = index.search(q, category=category, k=args.k)
+                    latencies.append(time.perf_counter() - t0)
+                    found.append({d.metadata["id"] for d in docs})
+
+                if exact is None:
+                    exact = found
+                recall = np.mean([len(f & e) / args.k for f, e in zip(found, exact)])
+                latencies = np.array(latencies)
+                print(
+                    f"{dtype:<8} {n:>8} {index.memory_bytes()['scanned'] / 2**20:>11.1f} "
+                    f"{recall:>10.3f} {np.percentile(latencies, 50) * 1000:>10.3f} "
+                    f"{len(queries) / latencies.sum():>8.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Search latency: memory-mapped NumPy index vs Chroma (through langchain_chroma).
+
+Uses random unit vectors so the embedding model is out of the picture; both
+backends answer the same category-filtered top-k queries by vector.
+
+    python scripts/bench_vector_backends.py --sizes 1000 10000 --queries 500
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+root = Path(__file__).resolve().parent.parent
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from backend.app.services.vector_index import NumpyVectorIndex
+
+CATEGORIES = ["coding", "system_design", "behavioral"]
+
+
+def synthetic_corpus(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"q{i}" for i in range(n)]
+    metadatas = [
+        {"id": ids[i], "category": CATEGORIES[i % len(CATEGORIES)], "difficulty": "medium"}
+        for i in range(n)
+    ]
+    texts = [f"Question {i}" for i in range(n)]
+    return ids, texts, metadatas, vectors
+
+
+def time_queries(search, queries, k):
+    latencies = []
+    for i, q in enumerate(queries):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        t0 = time.perf_counter()
+        search(q, category, k)
+        latencies.append(time.perf_counter() - t0)
+    latencies = np.array(latencies) * 1000
+    return {
+        "p50_ms": np.percentile(latencies, 50),
+        "p99_ms": np.percentile(latencies, 99),
+        "qps": len(queries) / (latencies.sum() / 1000),
+    }
+
+
+def build_chroma(path, ids, texts, metadatas, vectors):
+    import chromadb
+    from langchain_chroma import Chroma
+
+    client = chromadb.PersistentClient(path=path)
+    collection = client.get_or_create_collection(
+        name="bench", metadata={"hnsw:space": "cosine"}
+    )
+    batch = 5000
+    for start in range(0, len(ids), batch):
+        end = start + batch
+        collection.add(
+            ids=ids[start:end],
+            embeddings=vectors[start:end].tolist(),
+            metadatas=metadatas[start:end],
+            documents=texts[start:end],
+        )
+    return Chroma(client=client, collection_name="bench")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector backend search benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--skip-chroma", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    print(f"{'backend':<18} {'docs':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'QPS':>10}")
+    for n in args.sizes:
+        ids, texts, metadatas, vectors = synthetic_corpus(n, args.dim)
+        backends = {}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for dtype in ("float32", "float16"):
+                index = NumpyVectorIndex(f"{tmp}/numpy_{dtype}", dtype=dtype)
+                index.build(ids, texts, metadatas, vectors)
+                backends[f"numpy-{dtype}"] = (
+                    lambda q, c, k, index=index: index.search(q, category=c, k=k)
+                )
+
+            if not args.skip_chroma:
+                store = build_chroma(f"{tmp}/chroma", ids, texts, metadatas, vectors)
+                backends["chroma"] = lambda q, c, k: store.similarity_search_by_vector(
+                    q.tolist(), k=k, filter={"category": c}
+                )
+
+            for name, search in backends.items():
+                search(queries[0], CATEGORIES[0], args.k)  # warm up
+                r = time_queries(search, queries, args.k)
+                print(
+                    f"{name:<18} {n:>8} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} {r['qps']:>10.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()